@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+大型游戏板扩展性测试
+在不同尺寸的自定义难度上测量点击路径上各操作的平均耗时：
+布雷（每局一次，O(N)）以及揭开、插旗、双键、界面计数和渲染（每次操作，应与游戏板大小无关；
+双键的耗时还取决于连带揭开的格子数，小游戏板上展开的区域较小，耗时也较低）
+
+用法：
+    python benchmarks/bench_scaling.py --sizes 16 256 1024 2048 --density 0.15 --actions 200
+    python benchmarks/bench_scaling.py --render   # 同时测量渲染（使用无窗口的显示驱动）
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.bitboard import BitBoard
+from game.game_logic import GameLogic, GameState
+
+BOARD_CLASSES = {'array': ArrayBoard, 'bit': BitBoard}
+
+
+def pick_cells(game: GameLogic, rng: random.Random, count: int, revealed: bool) -> List[Tuple[int, int]]:
+    """随机挑选数字格子（周围有雷的安全格子），revealed 指定挑已揭开的还是未揭开的"""
+    board = game.board
+    cells = []
+    for _ in range(count * 50):
+        if len(cells) >= count:
+            break
+        row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+        cell = board.get_cell(row, col)
+        if (not cell.is_mine and not cell.is_flagged and cell.neighbor_mines > 0
+                and cell.is_revealed == revealed):
+            cells.append((row, col))
+    return cells
+
+
+def timed(action, items) -> float:
+    """对每个元素执行 action，返回平均耗时（微秒）"""
+    if not items:
+        return float('nan')
+    started = time.perf_counter()
+    for item in items:
+        action(*item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+
+def measure(side: int, density: float, actions: int, board_class, seed: int = 0,
+            render: bool = False) -> Dict[str, float]:
+    """在 side x side 的游戏板上测量各操作耗时"""
+    rng = random.Random(seed)
+    mines = max(1, int(side * side * density))
+    game = GameLogic('bench', board_class=board_class, seed=seed, headless=True,
+                     difficulties={'bench': {'rows': side, 'cols': side, 'mines': mines}})
+    center = side // 2
+
+    started = time.perf_counter()
+    game.left_click(center, center)
+    result = {'placement_ms': (time.perf_counter() - started) * 1000}
+
+    # 揭开：只挑数字格子，每次新揭开一格，耗时反映固定开销而不是展开区域的大小
+    numbers = pick_cells(game, rng, actions, revealed=False)
+    result['reveal_us'] = timed(game.left_click, numbers)
+
+    # 插旗：插上再拔掉
+    hidden = pick_cells(game, rng, actions, revealed=False)
+    result['flag_us'] = timed(game.toggle_flag, hidden + hidden)
+
+    # 双键：先给刚才揭开的数字周围的地雷插好旗（不计时），再双键
+    board = game.board
+    chords = []
+    for row, col in numbers:
+        for r, c in board.get_neighbors(row, col):
+            cell = board.get_cell(r, c)
+            if cell.is_mine and not cell.is_flagged:
+                game.toggle_flag(r, c)
+        chords.append((row, col))
+    if game.get_game_state() == GameState.PLAYING:
+        result['chord_us'] = timed(game.chord, chords)
+
+    # 界面计数：剩余雷数、计时器、已揭开格子数和胜负检查
+    def hud():
+        game.get_mines_left()
+        game.get_timer().get_formatted_time()
+        game.board.get_revealed_count()
+        game._check_game_end()
+    result['hud_us'] = timed(hud, [()] * actions)
+
+    if render:
+        result['render_us'] = measure_render(game, rng, max(1, actions // 10))
+    return result
+
+
+def measure_render(game: GameLogic, rng: random.Random, frames: int) -> float:
+    """滚动到随机位置后绘制完整一帧的平均耗时（微秒）"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from ui.colors import Colors
+    from ui.fonts import Fonts
+    from ui.renderer import Renderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 700))
+    renderer, fonts, colors = Renderer(screen), Fonts(), Colors()
+    board = game.board
+
+    def frame():
+        renderer.scroll(board, rng.randrange(-board.rows, board.rows), rng.randrange(-board.cols, board.cols))
+        renderer.draw_game(game, fonts, colors)
+    return timed(frame, [()] * frames)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="大型游戏板扩展性测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 128, 512, 1024, 2048],
+                        help="游戏板边长")
+    parser.add_argument('--density', type=float, default=0.15)
+    parser.add_argument('--actions', type=int, default=200)
+    parser.add_argument('--board', default='array', choices=sorted(BOARD_CLASSES))
+    parser.add_argument('--render', action='store_true', help="同时测量渲染")
+    args = parser.parse_args()
+
+    columns = ['placement_ms', 'reveal_us', 'flag_us', 'chord_us', 'hud_us']
+    if args.render:
+        columns.append('render_us')
+    print(f"{'cells':>10} " + ' '.join(f"{name:>12}" for name in columns))
+    for side in args.sizes:
+        result = measure(side, args.density, args.actions, BOARD_CLASSES[args.board], render=args.render)
+        print(f"{side * side:>10,} " + ' '.join(f"{result.get(name, float('nan')):>12.1f}"
+                                                  for name in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+向量化环境吞吐量测试
+以每秒步数（所有游戏板上执行的动作总数/秒）衡量VectorEnv的吞吐量
+
+用法：
+    python benchmarks/bench_vector_env.py --boards 4096 --steps 200 --difficulty hard
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.vector_env import ACTION_REVEAL, VectorEnv
+
+
+def measure_steps_per_second(env: VectorEnv, steps: int, seed: int = 0) -> float:
+    """随机揭开格子执行指定步数，已结束的游戏板自动重置，返回每秒步数"""
+    rng = np.random.default_rng(seed)
+    env.reset()
+    started = time.perf_counter()
+    for _ in range(steps):
+        actions = np.stack([
+            np.full(env.num_boards, ACTION_REVEAL),
+            rng.integers(0, env.rows, env.num_boards),
+            rng.integers(0, env.cols, env.num_boards),
+        ], axis=1)
+        _, _, dones = env.step(actions)
+        if dones.any():
+            env.reset(dones)
+    elapsed = time.perf_counter() - started
+    return steps * env.num_boards / elapsed
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="向量化环境吞吐量测试")
+    parser.add_argument('--boards', type=int, default=1024)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--difficulty', default='hard')
+    args = parser.parse_args()
+
+    env = VectorEnv.from_difficulty(args.difficulty, args.boards, seed=0)
+    rate = measure_steps_per_second(env, args.steps)
+    print(f"{args.boards} 个游戏板，{args.steps} 步：{rate:,.0f} 步/秒")
+
+
+if __name__ == '__main__':
+    main()
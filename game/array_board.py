@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+数组游戏板
+以NumPy数组（结构数组拆分为多个数组）存储格子状态，适用于大尺寸自定义游戏板
+"""
+
+from array import array
+from collections import deque
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board, CellGrid, count_neighbor_mines, label_openings
+
+
+class CellView:
+    """格子视图类，按索引读写游戏板数组，接口与Cell一致"""
+
+    __slots__ = ('_board', '_index')
+
+    def __init__(self, board: 'ArrayBoard', index: int):
+        self._board = board
+        self._index = index
+
+    @property
+    def is_mine(self) -> bool:
+        return bool(self._board.mines[self._index])
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        self._board._set_flag(self._board.mines, self._index, value)
+
+    @property
+    def is_revealed(self) -> bool:
+        return bool(self._board.revealed[self._index])
+
+    @is_revealed.setter
+    def is_revealed(self, value: bool):
+        self._board._set_flag(self._board.revealed, self._index, value)
+
+    @property
+    def is_flagged(self) -> bool:
+        return bool(self._board.flagged[self._index])
+
+    @is_flagged.setter
+    def is_flagged(self, value: bool):
+        self._board._set_flag(self._board.flagged, self._index, value)
+
+    @property
+    def neighbor_mines(self) -> int:
+        return int(self._board.neighbor_mines[self._index])
+
+    @neighbor_mines.setter
+    def neighbor_mines(self, value: int):
+        self._board.neighbor_mines[self._index] = value
+
+
+class ArrayBoard(Board):
+    """数组游戏板类
+
+    is_mine/is_revealed/is_flagged 使用 bool 数组，neighbor_mines 使用 uint8 数组，
+    按行优先的一维索引 row * cols + col 存储。get_cell 返回轻量的 CellView。
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.mines: Optional[np.ndarray] = None
+        self.revealed: Optional[np.ndarray] = None
+        self.flagged: Optional[np.ndarray] = None
+        self.neighbor_mines: Optional[np.ndarray] = None
+        super().__init__(rows, cols)
+
+    def _create_board(self):
+        """创建空白游戏板，已分配的数组直接清零复用"""
+        size = self.rows * self.cols
+        if self.mines is not None and self.mines.size == size:
+            self.mines.fill(False)
+            self.revealed.fill(False)
+            self.flagged.fill(False)
+            self.neighbor_mines.fill(0)
+        else:
+            self.mines = np.zeros(size, dtype=bool)
+            self.revealed = np.zeros(size, dtype=bool)
+            self.flagged = np.zeros(size, dtype=bool)
+            self.neighbor_mines = np.zeros(size, dtype=np.uint8)
+        self.cells = CellGrid(self)
+        self._reset_indexes()
+
+    def _set_flag(self, array: np.ndarray, index: int, value: bool):
+        """修改单个格子的布尔状态，并通过回调维护计数器和索引"""
+        value = bool(value)
+        if bool(array[index]) == value:
+            return
+        array[index] = value
+        pos = divmod(index, self.cols)
+        if array is self.mines:
+            self._on_mine_changed(pos, value)
+        elif array is self.revealed:
+            self._on_revealed_changed(pos, value)
+        else:
+            self._on_flagged_changed(pos, value)
+
+    def rebuild_indexes(self):
+        """按当前数组重建计数器和位置索引（直接批量写数组后调用）"""
+        self._reset_indexes()
+        self.revealed_count = int(np.count_nonzero(self.revealed))
+        for positions, array in ((self.mine_positions, self.mines), (self.flagged_positions, self.flagged)):
+            rows, cols = np.divmod(np.flatnonzero(array), self.cols)
+            positions.update(zip(rows.tolist(), cols.tolist()))
+
+    def get_cell(self, row: int, col: int) -> Optional[CellView]:
+        """获取指定位置的格子视图"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return CellView(self, row * self.cols + col)
+        return None
+
+    def _apply_mines(self, indices: Iterable[int]):
+        """在指定的一维索引位置放置地雷"""
+        indices = np.fromiter(indices, dtype=np.int64)
+        self.mines[indices] = True
+        rows, cols = np.divmod(indices, self.cols)
+        self.mine_positions.update(zip(rows.tolist(), cols.tolist()))
+
+    def _calculate_neighbor_mines(self):
+        """计算每个格子周围的地雷数量（会使已标记的空白区域失效）"""
+        self.region_of = None
+        self.regions = None
+        counts = count_neighbor_mines(self.mines.reshape(self.rows, self.cols))
+        self.neighbor_mines[:] = counts.ravel()
+
+    def get_state_bits(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """直接返回格子数组本身（不复制）"""
+        return self.mines, self.revealed, self.flagged
+
+    def set_state_bits(self, mines: np.ndarray, revealed: np.ndarray, flagged: np.ndarray):
+        """整体写入格子数组，并重新计算周围地雷数"""
+        self.mines[:] = mines
+        self.revealed[:] = revealed
+        self.flagged[:] = flagged
+        self.total_mines = int(np.count_nonzero(self.mines))
+        self.rebuild_indexes()
+        self._calculate_neighbor_mines()
+
+    def save_placement(self) -> Tuple[array, Optional[int]]:
+        """直接从地雷数组取出有序的一维索引"""
+        return array('i', np.flatnonzero(self.mines).astype(np.int32).tobytes()), self.seed
+
+    def set_revealed(self, indices: Sequence[int], value: bool):
+        """批量设置揭开状态，整批数组赋值"""
+        indices = np.asarray(indices, dtype=np.int64)
+        changed = int(np.count_nonzero(self.revealed[indices] != value))
+        self.revealed[indices] = value
+        self.revealed_count += changed if value else -changed
+
+    def _load_neighbor_mines(self, counts: np.ndarray):
+        """直接写入已算好的周围地雷数"""
+        self.neighbor_mines[:] = counts
+
+    def _label_regions(self):
+        """预先标记所有空白区域"""
+        self.region_of, self.regions, self._covered_count = label_openings(
+            self.rows, self.cols, memoryview(self.mines), memoryview(self.neighbor_mines)
+        )
+
+    def _open_region(self, region: Iterable[int]) -> List[Tuple[int, int]]:
+        """揭开预计算区域中尚未揭开且未插旗的格子"""
+        revealed = memoryview(self.revealed)
+        flagged = memoryview(self.flagged)
+        opened = []
+        for index in region:
+            if not revealed[index] and not flagged[index]:
+                revealed[index] = True
+                opened.append(index)
+        self.revealed_count += len(opened)
+        return [divmod(index, self.cols) for index in opened]
+
+    def flood_reveal(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """从指定格子开始揭开连通的空白区域，返回本次新揭开的格子
+
+        与 Board.flood_reveal 规则相同（优先使用预计算区域），通过 memoryview 直接读写数组，结束后统一更新计数器。
+        """
+        if not self.is_valid_position(row, col):
+            return []
+        cols = self.cols
+        mines = memoryview(self.mines)
+        revealed = memoryview(self.revealed)
+        flagged = memoryview(self.flagged)
+        counts = memoryview(self.neighbor_mines)
+
+        start = row * cols + col
+        if flagged[start] or mines[start]:
+            return []
+
+        region = self._precomputed_region(start)
+        if region is not None:
+            return self._open_region(region)
+
+        opened = []
+        if not revealed[start]:
+            revealed[start] = True
+            opened.append(start)
+        if counts[start] == 0:
+            table = self.neighbor_table
+            indptr, indices = table.indptr, table.indices
+            queue = deque([start])
+            while queue:
+                index = queue.popleft()
+                for neighbor in indices[indptr[index]:indptr[index + 1]]:
+                    if revealed[neighbor] or flagged[neighbor] or mines[neighbor]:
+                        continue
+                    revealed[neighbor] = True
+                    opened.append(neighbor)
+                    if counts[neighbor] == 0:
+                        queue.append(neighbor)
+
+        self.revealed_count += len(opened)
+        return [divmod(index, cols) for index in opened]
+
+    def nbytes(self) -> int:
+        """获取格子数组占用的字节数"""
+        return (self.mines.nbytes + self.revealed.nbytes +
+                self.flagged.nbytes + self.neighbor_mines.nbytes)
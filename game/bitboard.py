@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+位棋盘游戏板
+用Python大整数的位掩码表示地雷、揭开和标记状态，适用于批量模拟
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board, CellGrid, PreparedLayout
+
+
+def popcount(value: int) -> int:
+    """统计整数中为1的位数"""
+    return bin(value).count('1')
+
+
+class BitCellView:
+    """位棋盘格子视图类，接口与Cell一致"""
+
+    __slots__ = ('_board', '_row', '_col')
+
+    def __init__(self, board: 'BitBoard', row: int, col: int):
+        self._board = board
+        self._row = row
+        self._col = col
+
+    @property
+    def is_mine(self) -> bool:
+        return self._board._get_bit('mine_bits', self._row, self._col)
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        self._board._set_bit('mine_bits', self._row, self._col, value)
+
+    @property
+    def is_revealed(self) -> bool:
+        return self._board._get_bit('revealed_bits', self._row, self._col)
+
+    @is_revealed.setter
+    def is_revealed(self, value: bool):
+        self._board._set_bit('revealed_bits', self._row, self._col, value)
+
+    @property
+    def is_flagged(self) -> bool:
+        return self._board._get_bit('flagged_bits', self._row, self._col)
+
+    @is_flagged.setter
+    def is_flagged(self, value: bool):
+        self._board._set_bit('flagged_bits', self._row, self._col, value)
+
+    @property
+    def neighbor_mines(self) -> int:
+        return self._board._get_count(self._row, self._col)
+
+
+class BitBoard(Board):
+    """位棋盘游戏板类
+
+    第 row 行第 col 列对应第 row * stride + col 位，stride = cols + 1，
+    每行末尾多留一个恒为0的保护位，左右平移时不会串到相邻行。
+    周围地雷数以4个位平面（count_planes[i] 为计数的第 i 位）存储，
+    邻居计数、展开和胜利判断都是对整块位掩码的移位与按位运算。
+    单个格子的读写需要移位整个掩码，逐格访问较慢，适合整盘批量操作。
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.stride = cols + 1
+        self.full_mask = 0
+        row_mask = (1 << cols) - 1
+        for row in range(rows):
+            self.full_mask |= row_mask << (row * self.stride)
+        self.mine_bits = 0
+        self.revealed_bits = 0
+        self.flagged_bits = 0
+        self.count_planes = [0, 0, 0, 0]
+        super().__init__(rows, cols)
+
+    def _create_board(self):
+        """创建空白游戏板"""
+        self.mine_bits = 0
+        self.revealed_bits = 0
+        self.flagged_bits = 0
+        self.count_planes = [0, 0, 0, 0]
+        self.cells = CellGrid(self)
+        self._reset_indexes()
+
+    def _shifts(self) -> Tuple[int, ...]:
+        """8个邻居方向对应的位偏移"""
+        stride = self.stride
+        return (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+
+    def _shift(self, bits: int, offset: int) -> int:
+        """平移掩码，使每一位得到其 offset 方向邻居的值"""
+        shifted = bits >> offset if offset > 0 else bits << -offset
+        return shifted & self.full_mask
+
+    def dilate(self, bits: int) -> int:
+        """把掩码向8个方向各扩张一格"""
+        result = bits
+        for offset in self._shifts():
+            result |= self._shift(bits, offset)
+        return result & self.full_mask
+
+    def rebuild_indexes(self):
+        """按当前位掩码重建计数器和位置索引（直接修改掩码后调用）"""
+        self._reset_indexes()
+        self.revealed_count = popcount(self.revealed_bits & self.full_mask)
+        self.mine_positions.update(self._positions_from_bits(self.mine_bits & self.full_mask))
+        self.flagged_positions.update(self._positions_from_bits(self.flagged_bits & self.full_mask))
+
+    def _get_bit(self, name: str, row: int, col: int) -> bool:
+        """读取指定格子的状态位"""
+        return bool((getattr(self, name) >> (row * self.stride + col)) & 1)
+
+    def _set_bit(self, name: str, row: int, col: int, value: bool):
+        """修改指定格子的状态位，并通过回调维护计数器和索引"""
+        value = bool(value)
+        if self._get_bit(name, row, col) == value:
+            return
+        setattr(self, name, getattr(self, name) ^ (1 << (row * self.stride + col)))
+        if name == 'mine_bits':
+            self._on_mine_changed((row, col), value)
+        elif name == 'revealed_bits':
+            self._on_revealed_changed((row, col), value)
+        else:
+            self._on_flagged_changed((row, col), value)
+
+    def _get_count(self, row: int, col: int) -> int:
+        """读取指定格子周围的地雷数量"""
+        position = row * self.stride + col
+        return sum(((plane >> position) & 1) << i for i, plane in enumerate(self.count_planes))
+
+    def _bits_from_indices(self, indices: Iterable[int]) -> int:
+        """把一维索引集合转换为位掩码"""
+        bitmap = np.zeros(self.rows * self.stride, dtype=bool)
+        indices = np.fromiter(indices, dtype=np.int64)
+        bitmap[indices // self.cols * self.stride + indices % self.cols] = True
+        return int.from_bytes(np.packbits(bitmap, bitorder='little').tobytes(), 'little')
+
+    def _positions_from_bits(self, bits: int) -> List[Tuple[int, int]]:
+        """把位掩码转换为行优先排列的格子坐标"""
+        if not bits:
+            return []
+        size = self.rows * self.stride
+        data = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+        positions = np.flatnonzero(np.unpackbits(data, bitorder='little')[:size])
+        rows, cols = np.divmod(positions, self.stride)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def get_cell(self, row: int, col: int) -> Optional[BitCellView]:
+        """获取指定位置的格子视图"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return BitCellView(self, row, col)
+        return None
+
+    def _apply_mines(self, indices: Iterable[int]):
+        """在指定的一维索引位置放置地雷"""
+        indices = list(indices)
+        self.mine_bits |= self._bits_from_indices(indices)
+        self.mine_positions.update(divmod(index, self.cols) for index in indices)
+
+    def _calculate_neighbor_mines(self):
+        """用位并行加法一次算出所有格子周围的地雷数量"""
+        self.region_of = None
+        self.regions = None
+        planes = [0, 0, 0, 0]
+        for offset in self._shifts():
+            carry = self._shift(self.mine_bits, offset)
+            for i in range(len(planes)):
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+        # 地雷格子本身的计数记为0
+        not_mine = ~self.mine_bits
+        self.count_planes = [plane & not_mine for plane in planes]
+
+    def _label_regions(self):
+        """位棋盘的展开本身就是整盘并行的，不预先标记空白区域"""
+
+    def set_revealed(self, indices: Sequence[int], value: bool):
+        """批量设置揭开状态，一次掩码运算"""
+        mask = self._bits_from_indices(indices)
+        if value:
+            self.revealed_count += popcount(mask & ~self.revealed_bits)
+            self.revealed_bits |= mask
+        else:
+            self.revealed_count -= popcount(mask & self.revealed_bits)
+            self.revealed_bits &= ~mask
+
+    def _array_from_bits(self, bits: int) -> np.ndarray:
+        """把位掩码转换为按行优先排列的一维布尔数组（去掉保护位）"""
+        size = self.rows * self.stride
+        data = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+        grid = np.unpackbits(data, count=size, bitorder='little').view(bool)
+        return grid.reshape(self.rows, self.stride)[:, :self.cols].ravel()
+
+    def get_state_bits(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """以一维布尔数组返回 (地雷, 已揭开, 已插旗) 状态"""
+        return (self._array_from_bits(self.mine_bits), self._array_from_bits(self.revealed_bits),
+                self._array_from_bits(self.flagged_bits))
+
+    def set_state_bits(self, mines: np.ndarray, revealed: np.ndarray, flagged: np.ndarray):
+        """用一维布尔数组整体设置位掩码，并重新计算周围地雷数"""
+        self.mine_bits = self._bits_from_indices(np.flatnonzero(mines))
+        self.revealed_bits = self._bits_from_indices(np.flatnonzero(revealed))
+        self.flagged_bits = self._bits_from_indices(np.flatnonzero(flagged))
+        self.total_mines = int(np.count_nonzero(mines))
+        self.rebuild_indexes()
+        self._calculate_neighbor_mines()
+
+    def load_layout(self, layout: PreparedLayout):
+        """位棋盘的计数本身就是整盘并行的，只取用地雷位置"""
+        self.load_mines(layout.mines)
+
+    def _count_neighbor_mines(self, row: int, col: int) -> int:
+        """计算指定格子周围的地雷数量"""
+        neighborhood = self.dilate(1 << (row * self.stride + col))
+        return popcount(neighborhood & self.mine_bits & ~(1 << (row * self.stride + col)))
+
+    def zero_bits(self) -> int:
+        """周围没有地雷的非地雷格子掩码"""
+        any_count = self.count_planes[0] | self.count_planes[1] | self.count_planes[2] | self.count_planes[3]
+        return self.full_mask & ~any_count & ~self.mine_bits
+
+    def unrevealed_safe_bits(self) -> int:
+        """尚未揭开的安全格子掩码"""
+        return self.full_mask & ~self.revealed_bits & ~self.mine_bits
+
+    def is_cleared(self) -> bool:
+        """所有安全格子是否都已揭开"""
+        return (self.revealed_bits | self.mine_bits) & self.full_mask == self.full_mask
+
+    def state_key(self) -> Tuple[int, int, int]:
+        """可哈希的完整状态，用于缓存和去重"""
+        return self.mine_bits, self.revealed_bits, self.flagged_bits
+
+    def flood_reveal(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """从指定格子开始揭开连通的空白区域，返回本次新揭开的格子
+
+        每轮把当前边界中的空白格子整体扩张一格，直到没有新格子加入，
+        轮数等于区域直径，每轮是若干次整盘位运算。
+        """
+        if not self.is_valid_position(row, col):
+            return []
+        start = 1 << (row * self.stride + col)
+        if (self.flagged_bits | self.mine_bits) & start:
+            return []
+
+        # 可以被展开揭开的格子：未揭开、未标记、不是地雷
+        allowed = self.full_mask & ~self.revealed_bits & ~self.flagged_bits & ~self.mine_bits
+        zero = self.zero_bits()
+        opened = start & allowed
+        frontier = start
+        while frontier & zero:
+            grown = self.dilate(frontier & zero) & allowed & ~opened
+            opened |= grown
+            frontier = grown
+
+        self.revealed_bits |= opened
+        self.revealed_count += popcount(opened)
+        return self._positions_from_bits(opened)
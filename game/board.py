@@ -4,33 +4,403 @@
 定义格子状态和游戏板操作
 """
 
+import bisect
 import random
-from typing import List, Tuple, Optional
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple, Optional
+
+import numpy as np
+
+from .neighbors import NeighborTable, get_neighbor_table
+
+
+def count_neighbor_mines(mines: np.ndarray) -> np.ndarray:
+    """一次性计算二维地雷矩阵中每个格子周围的地雷数量
+
+    在四周补一圈0后，把8个方向平移后的矩阵相加，地雷格子本身的计数置0。
+    最后两维是行和列，前面可以有任意批次维度（多个游戏板一起计算）。
+    """
+    rows, cols = mines.shape[-2:]
+    padded = np.zeros(mines.shape[:-2] + (rows + 2, cols + 2), dtype=np.uint8)
+    padded[..., 1:-1, 1:-1] = mines
+    counts = np.zeros(mines.shape, dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            counts += padded[..., dr:dr + rows, dc:dc + cols]
+    counts[mines.astype(bool)] = 0
+    return counts
+
+
+def sample_mine_indices(total_cells: int, total_mines: int, excluded: Iterable[int],
+                        rng: random.Random) -> List[int]:
+    """从排除集合之外的格子中一次性抽取地雷位置（一维索引）
+
+    先在 [0, 可用格子数) 中不重复抽样，再按排序后的排除索引把序号平移回真实索引，
+    没有拒绝重试，耗时只取决于地雷数和排除集合大小，与地雷密度无关。
+    """
+    excluded = sorted(set(excluded))
+    available = total_cells - len(excluded)
+    if not 0 <= total_mines <= available:
+        raise ValueError(f"无法在 {available} 个可用格子中布置 {total_mines} 个地雷")
+
+    indices = []
+    skipped = 0
+    for pick in sorted(rng.sample(range(available), total_mines)):
+        # 第 pick 个可用格子之前每有一个排除格子，真实索引就后移一位
+        while skipped < len(excluded) and excluded[skipped] <= pick + skipped:
+            skipped += 1
+        indices.append(pick + skipped)
+    return indices
+
+
+def label_openings(rows: int, cols: int, mines: Sequence[bool],
+                   counts: Sequence[int]) -> Tuple[array, List[array], int]:
+    """标记所有空白区域（周围没有地雷的格子连成的区域）
+
+    返回 (region_of, regions, covered)：region_of[i] 为空白格子 i 所属区域编号，其余为 -1；
+    regions[k] 为点开区域 k 时会揭开的全部格子（空白格子加上数字边界）；
+    covered 为属于任一区域的格子总数，用于计算3BV。
+    """
+    size = rows * cols
+    table = get_neighbor_table(rows, cols)
+    indptr, indices = table.indptr, table.indices
+    region_of = array('i', [-1]) * size
+    covered = bytearray(size)
+    regions = []
+
+    for start in range(size):
+        if region_of[start] != -1 or mines[start] or counts[start]:
+            continue
+
+        label = len(regions)
+        region_of[start] = label
+        covered[start] = 1
+        members = array('i', [start])
+        border = set()
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            for neighbor in indices[indptr[index]:indptr[index + 1]]:
+                # 空白格子的邻居一定不是地雷，计数为0即是同一区域的空白格子
+                if counts[neighbor] == 0:
+                    if region_of[neighbor] == -1:
+                        region_of[neighbor] = label
+                        covered[neighbor] = 1
+                        members.append(neighbor)
+                        queue.append(neighbor)
+                elif neighbor not in border:
+                    border.add(neighbor)
+                    covered[neighbor] = 1
+                    members.append(neighbor)
+        regions.append(members)
+
+    return region_of, regions, sum(covered)
+
+
+class PreparedLayout(NamedTuple):
+    """预先算好的布局：有序的地雷位置、每个格子周围的地雷数和空白区域，可在后台线程生成后直接载入"""
+    mines: List[int]
+    counts: np.ndarray
+    openings: Tuple[array, List[array], int]
+
+
+def prepare_layout(rows: int, cols: int, mines: Sequence[int]) -> PreparedLayout:
+    """计算布局的周围地雷数和空白区域，只用到纯数据，可在任意线程中调用"""
+    mask = np.zeros(rows * cols, dtype=bool)
+    mask[np.asarray(mines, dtype=np.int64)] = True
+    counts = count_neighbor_mines(mask.reshape(rows, cols)).ravel().astype(np.uint8)
+    openings = label_openings(rows, cols, memoryview(mask), memoryview(counts))
+    return PreparedLayout(sorted(mines), counts, openings)
+
+
+def _local_neighbors(rows: int, cols: int, index: int) -> List[int]:
+    """按行列直接计算一个格子的邻居索引（局部修补时使用，不需要整张邻居表）"""
+    row, col = divmod(index, cols)
+    return [r * cols + c
+            for r in range(max(0, row - 1), min(rows, row + 2))
+            for c in range(max(0, col - 1), min(cols, col + 2))
+            if r != row or c != col]
+
+
+def relocate_mines(rows: int, cols: int, layout: PreparedLayout, excluded: Iterable[int],
+                   rng: random.Random, mask: Optional[np.ndarray] = None) -> PreparedLayout:
+    """把落在 excluded 格子上的地雷移到其余非地雷格子中随机的位置，并局部修补计数和空白区域
+
+    原布局在所有布局中均匀分布时，结果在 excluded 上没有地雷的布局中也均匀分布：
+    安全区外的地雷本来就是均匀的，补上的地雷再从剩下的格子中均匀抽取。
+    只重新计算移动过的格子两圈以内的周围地雷数和覆盖情况，并重新标记与之相连的空白区域，
+    耗时取决于这些区域的大小而不是整盘大小（区域变少时另要改写末尾一个区域的编号）。
+    layout 会被原地修改，mask 为布局的一维地雷掩码（一并修改），不给出时现场构造。
+    """
+    size = rows * cols
+    excluded = sorted(set(excluded))
+    if mask is None:
+        mask = np.zeros(size, dtype=bool)
+        mask[np.asarray(layout.mines, dtype=np.int64)] = True
+    removed = [index for index in excluded if mask[index]]
+    if not removed:
+        return layout
+
+    # 补上的地雷从安全区外的非地雷格子中均匀抽取，密度很高时改为枚举可用格子
+    blocked = set(excluded)
+    added = []
+    if size - len(layout.mines) - len(excluded) + len(removed) < len(removed):
+        raise ValueError(f"安全区外放不下 {len(layout.mines)} 个地雷")
+    for _ in range(64 * len(removed)):
+        if len(added) == len(removed):
+            break
+        index = rng.randrange(size)
+        if not mask[index] and index not in blocked:
+            blocked.add(index)
+            added.append(index)
+    if len(added) < len(removed):
+        free = np.flatnonzero(~mask)
+        free = [int(index) for index in free if index not in blocked]
+        added.extend(rng.sample(free, len(removed) - len(added)))
+
+    moved = removed + added
+    ring1 = set(moved)
+    for index in moved:
+        ring1.update(_local_neighbors(rows, cols, index))
+    ring2 = set(ring1)
+    for index in ring1:
+        ring2.update(_local_neighbors(rows, cols, index))
+
+    counts = layout.counts
+    region_of, regions, covered = layout.openings
+
+    def is_covered(index: int) -> bool:
+        # 非地雷格子属于某个区域，当且仅当它自己或某个邻居是空白格子
+        if mask[index]:
+            return False
+        return counts[index] == 0 or any(
+            counts[n] == 0 and not mask[n] for n in _local_neighbors(rows, cols, index))
+
+    covered -= sum(is_covered(index) for index in ring2)
+    mask[removed] = False
+    mask[added] = True
+    for index in ring1:
+        counts[index] = 0 if mask[index] else sum(
+            bool(mask[n]) for n in _local_neighbors(rows, cols, index))
+    covered += sum(is_covered(index) for index in ring2)
+
+    mines = layout.mines
+    for index in removed:
+        del mines[bisect.bisect_left(mines, index)]
+    for index in added:
+        bisect.insort(mines, index)
+
+    # 涉及的旧区域：空白格子在两圈以内的区域，拆开后和新出现的空白格子一起重新标记
+    freed = sorted({region_of[index] for index in ring2} - {-1})
+    seeds = []
+    for label in freed:
+        for index in regions[label]:
+            if region_of[index] == label:
+                region_of[index] = -1
+                seeds.append(index)
+    seeds.extend(index for index in ring1 if not mask[index] and counts[index] == 0)
+
+    new_regions = []
+    for start in seeds:
+        if region_of[start] != -1 or mask[start] or counts[start]:
+            continue
+        count = len(new_regions)
+        label = freed[count] if count < len(freed) else len(regions) + count - len(freed)
+        region_of[start] = label
+        members = array('i', [start])
+        border = set()
+        queue = deque([start])
+        while queue:
+            for neighbor in _local_neighbors(rows, cols, queue.popleft()):
+                if counts[neighbor] == 0:
+                    if region_of[neighbor] == -1:
+                        region_of[neighbor] = label
+                        members.append(neighbor)
+                        queue.append(neighbor)
+                elif neighbor not in border:
+                    border.add(neighbor)
+                    members.append(neighbor)
+        new_regions.append((label, members))
+
+    for label, members in new_regions:
+        if label < len(regions):
+            regions[label] = members
+        else:
+            regions.append(members)
+
+    # 新区域比旧区域少时，用末尾的区域填补空出的编号
+    for label in reversed(freed[len(new_regions):]):
+        last = len(regions) - 1
+        if label != last:
+            members = regions[last]
+            for index in members:
+                if region_of[index] == last:
+                    region_of[index] = label
+            regions[label] = members
+        regions.pop()
+
+    return PreparedLayout(mines, counts, (region_of, regions, covered))
 
 
 class Cell:
-    """游戏格子类"""
+    """游戏格子类
+
+    状态变化时通知所属游戏板，以便游戏板增量维护计数器和位置索引。
+    """
 
-    def __init__(self):
-        self.is_mine = False
-        self.is_revealed = False
-        self.is_flagged = False
+    __slots__ = ('_board', '_pos', '_is_mine', '_is_revealed', '_is_flagged', 'neighbor_mines')
+
+    def __init__(self, board: Optional['Board'] = None, pos: Tuple[int, int] = (0, 0)):
+        self._board = board
+        self._pos = pos
+        self._is_mine = False
+        self._is_revealed = False
+        self._is_flagged = False
         self.neighbor_mines = 0
 
+    @property
+    def is_mine(self) -> bool:
+        return self._is_mine
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        value = bool(value)
+        if value != self._is_mine:
+            self._is_mine = value
+            if self._board is not None:
+                self._board._on_mine_changed(self._pos, value)
+
+    @property
+    def is_revealed(self) -> bool:
+        return self._is_revealed
+
+    @is_revealed.setter
+    def is_revealed(self, value: bool):
+        value = bool(value)
+        if value != self._is_revealed:
+            self._is_revealed = value
+            if self._board is not None:
+                self._board._on_revealed_changed(self._pos, value)
+
+    @property
+    def is_flagged(self) -> bool:
+        return self._is_flagged
+
+    @is_flagged.setter
+    def is_flagged(self, value: bool):
+        value = bool(value)
+        if value != self._is_flagged:
+            self._is_flagged = value
+            if self._board is not None:
+                self._board._on_flagged_changed(self._pos, value)
+
+
+class _CellRow:
+    """游戏板单行的格子视图序列"""
+
+    __slots__ = ('_board', '_row')
+
+    def __init__(self, board: 'Board', row: int):
+        self._board = board
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._board.cols
+
+    def __getitem__(self, col: int):
+        if not 0 <= col < self._board.cols:
+            raise IndexError(col)
+        return self._board.get_cell(self._row, col)
+
+
+class CellGrid:
+    """兼容 board.cells[row][col] 访问方式的二维视图，供不以Cell对象存储的游戏板使用"""
+
+    __slots__ = ('_board',)
+
+    def __init__(self, board: 'Board'):
+        self._board = board
+
+    def __len__(self) -> int:
+        return self._board.rows
+
+    def __getitem__(self, row: int) -> _CellRow:
+        if not 0 <= row < self._board.rows:
+            raise IndexError(row)
+        return _CellRow(self._board, row)
+
 
 class Board:
     """游戏板类"""
 
+    # 是否支持整盘载入地雷布局（load_mines / load_layout），不支持时首次点击只能当场布雷
+    LOADS_LAYOUTS = True
+
     def __init__(self, rows: int, cols: int):
         self.rows = rows
         self.cols = cols
         self.cells: List[List[Cell]] = []
         self.total_mines = 0
+        self.seed: Optional[int] = None
+        self.region_of: Optional[array] = None
+        self.regions: Optional[List[array]] = None
+        self._covered_count = 0
         self._create_board()
 
     def _create_board(self):
         """创建空白游戏板"""
-        self.cells = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+        self._reset_indexes()
+        self.cells = [[Cell(self, (row, col)) for col in range(self.cols)] for row in range(self.rows)]
+        # 按一维索引访问的同一批格子
+        self._flat_cells = [cell for cells_row in self.cells for cell in cells_row]
+
+    def _reset_indexes(self):
+        """清空增量维护的计数器和位置索引"""
+        self.revealed_count = 0
+        self.mine_positions: Set[Tuple[int, int]] = set()
+        self.flagged_positions: Set[Tuple[int, int]] = set()
+        # 每个预计算空白区域内插旗的格子数，及其对应的区域标记（标记改变后失效）
+        self._region_flags: Dict[int, int] = {}
+        self._region_flags_owner: Optional[array] = None
+
+    def _on_mine_changed(self, pos: Tuple[int, int], value: bool):
+        """格子地雷状态变化回调"""
+        if value:
+            self.mine_positions.add(pos)
+        else:
+            self.mine_positions.discard(pos)
+
+    def _on_revealed_changed(self, pos: Tuple[int, int], value: bool):
+        """格子揭开状态变化回调"""
+        self.revealed_count += 1 if value else -1
+
+    def _on_flagged_changed(self, pos: Tuple[int, int], value: bool):
+        """格子标记状态变化回调"""
+        if value:
+            self.flagged_positions.add(pos)
+        else:
+            self.flagged_positions.discard(pos)
+        region_of = self.region_of
+        if region_of is not None and self._region_flags_owner is region_of:
+            label = region_of[pos[0] * self.cols + pos[1]]
+            if label >= 0:
+                self._region_flags[label] = self._region_flags.get(label, 0) + (1 if value else -1)
+
+    def rebuild_indexes(self):
+        """按当前格子状态重建计数器和位置索引（批量直接修改存储后调用）"""
+        self._reset_indexes()
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell = self.cells[row][col]
+                if cell.is_mine:
+                    self.mine_positions.add((row, col))
+                if cell.is_revealed:
+                    self.revealed_count += 1
+                if cell.is_flagged:
+                    self.flagged_positions.add((row, col))
 
     def get_cell(self, row: int, col: int) -> Optional[Cell]:
         """获取指定位置的格子"""
@@ -42,81 +412,249 @@ class Board:
         """检查位置是否有效"""
         return 0 <= row < self.rows and 0 <= col < self.cols
 
-    def place_mines(self, total_mines: int, exclude_row: int, exclude_col: int):
-        """布置地雷，避开指定位置"""
+    def place_mines(self, total_mines: int, exclude_row: int, exclude_col: int,
+                    safe_radius: int = 0,
+                    excluded: Optional[Iterable[Tuple[int, int]]] = None,
+                    seed: Optional[int] = None):
+        """布置地雷，避开指定位置
+
+        safe_radius 为首次点击的安全区半径：0 只避开点击格子，1 避开周围3x3区域。
+        excluded 可额外指定任意不放地雷的位置。seed 相同则布局相同，
+        未指定时随机生成并记录在 self.seed 中，便于复现。
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+
+        exclude_indices = set()
+        for dr in range(-safe_radius, safe_radius + 1):
+            for dc in range(-safe_radius, safe_radius + 1):
+                if self.is_valid_position(exclude_row + dr, exclude_col + dc):
+                    exclude_indices.add((exclude_row + dr) * self.cols + exclude_col + dc)
+        for row, col in excluded or ():
+            if self.is_valid_position(row, col):
+                exclude_indices.add(row * self.cols + col)
+
+        indices = sample_mine_indices(
+            self.get_total_cells(), total_mines, exclude_indices, random.Random(seed)
+        )
         self.total_mines = total_mines
-        mines_placed = 0
+        self._apply_mines(indices)
+
+        # 计算每个格子周围的地雷数量，并预先标记空白区域
+        self._calculate_neighbor_mines()
+        self._label_regions()
+
+    def load_mines(self, indices: Iterable[int]):
+        """按给定的一维索引直接布置地雷（例如从预生成的布局池中取出的布局），与 place_mines 一样用于尚未布雷的游戏板"""
+        indices = list(indices)
+        self.seed = None
+        self.total_mines = len(indices)
+        self._apply_mines(indices)
+        self._calculate_neighbor_mines()
+        self._label_regions()
+
+    def load_layout(self, layout: PreparedLayout):
+        """载入 prepare_layout 算好的布局，跳过周围地雷数和空白区域的计算"""
+        self.seed = None
+        self.total_mines = len(layout.mines)
+        self._apply_mines(layout.mines)
+        self._load_neighbor_mines(layout.counts)
+        self.region_of, self.regions, self._covered_count = layout.openings
 
-        while mines_placed < total_mines:
-            row = random.randint(0, self.rows - 1)
-            col = random.randint(0, self.cols - 1)
+    def get_state_bits(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """以一维布尔数组返回 (地雷, 已揭开, 已插旗) 状态，按行优先排列"""
+        cells = self._flat_cells
+        size = len(cells)
+        return (np.fromiter((cell._is_mine for cell in cells), dtype=bool, count=size),
+                np.fromiter((cell._is_revealed for cell in cells), dtype=bool, count=size),
+                np.fromiter((cell._is_flagged for cell in cells), dtype=bool, count=size))
 
-            # 避开排除位置和已有地雷位置
-            if (row != exclude_row or col != exclude_col) and not self.cells[row][col].is_mine:
-                self.cells[row][col].is_mine = True
-                mines_placed += 1
+    def set_state_bits(self, mines: np.ndarray, revealed: np.ndarray, flagged: np.ndarray):
+        """用一维布尔数组整体设置格子状态（例如载入存档），并重新计算周围地雷数
 
-        # 计算每个格子周围的地雷数量
+        不预先标记空白区域，之后的展开逐格遍历，结果相同。
+        """
+        for cell, mine, is_revealed, is_flagged in zip(self._flat_cells, mines.tolist(),
+                                                       revealed.tolist(), flagged.tolist()):
+            cell._is_mine = mine
+            cell._is_revealed = is_revealed
+            cell._is_flagged = is_flagged
+        self.total_mines = int(np.count_nonzero(mines))
+        self.rebuild_indexes()
         self._calculate_neighbor_mines()
 
+    def save_placement(self) -> Tuple[array, Optional[int]]:
+        """记录当前的地雷布局 (有序一维索引, 种子)，用于撤销后重做布雷"""
+        cols = self.cols
+        return array('i', sorted(row * cols + col for row, col in self.mine_positions)), self.seed
+
+    def restore_placement(self, placement: Tuple[array, Optional[int]]):
+        """在尚未布雷的游戏板上恢复 save_placement 记录的布局"""
+        indices, seed = placement
+        self.load_mines(indices)
+        self.seed = seed
+
+    def _label_regions(self):
+        """预先标记所有空白区域，之后点开空白格子直接揭开预计算的格子列表"""
+        mines = [cell.is_mine for cell in self._flat_cells]
+        counts = [cell.neighbor_mines for cell in self._flat_cells]
+        self.region_of, self.regions, self._covered_count = label_openings(
+            self.rows, self.cols, mines, counts
+        )
+
+    def get_opening_count(self) -> int:
+        """获取空白区域（opening）数量"""
+        return len(self.regions) if self.regions is not None else 0
+
+    def get_3bv(self) -> int:
+        """获取3BV，即不插旗时清空游戏板所需的最少点击次数
+
+        每个空白区域需要一次点击，不与任何空白区域相邻的数字格子各需一次点击。
+        """
+        if self.regions is None:
+            return 0
+        isolated = self.get_total_cells() - self.total_mines - self._covered_count
+        return len(self.regions) + isolated
+
+    def _precomputed_region(self, index: int) -> Optional[array]:
+        """获取空白格子所在的预计算区域，区域内有插旗的空白格子时返回None"""
+        if self.region_of is None:
+            return None
+        label = self.region_of[index]
+        if label < 0:
+            return None
+        # 插旗的空白格子会阻断展开，这种情况退回逐格遍历
+        if self._flagged_region_counts().get(label):
+            return None
+        return self.regions[label]
+
+    def _flagged_region_counts(self) -> Dict[int, int]:
+        """各空白区域内插旗的格子数：区域标记改变后首次使用时按旗子重建（O(旗子数)），之后随插旗增量维护"""
+        region_of = self.region_of
+        if self._region_flags_owner is not region_of:
+            counts: Dict[int, int] = {}
+            cols = self.cols
+            for row, col in self.flagged_positions:
+                label = region_of[row * cols + col]
+                if label >= 0:
+                    counts[label] = counts.get(label, 0) + 1
+            self._region_flags = counts
+            self._region_flags_owner = region_of
+        return self._region_flags
+
+    def _open_region(self, region: Iterable[int]) -> List[Tuple[int, int]]:
+        """揭开预计算区域中尚未揭开且未插旗的格子"""
+        opened = []
+        flat_cells = self._flat_cells
+        for index in region:
+            cell = flat_cells[index]
+            if not cell.is_revealed and not cell.is_flagged:
+                cell.is_revealed = True
+                opened.append(divmod(index, self.cols))
+        return opened
+
+    def _apply_mines(self, indices: Iterable[int]):
+        """在指定的一维索引位置放置地雷"""
+        for index in indices:
+            self._flat_cells[index].is_mine = True
+
     def _calculate_neighbor_mines(self):
-        """计算每个格子周围的地雷数量"""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.cells[row][col].is_mine:
-                    self.cells[row][col].neighbor_mines = self._count_neighbor_mines(row, col)
+        """计算每个格子周围的地雷数量（会使已标记的空白区域失效）"""
+        self.region_of = None
+        self.regions = None
+        mines = np.array([[cell.is_mine for cell in cells_row] for cells_row in self.cells], dtype=bool)
+        counts = count_neighbor_mines(mines).tolist()
+        for cells_row, counts_row in zip(self.cells, counts):
+            for cell, count in zip(cells_row, counts_row):
+                cell.neighbor_mines = count
+
+    def _load_neighbor_mines(self, counts: np.ndarray):
+        """直接写入已算好的周围地雷数（一维，按行优先排列）"""
+        for cell, count in zip(self._flat_cells, counts.tolist()):
+            cell.neighbor_mines = count
 
     def _count_neighbor_mines(self, row: int, col: int) -> int:
         """计算指定格子周围的地雷数量"""
-        count = 0
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
+        return sum(self.get_cell(n_row, n_col).is_mine for n_row, n_col in self.get_neighbors(row, col))
 
-                new_row, new_col = row + dr, col + dc
-                if self.is_valid_position(new_row, new_col):
-                    if self.cells[new_row][new_col].is_mine:
-                        count += 1
+    @property
+    def neighbor_table(self) -> NeighborTable:
+        """当前尺寸的邻居表（同尺寸游戏板共享）"""
+        return get_neighbor_table(self.rows, self.cols)
 
-        return count
+    def get_neighbor_indices(self, index: int) -> Sequence[int]:
+        """获取指定一维索引格子的邻居一维索引"""
+        table = self.neighbor_table
+        return table.indices[table.indptr[index]:table.indptr[index + 1]]
 
     def get_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
         """获取指定格子的所有有效邻居位置"""
-        neighbors = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
+        cols = self.cols
+        return [divmod(index, cols) for index in self.get_neighbor_indices(row * cols + col)]
+
+    def flood_reveal(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """从指定格子开始揭开连通的空白区域，返回本次新揭开的格子
+
+        使用一维索引的队列做广度优先遍历，格子入队时即标记为已揭开，
+        不需要递归和 visited 集合，内存只与队列长度有关。
+        旗子、地雷格子不会被揭开，数字格子被揭开但不再向外扩展。
+        布雷时已标记空白区域的，直接揭开预计算的格子列表。
+        """
+        cell = self.get_cell(row, col)
+        if not cell or cell.is_flagged or cell.is_mine:
+            return []
+
+        region = self._precomputed_region(row * self.cols + col)
+        if region is not None:
+            return self._open_region(region)
+
+        opened = []
+        if not cell.is_revealed:
+            cell.is_revealed = True
+            opened.append((row, col))
+        if cell.neighbor_mines != 0:
+            return opened
+
+        cols, flat_cells = self.cols, self._flat_cells
+        table = self.neighbor_table
+        indptr, indices = table.indptr, table.indices
+        queue = deque([row * cols + col])
+        while queue:
+            index = queue.popleft()
+            for neighbor_index in indices[indptr[index]:indptr[index + 1]]:
+                neighbor = flat_cells[neighbor_index]
+                if neighbor.is_revealed or neighbor.is_flagged or neighbor.is_mine:
                     continue
+                neighbor.is_revealed = True
+                opened.append(divmod(neighbor_index, cols))
+                if neighbor.neighbor_mines == 0:
+                    queue.append(neighbor_index)
 
-                new_row, new_col = row + dr, col + dc
-                if self.is_valid_position(new_row, new_col):
-                    neighbors.append((new_row, new_col))
+        return opened
 
-        return neighbors
+    def set_revealed(self, indices: Sequence[int], value: bool):
+        """批量设置指定格子（一维索引）的揭开状态，用于撤销和重做，代价与格子数成正比"""
+        cols = self.cols
+        for index in indices:
+            self.get_cell(*divmod(index, cols)).is_revealed = value
 
     def reset(self):
         """重置游戏板"""
         self._create_board()
         self.total_mines = 0
+        self.seed = None
+        self.region_of = None
+        self.regions = None
+        self._covered_count = 0
 
     def get_revealed_count(self) -> int:
-        """获取已揭开的格子数量"""
-        count = 0
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.cells[row][col].is_revealed:
-                    count += 1
-        return count
+        """获取已揭开的格子数量，O(1)"""
+        return self.revealed_count
 
     def get_flagged_count(self) -> int:
-        """获取已标记的格子数量"""
-        count = 0
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.cells[row][col].is_flagged:
-                    count += 1
-        return count
+        """获取已标记的格子数量，O(1)"""
+        return len(self.flagged_positions)
 
     def get_total_cells(self) -> int:
         """获取总格子数量"""
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+分块游戏板
+把游戏板切分成固定大小的区块，区块在第一次被访问时才按种子确定性地生成，
+内存只与已探索的区域大小有关，适用于超大尺寸的游戏板
+"""
+
+import random
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .board import Board, CellGrid, count_neighbor_mines
+
+
+class _Tile:
+    """区块类，按区块内行优先的局部索引存储格子状态"""
+
+    __slots__ = ('mines', 'revealed', 'flagged', 'counts')
+
+    def __init__(self, size: int):
+        self.mines = bytearray(size)
+        self.revealed = bytearray(size)
+        self.flagged = bytearray(size)
+        self.counts: Optional[bytearray] = None
+
+
+class ChunkCellView:
+    """分块游戏板格子视图类，接口与Cell一致"""
+
+    __slots__ = ('_board', '_row', '_col')
+
+    def __init__(self, board: 'ChunkedBoard', row: int, col: int):
+        self._board = board
+        self._row = row
+        self._col = col
+
+    @property
+    def is_mine(self) -> bool:
+        tile, local = self._board._locate(self._row, self._col)
+        return bool(tile.mines[local])
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        self._board._set_state('mines', self._row, self._col, value)
+
+    @property
+    def is_revealed(self) -> bool:
+        tile, local = self._board._locate(self._row, self._col)
+        return bool(tile.revealed[local])
+
+    @is_revealed.setter
+    def is_revealed(self, value: bool):
+        self._board._set_state('revealed', self._row, self._col, value)
+
+    @property
+    def is_flagged(self) -> bool:
+        tile, local = self._board._locate(self._row, self._col)
+        return bool(tile.flagged[local])
+
+    @is_flagged.setter
+    def is_flagged(self, value: bool):
+        self._board._set_state('flagged', self._row, self._col, value)
+
+    @property
+    def neighbor_mines(self) -> int:
+        return self._board._get_count(self._row, self._col)
+
+
+class ChunkedBoard(Board):
+    """分块游戏板类
+
+    区块 (tile_row, tile_col) 覆盖第 tile_row * tile_size 行起、第 tile_col * tile_size 列起的
+    tile_size x tile_size 个格子。布雷后每个区块的地雷数由全局地雷数按格子数精确分摊，
+    具体位置用 (种子, 区块坐标) 派生的随机数生成，因此任何区块都可以单独、重复地生成。
+    mine_positions 只包含已生成区块中的地雷。
+    """
+
+    LOADS_LAYOUTS = False
+
+    def __init__(self, rows: int, cols: int, tile_size: int = 32):
+        self.tile_size = tile_size
+        self.tiles: Dict[Tuple[int, int], _Tile] = {}
+        self._placed = False
+        self._excluded: Dict[Tuple[int, int], Set[int]] = {}
+        super().__init__(rows, cols)
+
+    def _create_board(self):
+        """创建空白游戏板，不分配任何区块"""
+        self.tiles = {}
+        self._placed = False
+        self._excluded = {}
+        self.cells = CellGrid(self)
+        self._reset_indexes()
+
+    def _tile_shape(self, tile_row: int, tile_col: int) -> Tuple[int, int]:
+        """区块在游戏板内的实际行数和列数（边缘区块可能不满）"""
+        size = self.tile_size
+        return (min(size, self.rows - tile_row * size),
+                min(size, self.cols - tile_col * size))
+
+    def _cells_before(self, tile_row: int, tile_col: int) -> int:
+        """按区块行优先顺序排在该区块之前的格子总数"""
+        size = self.tile_size
+        height = min(size, self.rows - tile_row * size)
+        return tile_row * size * self.cols + height * min(tile_col * size, self.cols)
+
+    def _tile_mine_count(self, tile_row: int, tile_col: int) -> int:
+        """区块内的地雷数，所有区块之和恰好等于 total_mines"""
+        total_cells = self.get_total_cells()
+        start = self._cells_before(tile_row, tile_col)
+        height, width = self._tile_shape(tile_row, tile_col)
+        end = start + height * width
+        return (self.total_mines * end // total_cells) - (self.total_mines * start // total_cells)
+
+    def _generate_mines(self, tile_row: int, tile_col: int, tile: _Tile):
+        """按种子和区块坐标生成区块内的地雷"""
+        height, width = self._tile_shape(tile_row, tile_col)
+        excluded = self._excluded.get((tile_row, tile_col), set())
+        candidates = [
+            local_row * self.tile_size + local_col
+            for local_row in range(height) for local_col in range(width)
+            if local_row * self.tile_size + local_col not in excluded
+        ]
+        rng = random.Random(f"{self.seed}:{tile_row}:{tile_col}")
+        base_row, base_col = tile_row * self.tile_size, tile_col * self.tile_size
+        for local in rng.sample(candidates, self._tile_mine_count(tile_row, tile_col)):
+            tile.mines[local] = 1
+            local_row, local_col = divmod(local, self.tile_size)
+            self.mine_positions.add((base_row + local_row, base_col + local_col))
+
+    def _get_tile(self, tile_row: int, tile_col: int) -> _Tile:
+        """获取区块，第一次访问时生成"""
+        tile = self.tiles.get((tile_row, tile_col))
+        if tile is None:
+            tile = _Tile(self.tile_size * self.tile_size)
+            if self._placed:
+                self._generate_mines(tile_row, tile_col, tile)
+            self.tiles[(tile_row, tile_col)] = tile
+        return tile
+
+    def _locate(self, row: int, col: int) -> Tuple[_Tile, int]:
+        """获取格子所在区块和区块内的局部索引"""
+        tile_row, local_row = divmod(row, self.tile_size)
+        tile_col, local_col = divmod(col, self.tile_size)
+        return self._get_tile(tile_row, tile_col), local_row * self.tile_size + local_col
+
+    def _get_counts(self, tile_row: int, tile_col: int) -> bytearray:
+        """获取区块内每个格子周围的地雷数，需要时生成相邻区块的地雷"""
+        tile = self._get_tile(tile_row, tile_col)
+        if tile.counts is None:
+            size = self.tile_size
+            window = np.zeros((3 * size, 3 * size), dtype=np.uint8)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    neighbor_row, neighbor_col = tile_row + dr, tile_col + dc
+                    if not (0 <= neighbor_row * size < self.rows and 0 <= neighbor_col * size < self.cols):
+                        continue
+                    neighbor = self._get_tile(neighbor_row, neighbor_col)
+                    window[(dr + 1) * size:(dr + 2) * size, (dc + 1) * size:(dc + 2) * size] = \
+                        np.frombuffer(neighbor.mines, dtype=np.uint8).reshape(size, size)
+            counts = count_neighbor_mines(window)[size:2 * size, size:2 * size]
+            tile.counts = bytearray(counts.tobytes())
+        return tile.counts
+
+    def _get_count(self, row: int, col: int) -> int:
+        """读取指定格子周围的地雷数量"""
+        tile_row, local_row = divmod(row, self.tile_size)
+        tile_col, local_col = divmod(col, self.tile_size)
+        return self._get_counts(tile_row, tile_col)[local_row * self.tile_size + local_col]
+
+    def _set_state(self, name: str, row: int, col: int, value: bool):
+        """修改单个格子的状态，并通过回调维护计数器和索引"""
+        tile, local = self._locate(row, col)
+        layer = getattr(tile, name)
+        value = bool(value)
+        if bool(layer[local]) == value:
+            return
+        layer[local] = value
+        if name == 'mines':
+            self._on_mine_changed((row, col), value)
+            self._invalidate_counts(row, col)
+        elif name == 'revealed':
+            self._on_revealed_changed((row, col), value)
+        else:
+            self._on_flagged_changed((row, col), value)
+
+    def _invalidate_counts(self, row: int, col: int):
+        """格子地雷状态变化后，让它所在及相邻区块的计数重新计算"""
+        for n_row in (row - 1, row, row + 1):
+            for n_col in (col - 1, col, col + 1):
+                tile = self.tiles.get((n_row // self.tile_size, n_col // self.tile_size))
+                if tile is not None:
+                    tile.counts = None
+
+    def get_cell(self, row: int, col: int) -> Optional[ChunkCellView]:
+        """获取指定位置的格子视图"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return ChunkCellView(self, row, col)
+        return None
+
+    def get_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """获取指定格子的所有有效邻居位置（不使用整盘邻居表）"""
+        return [
+            (n_row, n_col)
+            for n_row in (row - 1, row, row + 1) for n_col in (col - 1, col, col + 1)
+            if (n_row != row or n_col != col) and self.is_valid_position(n_row, n_col)
+        ]
+
+    def get_neighbor_indices(self, index: int) -> List[int]:
+        """获取指定一维索引格子的邻居一维索引（不使用整盘邻居表）"""
+        cols = self.cols
+        return [n_row * cols + n_col for n_row, n_col in self.get_neighbors(*divmod(index, cols))]
+
+    def place_mines(self, total_mines: int, exclude_row: int, exclude_col: int,
+                    safe_radius: int = 0,
+                    excluded: Optional[Iterable[Tuple[int, int]]] = None,
+                    seed: Optional[int] = None):
+        """设定布雷参数，区块的地雷在第一次访问时才生成
+
+        参数含义与 Board.place_mines 相同。
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        if not 0 <= total_mines <= self.get_total_cells():
+            raise ValueError(f"无法在 {self.get_total_cells()} 个格子中布置 {total_mines} 个地雷")
+
+        positions = [
+            (exclude_row + dr, exclude_col + dc)
+            for dr in range(-safe_radius, safe_radius + 1)
+            for dc in range(-safe_radius, safe_radius + 1)
+        ]
+        positions.extend(excluded or ())
+        self._excluded = {}
+        for row, col in positions:
+            if self.is_valid_position(row, col):
+                tile_row, local_row = divmod(row, self.tile_size)
+                tile_col, local_col = divmod(col, self.tile_size)
+                self._excluded.setdefault((tile_row, tile_col), set()).add(
+                    local_row * self.tile_size + local_col
+                )
+
+        self.seed = seed
+        self.total_mines = total_mines
+        for (tile_row, tile_col), local in self._excluded.items():
+            height, width = self._tile_shape(tile_row, tile_col)
+            if self._tile_mine_count(tile_row, tile_col) > height * width - len(local):
+                raise ValueError(f"区块 ({tile_row}, {tile_col}) 排除格子后放不下分配的地雷")
+
+        self._regenerate_tiles()
+
+    def _regenerate_tiles(self):
+        """已生成的区块（例如首次点击前插的旗子）按新的布雷参数重新生成地雷"""
+        self._placed = True
+        self.mine_positions.clear()
+        for (tile_row, tile_col), tile in self.tiles.items():
+            tile.mines = bytearray(len(tile.mines))
+            tile.counts = None
+            self._generate_mines(tile_row, tile_col, tile)
+
+    def save_placement(self):
+        """记录布雷参数 (地雷总数, 种子, 各区块排除的格子)，区块可据此重新生成"""
+        excluded = {key: set(local) for key, local in self._excluded.items()}
+        return self.total_mines, self.seed, excluded
+
+    def restore_placement(self, placement):
+        """按 save_placement 记录的参数恢复布雷"""
+        total_mines, seed, excluded = placement
+        self.total_mines = total_mines
+        self.seed = seed
+        self._excluded = {key: set(local) for key, local in excluded.items()}
+        self._regenerate_tiles()
+
+    def load_mines(self, indices: Iterable[int]):
+        """分块游戏板的地雷由各区块的种子按需生成，不支持载入整盘布局"""
+        raise NotImplementedError("分块游戏板不支持载入整盘地雷布局")
+
+    def load_layout(self, layout):
+        """分块游戏板不支持载入整盘布局"""
+        raise NotImplementedError("分块游戏板不支持载入整盘地雷布局")
+
+    def get_state_bits(self):
+        """分块游戏板只在访问时生成区块，不支持导出整盘状态"""
+        raise NotImplementedError("分块游戏板不支持导出整盘状态")
+
+    def set_state_bits(self, mines, revealed, flagged):
+        """分块游戏板不支持整体设置格子状态"""
+        raise NotImplementedError("分块游戏板不支持整体设置格子状态")
+
+    def _calculate_neighbor_mines(self):
+        """周围地雷数按区块在访问时计算，这里只让已有计数失效"""
+        for tile in self.tiles.values():
+            tile.counts = None
+
+    def _label_regions(self):
+        """区块按需生成，不预先标记空白区域"""
+
+    def rebuild_indexes(self):
+        """按已生成区块的状态重建计数器和位置索引"""
+        self._reset_indexes()
+        size = self.tile_size
+        for (tile_row, tile_col), tile in self.tiles.items():
+            for local in range(size * size):
+                position = (tile_row * size + local // size, tile_col * size + local % size)
+                if tile.mines[local]:
+                    self.mine_positions.add(position)
+                if tile.revealed[local]:
+                    self.revealed_count += 1
+                if tile.flagged[local]:
+                    self.flagged_positions.add(position)
+
+    def flood_reveal(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """从指定格子开始揭开连通的空白区域，返回本次新揭开的格子
+
+        规则与 Board.flood_reveal 相同，遍历过程中按需生成区块。
+        """
+        cell = self.get_cell(row, col)
+        if not cell or cell.is_flagged or cell.is_mine:
+            return []
+
+        opened = []
+        if not cell.is_revealed:
+            cell.is_revealed = True
+            opened.append((row, col))
+        if cell.neighbor_mines != 0:
+            return opened
+
+        size = self.tile_size
+        flooded = 0
+        queue = deque([(row, col)])
+        while queue:
+            r, c = queue.popleft()
+            for n_row, n_col in self.get_neighbors(r, c):
+                tile_row, local_row = divmod(n_row, size)
+                tile_col, local_col = divmod(n_col, size)
+                tile = self._get_tile(tile_row, tile_col)
+                local = local_row * size + local_col
+                if tile.revealed[local] or tile.flagged[local] or tile.mines[local]:
+                    continue
+                tile.revealed[local] = 1
+                flooded += 1
+                opened.append((n_row, n_col))
+                if self._get_counts(tile_row, tile_col)[local] == 0:
+                    queue.append((n_row, n_col))
+
+        # 起始格子经由视图揭开时已经计数，这里只补上直接写入区块的格子
+        self.revealed_count += flooded
+        return opened
+
+    def get_generated_tile_count(self) -> int:
+        """获取已生成的区块数量"""
+        return len(self.tiles)
+
+    def nbytes(self) -> int:
+        """获取已生成区块占用的字节数"""
+        per_tile = 4 * self.tile_size * self.tile_size
+        return per_tile * len(self.tiles)
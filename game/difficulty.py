@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+自定义难度
+校验难度配置，并从命令行参数或 JSON 配置文件读取自定义难度
+
+配置文件格式：
+    {"expert": {"rows": 16, "cols": 30, "mines": 99, "time": 999},
+     "huge": {"rows": 2000, "cols": 2000, "mines": 600000}}
+"""
+
+import argparse
+import json
+from typing import Dict, Optional
+
+# 游戏板格子数上限（约四百万格）。数组游戏板连同邻居表、空白区域和地雷位置索引，
+# 首次点击后峰值内存约为每格140字节（邻居表每格36字节，构建时峰值每格约72字节），
+# 上限处约0.6GB；当场布雷约7秒，开启预取时首次点击约1秒
+MAX_CELLS = 1 << 22
+
+# 未指定时限时的默认值（秒）
+DEFAULT_TIME = 3600
+
+# 命令行 --custom 定义的难度名称
+CUSTOM_DIFFICULTY = 'custom'
+
+
+def make_difficulty(rows: int, cols: int, mines: int, time: Optional[int] = None) -> dict:
+    """校验并返回难度配置，不合法时抛出 ValueError
+
+    至少要留出一个安全格子；首次点击的3x3安全区放不下时只保护点击格子。
+    """
+    try:
+        rows, cols, mines = int(rows), int(cols), int(mines)
+        time = DEFAULT_TIME if time is None else int(time)
+    except (TypeError, ValueError):
+        raise ValueError("难度的行数、列数、地雷数和时限必须是整数")
+    if rows < 1 or cols < 1:
+        raise ValueError(f"游戏板尺寸无效: {rows}x{cols}")
+    if rows * cols > MAX_CELLS:
+        raise ValueError(f"游戏板过大: {rows}x{cols}，最多 {MAX_CELLS} 格")
+    if not 1 <= mines < rows * cols:
+        raise ValueError(f"地雷数无效: {mines}，应在 1 到 {rows * cols - 1} 之间")
+    if time < 1:
+        raise ValueError(f"时限无效: {time}")
+    return {'rows': rows, 'cols': cols, 'mines': mines, 'time': time}
+
+
+def parse_difficulties(data: dict) -> Dict[str, dict]:
+    """校验 {名称: 配置} 形式的难度表"""
+    if not isinstance(data, dict):
+        raise ValueError("难度配置应为 {名称: 配置} 形式的对象")
+    difficulties = {}
+    for name, config in data.items():
+        if not isinstance(config, dict):
+            raise ValueError(f"难度 {name} 的配置应为对象")
+        unknown = set(config) - {'rows', 'cols', 'mines', 'time'}
+        if unknown:
+            raise ValueError(f"难度 {name} 有未知字段: {', '.join(sorted(unknown))}")
+        try:
+            difficulties[name] = make_difficulty(config.get('rows'), config.get('cols'),
+                                                 config.get('mines'), config.get('time'))
+        except ValueError as error:
+            raise ValueError(f"难度 {name}: {error}")
+    return difficulties
+
+
+def load_difficulties(path: str) -> Dict[str, dict]:
+    """从 JSON 配置文件读取难度表"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_difficulties(json.load(f))
+
+
+def add_difficulty_arguments(parser: argparse.ArgumentParser, default: str = 'easy'):
+    """给命令行添加难度相关参数"""
+    parser.add_argument('--difficulty', default=default,
+                        help="难度名称，内置 easy、hard，或配置文件中的名称")
+    parser.add_argument('--custom', type=int, nargs=3, metavar=('ROWS', 'COLS', 'MINES'),
+                        help=f"自定义难度（名称为 {CUSTOM_DIFFICULTY}）并使用该难度")
+    parser.add_argument('--time', type=int, default=None, help="自定义难度的时限（秒）")
+    parser.add_argument('--config', help="难度配置文件（JSON）")
+
+
+def difficulties_from_args(args: argparse.Namespace) -> Dict[str, dict]:
+    """按命令行参数读取自定义难度表，出错时抛出 ValueError"""
+    difficulties = load_difficulties(args.config) if args.config else {}
+    if args.custom:
+        difficulties[CUSTOM_DIFFICULTY] = make_difficulty(*args.custom, time=args.time)
+    return difficulties
+
+
+def difficulty_from_args(args: argparse.Namespace) -> str:
+    """命令行选定的难度名称：给出 --custom 时为自定义难度"""
+    return CUSTOM_DIFFICULTY if args.custom else args.difficulty
@@ -4,11 +4,31 @@
 处理游戏状态、用户输入和游戏规则
 """
 
+import random
 from enum import Enum
-from typing import List, Tuple, Optional, Set
+from typing import Callable, Dict, List, NamedTuple, Tuple, Optional, Sequence, Type
 from .board import Board, Cell
+from .difficulty import make_difficulty
+from .history import ActionDelta, ActionHistory
+from .prefetch import LayoutPrefetcher
 from .timer import Timer
-from .sound_manager import SoundManager
+from .sound_manager import SoundManager, create_sound_manager
+
+
+# 动作类型
+ACTION_REVEAL = 'reveal'
+ACTION_FLAG = 'flag'
+ACTION_CHORD = 'chord'
+
+# 变化来源：玩家动作、撤销、重做、时间到、开始新游戏（或读档）
+SOURCE_ACTION = 'action'
+SOURCE_UNDO = 'undo'
+SOURCE_REDO = 'redo'
+SOURCE_TIMEOUT = 'timeout'
+SOURCE_RESET = 'reset'
+
+# 布局提供者：(行数, 列数, 地雷数, 首次点击行, 首次点击列) -> 地雷的一维索引，返回None时按常规随机布雷
+LayoutProvider = Callable[[int, int, int, int, int], Optional[Sequence[int]]]
 
 
 class GameState(Enum):
@@ -19,38 +39,128 @@ class GameState(Enum):
     LOST = "lost"
 
 
+class ChangeSet(NamedTuple):
+    """一次动作（或撤销、重做）造成的变化
+
+    kind 和 index 为动作类型和操作格子的一维索引，撤销、重做时为被撤销、重做的那个动作；
+    revealed、hidden、flagged、unflagged 分别为变为已揭开、变为未揭开、插上旗子、拔掉旗子的格子的一维索引。
+    layout_changed 表示地雷布局改变（首次点击布雷、撤销首次点击、开始新游戏），
+    此时周围地雷数可能全部改变，订阅者应按游戏板整体刷新。
+    """
+    source: str
+    kind: Optional[str]
+    index: int
+    cols: int
+    revealed: Sequence[int]
+    hidden: Sequence[int]
+    flagged: Sequence[int]
+    unflagged: Sequence[int]
+    layout_changed: bool
+    state_before: GameState
+    state_after: GameState
+
+    @property
+    def position(self) -> Optional[Tuple[int, int]]:
+        """操作格子的坐标"""
+        return divmod(self.index, self.cols) if self.index >= 0 else None
+
+    def positions(self, indices: Sequence[int]) -> List[Tuple[int, int]]:
+        """把一组一维索引转换为坐标"""
+        return [divmod(index, self.cols) for index in indices]
+
+    def cell_count(self) -> int:
+        """状态改变的格子数"""
+        return len(self.revealed) + len(self.hidden) + len(self.flagged) + len(self.unflagged)
+
+    @property
+    def state_changed(self) -> bool:
+        """游戏状态是否改变"""
+        return self.state_before != self.state_after
+
+    @property
+    def won(self) -> bool:
+        """本次变化是否使游戏胜利"""
+        return self.state_changed and self.state_after == GameState.WON
+
+    @property
+    def lost(self) -> bool:
+        """本次变化是否使游戏失败"""
+        return self.state_changed and self.state_after == GameState.LOST
+
+
+# 变化订阅者：每个动作、撤销或重做完成后以 ChangeSet 调用
+ChangeListener = Callable[[ChangeSet], None]
+
+
 class GameLogic:
-    """游戏逻辑类"""
-
-    def __init__(self, difficulty: str = 'easy'):
-        self.difficulties = {
-            'easy': {
-                'rows': 10,
-                'cols': 10,
-                'mines': 10,
-                'time': 900  # 15分钟
-            },
-            'hard': {
-                'rows': 16,
-                'cols': 16,
-                'mines': 40,
-                'time': 600  # 10分钟
-            }
+    """游戏逻辑类
+
+    除内置难度外可以注册任意尺寸的自定义难度（最多 difficulty.MAX_CELLS 格）。
+    使用 ArrayBoard 时点击路径上各操作的复杂度（N 为格子数，M 为地雷数）：
+    布雷 O(N)，每局一次（开启预取时计数和空白区域在后台线程算好，首次点击只把安全区内的地雷局部移走，
+    再做 O(N) 的数组复制和 O(M) 的地雷位置索引，一百万格约0.15秒）；
+    揭开 O(新揭开的格子数)；插旗、双键 O(1)（双键另加连带展开的格子数）；
+    胜负检查和剩余雷数、计时器等界面计数 O(1)；踩雷后显示全部地雷 O(M)；
+    撤销、重做 O(该动作改变的格子数)，撤销首次点击 O(N)。渲染只绘制视口内的格子，与 N 无关。
+    内存 O(N)，首次点击后峰值约为每格140字节（见 difficulty.MAX_CELLS）。
+    """
+
+    # 首次点击安全区半径，1 表示点击格子周围3x3都不放地雷
+    FIRST_CLICK_SAFE_RADIUS = 1
+
+    # 内置难度配置
+    DIFFICULTIES = {
+        'easy': {
+            'rows': 10,
+            'cols': 10,
+            'mines': 10,
+            'time': 900  # 15分钟
+        },
+        'hard': {
+            'rows': 16,
+            'cols': 16,
+            'mines': 40,
+            'time': 600  # 10分钟
         }
+    }
+
+    def __init__(self, difficulty: str = 'easy', board_class: Type[Board] = Board,
+                 seed: Optional[int] = None, sound_manager: Optional[SoundManager] = None,
+                 headless: Optional[bool] = None,
+                 layout_provider: Optional[LayoutProvider] = None, prefetch: bool = False,
+                 difficulties: Optional[Dict[str, dict]] = None):
+        self.difficulties = {name: dict(config) for name, config in self.DIFFICULTIES.items()}
+        for name, config in (difficulties or {}).items():
+            self.add_difficulty(name, **config)
 
         self.current_difficulty = difficulty
+        self.board_class = board_class
+        # 每局的布雷种子由该随机源生成，指定 seed 即可复现整个对局序列
+        self.rng = random.Random(seed)
         self.game_state = GameState.READY
         self.first_click = True
+        self.layout_provider = layout_provider
+        self._subscribers: List[ChangeListener] = []
+        # 撤销/重做记录；_delta 为正在执行的动作的增量，动作可以嵌套（左键操作内揭开格子）
+        self.history = ActionHistory()
+        self._delta: Optional[ActionDelta] = None
+        self._action_depth = 0
+        # 后台预取布局，首次点击时不在界面线程中布雷（取用时机依赖线程调度，默认关闭以便复现）
+        self.prefetcher = LayoutPrefetcher() if prefetch else None
 
         # 初始化游戏板、计时器和音效
         self._init_game()
         self._setup_timer_callbacks()
-        self.sound_manager = SoundManager()
+        self._start_prefetch()
+        # 未注入音效后端时自动选择，无显示或音频设备时使用空音效后端
+        if sound_manager is None:
+            sound_manager = create_sound_manager(headless)
+        self.sound_manager = sound_manager
 
     def _init_game(self):
         """初始化游戏组件"""
         config = self.difficulties[self.current_difficulty]
-        self.board = Board(config['rows'], config['cols'])
+        self.board = self.board_class(config['rows'], config['cols'])
         self.timer = Timer(config['time'])
 
     def _setup_timer_callbacks(self):
@@ -58,6 +168,34 @@ class GameLogic:
         self.timer.set_time_up_callback(self._on_time_up)
         self.timer.set_tick_callback(self._on_timer_tick)
 
+    def set_layout_provider(self, provider: Optional[LayoutProvider]):
+        """设置首次点击时使用的布局提供者（例如无猜测布局池），None 表示随机布雷"""
+        self.layout_provider = provider
+
+    def subscribe(self, listener: ChangeListener):
+        """订阅变化，每个动作、撤销或重做完成后以 ChangeSet 调用（例如渲染、录像、求解器）"""
+        self._subscribers.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener):
+        """取消订阅"""
+        if listener in self._subscribers:
+            self._subscribers.remove(listener)
+
+    def _publish(self, changes: ChangeSet):
+        """把变化发给所有订阅者"""
+        for listener in list(self._subscribers):
+            listener(changes)
+
+    def _publish_reset(self):
+        """通知订阅者游戏板已整体改变（开始新游戏或读档）"""
+        if self._subscribers:
+            self._publish(ChangeSet(SOURCE_RESET, None, -1, self.board.cols, (), (), (), (), True,
+                                    self.game_state, self.game_state))
+
+    def add_difficulty(self, name: str, rows: int, cols: int, mines: int, time: Optional[int] = None):
+        """注册（或替换）难度，配置不合法时抛出 ValueError"""
+        self.difficulties[name] = make_difficulty(rows, cols, mines, time)
+
     def set_difficulty(self, difficulty: str):
         """设置游戏难度"""
         if difficulty in self.difficulties:
@@ -65,13 +203,32 @@ class GameLogic:
             self.new_game()
 
     def new_game(self):
-        """开始新游戏"""
+        """开始新游戏，难度的尺寸变化时重新创建游戏板"""
         self.game_state = GameState.READY
         self.first_click = True
-        self.board.reset()
 
         config = self.difficulties[self.current_difficulty]
+        if (self.board.rows, self.board.cols) != (config['rows'], config['cols']):
+            self.board = self.board_class(config['rows'], config['cols'])
+        else:
+            self.board.reset()
         self.timer.reset(config['time'])
+        self.history.clear()
+        self._start_prefetch()
+        self._publish_reset()
+
+    def _start_prefetch(self):
+        """为当前难度在后台预取布局"""
+        if self.prefetcher is None or not self.board_class.LOADS_LAYOUTS:
+            return
+        config = self.difficulties[self.current_difficulty]
+        self.prefetcher.start(config['rows'], config['cols'], config['mines'],
+                              seed=self.rng.getrandbits(32))
+
+    def close(self):
+        """停止后台预取线程"""
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
 
     def handle_left_click(self, x: int, y: int, renderer) -> bool:
         """处理左键点击"""
@@ -83,20 +240,22 @@ class GameLogic:
         if board_x is None or board_y is None:
             return False
 
-        row, col = board_y, board_x
-        cell = self.board.get_cell(row, col)
+        # 点击已揭开的数字（包括双击的第二下）等同于双键
+        cell = self.board.get_cell(board_y, board_x)
+        if cell and cell.is_revealed:
+            return bool(self.chord(board_y, board_x))
+        return bool(self.left_click(board_y, board_x))
 
-        if not cell or cell.is_revealed or cell.is_flagged:
+    def handle_middle_click(self, x: int, y: int, renderer) -> bool:
+        """处理中键点击：双键揭开周围格子"""
+        if self.game_state in [GameState.WON, GameState.LOST]:
             return False
 
-        # 揭开格子
-        self.reveal_cell(row, col)
-        self.sound_manager.play_sound('click')
-
-        # 检查游戏是否结束
-        self._check_game_end()
+        board_x, board_y = renderer.screen_to_board(x, y)
+        if board_x is None or board_y is None:
+            return False
 
-        return True
+        return bool(self.chord(board_y, board_x))
 
     def handle_right_click(self, x: int, y: int, renderer) -> bool:
         """处理右键点击"""
@@ -108,74 +267,172 @@ class GameLogic:
         if board_x is None or board_y is None:
             return False
 
-        row, col = board_y, board_x
-        cell = self.board.get_cell(row, col)
+        return self.right_click(board_y, board_x)
 
-        if not cell or cell.is_revealed:
-            return False
-
-        # 切换旗子标记
-        self.toggle_flag(row, col)
-        self.sound_manager.play_sound('flag')
-        return True
+    def left_click(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """按游戏板坐标执行左键操作：揭开格子并检查游戏是否结束，返回新揭开的格子"""
+        if self.game_state in [GameState.WON, GameState.LOST]:
+            return []
 
-    def reveal_cell(self, row: int, col: int):
-        """揭开指定格子"""
         cell = self.board.get_cell(row, col)
         if not cell or cell.is_revealed or cell.is_flagged:
-            return
+            return []
 
-        # 首次点击保护
-        if self.first_click:
-            self.first_click = False
-            self.game_state = GameState.PLAYING
-            self.board.place_mines(
-                self.difficulties[self.current_difficulty]['mines'],
-                row, col
-            )
-            self.timer.start()
-
-        cell.is_revealed = True
-
-        # 如果踩到地雷，游戏结束
-        if cell.is_mine:
-            self.sound_manager.play_sound('mine')
-            self.game_over(False)
-            return
+        self._begin_action()
+        try:
+            # 揭开格子
+            opened = self.reveal_cell(row, col)
+            self.sound_manager.play_sound('click')
 
-        # 如果是空格子，递归揭开周围的格子
-        if cell.neighbor_mines == 0:
-            self.reveal_empty_cells(row, col)
+            # 检查游戏是否结束
+            self._check_game_end()
+        finally:
+            self._end_action()
 
-    def reveal_empty_cells(self, row: int, col: int):
-        """递归揭开空格子"""
-        visited = set()
-        self._reveal_empty_cells_recursive(row, col, visited)
+        return opened
 
-    def _reveal_empty_cells_recursive(self, row: int, col: int, visited: Set[Tuple[int, int]]):
-        """递归揭开空格子的内部实现"""
-        if (row, col) in visited:
-            return
+    def right_click(self, row: int, col: int) -> bool:
+        """按游戏板坐标执行右键操作：切换旗子标记"""
+        if self.game_state in [GameState.WON, GameState.LOST]:
+            return False
 
-        visited.add((row, col))
         cell = self.board.get_cell(row, col)
+        if not cell or cell.is_revealed:
+            return False
 
-        if not cell or cell.is_revealed or cell.is_flagged or cell.is_mine:
-            return
+        # 切换旗子标记
+        self.toggle_flag(row, col)
+        self.sound_manager.play_sound('flag')
+        return True
 
-        cell.is_revealed = True
+    def chord(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """双键：已揭开数字周围的旗子数等于数字时，一次揭开其余全部未插旗的邻居，返回新揭开的格子
 
-        # 如果周围没有地雷，继续递归
-        if cell.neighbor_mines == 0:
-            neighbors = self.board.get_neighbors(row, col)
-            for n_row, n_col in neighbors:
-                self._reveal_empty_cells_recursive(n_row, n_col, visited)
+        所有邻居及其连带的空白区域作为一批揭开，只检查一次游戏结束、只播放一次音效，
+        撤销记录和变化集合中也只是一个动作。旗子插错时踩到的地雷照常导致失败。
+        """
+        if self.game_state != GameState.PLAYING:
+            return []
+        board = self.board
+        cell = board.get_cell(row, col)
+        if not cell or not cell.is_revealed or cell.is_mine or cell.neighbor_mines == 0:
+            return []
+
+        cols = board.cols
+        targets = []
+        flags = 0
+        for index in board.get_neighbor_indices(row * cols + col):
+            neighbor = board.get_cell(*divmod(int(index), cols))
+            if neighbor.is_flagged:
+                flags += 1
+            elif not neighbor.is_revealed:
+                targets.append((neighbor, divmod(int(index), cols)))
+        if flags != cell.neighbor_mines or not targets:
+            return []
+
+        self._begin_action(ACTION_CHORD, row, col)
+        try:
+            opened = []
+            hit = False
+            for neighbor, (r, c) in targets:
+                if neighbor.is_revealed:
+                    continue
+                if neighbor.is_mine:
+                    neighbor.is_revealed = True
+                    opened.append((r, c))
+                    hit = True
+                else:
+                    opened.extend(board.flood_reveal(r, c))
+            self._record_revealed(opened)
+
+            if hit:
+                self.sound_manager.play_sound('mine')
+                self.game_over(False)
+            else:
+                self.sound_manager.play_sound('click')
+                self._check_game_end()
+        finally:
+            self._end_action()
+        return opened
+
+    def reveal_cell(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """揭开指定格子，返回本次新揭开的格子列表"""
+        cell = self.board.get_cell(row, col)
+        if not cell or cell.is_revealed or cell.is_flagged:
+            return []
+
+        self._begin_action(ACTION_REVEAL, row, col)
+        try:
+            # 首次点击保护：先布雷，布雷失败时对局仍处于未开始状态
+            if self.first_click:
+                self._place_mines(row, col)
+                self.first_click = False
+                self.game_state = GameState.PLAYING
+                self._record_placement()
+                self.timer.start()
+
+            # 如果踩到地雷，游戏结束
+            if cell.is_mine:
+                cell.is_revealed = True
+                self._record_revealed([(row, col)])
+                self.sound_manager.play_sound('mine')
+                self.game_over(False)
+                return [(row, col)]
+
+            # 揭开格子，如果是空格子则连带揭开周围的空白区域
+            opened = self.reveal_empty_cells(row, col)
+            self._record_revealed(opened)
+            return opened
+        finally:
+            self._end_action()
+
+    def _place_mines(self, row: int, col: int):
+        """首次点击时布置地雷，安全区放不下时退回只保护点击格子
+
+        优先使用布局提供者，其次使用后台预取的布局，都没有时当场随机布雷。
+        不支持整盘载入布局的游戏板（分块游戏板）总是当场布雷。
+        """
+        mines = self.difficulties[self.current_difficulty]['mines']
+        loads_layouts = self.board.LOADS_LAYOUTS
+        if self.layout_provider is not None and loads_layouts:
+            layout = self.layout_provider(self.board.rows, self.board.cols, mines, row, col)
+            if layout is not None:
+                self.board.load_mines(layout)
+                return
+
+        safe_radius = self.FIRST_CLICK_SAFE_RADIUS
+        safe_cells = (2 * safe_radius + 1) ** 2
+        if self.board.get_total_cells() - safe_cells < mines:
+            safe_radius = 0
+
+        if self.prefetcher is not None and loads_layouts:
+            board = self.board
+            excluded = [r * board.cols + c
+                        for r in range(row - safe_radius, row + safe_radius + 1)
+                        for c in range(col - safe_radius, col + safe_radius + 1)
+                        if board.is_valid_position(r, c)]
+            layout = self.prefetcher.take(board.rows, board.cols, mines, excluded)
+            if layout is not None:
+                board.load_layout(layout)
+                return
+
+        self.board.place_mines(mines, row, col, safe_radius=safe_radius,
+                               seed=self.rng.getrandbits(32))
+
+    def reveal_empty_cells(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """非递归地揭开空格子所在的连通区域，返回新揭开的格子"""
+        return self.board.flood_reveal(row, col)
 
     def toggle_flag(self, row: int, col: int):
         """切换旗子标记"""
         cell = self.board.get_cell(row, col)
         if cell and not cell.is_revealed:
-            cell.is_flagged = not cell.is_flagged
+            self._begin_action(ACTION_FLAG, row, col)
+            try:
+                cell.is_flagged = not cell.is_flagged
+                self._delta.flagged.append(row * self.board.cols + col)
+            finally:
+                self._end_action()
 
     def game_over(self, won: bool):
         """游戏结束"""
@@ -192,11 +449,125 @@ class GameLogic:
 
     def _reveal_all_mines(self):
         """显示所有地雷"""
-        for row in range(self.board.rows):
-            for col in range(self.board.cols):
-                cell = self.board.get_cell(row, col)
-                if cell and cell.is_mine:
-                    cell.is_revealed = True
+        shown = []
+        for row, col in list(self.board.mine_positions):
+            cell = self.board.get_cell(row, col)
+            if not cell.is_revealed:
+                cell.is_revealed = True
+                shown.append((row, col))
+        self._record_revealed(shown)
+
+    def _begin_action(self, kind: Optional[str] = None, row: int = -1, col: int = -1):
+        """开始记录一个动作的增量，嵌套调用只在最外层记录，动作类型取第一个给出的"""
+        if self._action_depth == 0:
+            self._delta = ActionDelta(self.game_state, self.first_click, self.timer.is_running)
+        if kind is not None and self._delta.kind is None:
+            self._delta.kind = kind
+            self._delta.index = row * self.board.cols + col
+        self._action_depth += 1
+
+    def _end_action(self, source: str = SOURCE_ACTION):
+        """结束记录，最外层结束时把增量存入撤销记录并发布变化
+
+        时间到同样记入撤销记录：撤销时隐藏显示出的地雷并恢复计时，计时器随即再次到期。
+        """
+        self._action_depth -= 1
+        if self._action_depth == 0:
+            delta, self._delta = self._delta, None
+            delta.state_after = self.game_state
+            delta.first_click_after = self.first_click
+            delta.timer_after = self.timer.is_running
+            self.history.record(delta)
+            if not delta.is_empty():
+                self._publish_delta(source, delta, True)
+
+    def _publish_delta(self, source: str, delta: ActionDelta, forward: bool):
+        """把增量转换为 ChangeSet 发布；forward 为 False 时表示撤销该增量"""
+        if not self._subscribers:
+            return
+        board = self.board
+        cols = board.cols
+        flagged, unflagged = [], []
+        for index in delta.flagged:
+            target = flagged if board.get_cell(*divmod(index, cols)).is_flagged else unflagged
+            target.append(index)
+        if forward:
+            revealed, hidden = delta.revealed, ()
+            state_before, state_after = delta.state_before, delta.state_after
+        else:
+            revealed, hidden = (), delta.revealed
+            state_before, state_after = delta.state_after, delta.state_before
+        self._publish(ChangeSet(source, delta.kind, delta.index, cols, revealed, hidden, flagged,
+                                unflagged, delta.placement is not None, state_before, state_after))
+
+    def _record_revealed(self, cells: List[Tuple[int, int]]):
+        """把新揭开的格子记入当前动作的增量"""
+        if self._delta is not None:
+            cols = self.board.cols
+            self._delta.revealed.extend(row * cols + col for row, col in cells)
+
+    def _record_placement(self):
+        """把首次点击布置的地雷记入当前动作的增量"""
+        if self._delta is not None:
+            self._delta.placement = self.board.save_placement()
+
+    def can_undo(self) -> bool:
+        """是否有可撤销的动作"""
+        return bool(self.history.undo_stack)
+
+    def can_redo(self) -> bool:
+        """是否有可重做的动作"""
+        return bool(self.history.redo_stack)
+
+    def undo(self) -> bool:
+        """撤销最近一个动作，只恢复该动作改变的格子；撤销首次点击时清空布雷"""
+        delta = self.history.pop_undo()
+        if delta is None:
+            return False
+        board = self.board
+        board.set_revealed(delta.revealed, False)
+        self._toggle_flags(delta.flagged)
+        if delta.placement is not None:
+            # 首次点击之前插的旗子在清空游戏板后保留
+            flagged = list(board.flagged_positions)
+            board.reset()
+            for row, col in flagged:
+                board.get_cell(row, col).is_flagged = True
+        self._restore_status(delta.state_before, delta.first_click_before, delta.timer_before)
+        self._publish_delta(SOURCE_UNDO, delta, False)
+        return True
+
+    def redo(self) -> bool:
+        """重做最近一个被撤销的动作，按记录的增量直接恢复，不重新执行"""
+        delta = self.history.pop_redo()
+        if delta is None:
+            return False
+        board = self.board
+        if delta.placement is not None:
+            board.restore_placement(delta.placement)
+        board.set_revealed(delta.revealed, True)
+        self._toggle_flags(delta.flagged)
+        self._restore_status(delta.state_after, delta.first_click_after, delta.timer_after)
+        self._publish_delta(SOURCE_REDO, delta, True)
+        return True
+
+    def _toggle_flags(self, indices):
+        """切换一组格子的旗子"""
+        cols = self.board.cols
+        for index in indices:
+            cell = self.board.get_cell(*divmod(index, cols))
+            cell.is_flagged = not cell.is_flagged
+
+    def _restore_status(self, game_state: GameState, first_click: bool, timer_running: bool):
+        """恢复游戏状态、首次点击标记和计时器"""
+        self.game_state = game_state
+        self.first_click = first_click
+        if first_click:
+            self.timer.reset(self.difficulties[self.current_difficulty]['time'])
+        elif timer_running and not self.timer.is_running:
+            self.timer.restore(self.timer.get_elapsed(), True)
+        elif not timer_running and self.timer.is_running:
+            self.timer.stop()
 
     def _check_game_end(self):
         """检查游戏是否结束"""
@@ -214,7 +585,11 @@ class GameLogic:
     def _on_time_up(self):
         """时间到期回调"""
         if self.game_state == GameState.PLAYING:
-            self.game_over(False)
+            self._begin_action()
+            try:
+                self.game_over(False)
+            finally:
+                self._end_action(SOURCE_TIMEOUT)
 
     def _on_timer_tick(self, time_left: int):
         """计时器每秒回调"""
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+无猜测游戏板生成
+布雷后用确定性求解器从首次点击开始验证整盘不需要猜测即可解开，不满足则重新布雷；
+合格的布局按游戏板规格和首次点击位置存入磁盘上的布局池，游戏首次点击时直接取用
+
+命令行用法：
+    python -m game.generator --difficulty hard --count 20 --workers 4
+"""
+
+import argparse
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .board import Board, sample_mine_indices
+from .difficulty import add_difficulty_arguments, difficulties_from_args, difficulty_from_args
+from .game_logic import GameLogic
+from .solver import Solver
+
+# 布局池文件头：魔数、版本、行数、列数、地雷数
+HEADER = struct.Struct('<4sHxxiii')
+MAGIC = b'MSLP'
+VERSION = 1
+
+DEFAULT_POOL_DIR = os.path.join(os.path.expanduser('~'), '.minesweeper', 'pool')
+
+Transform = Callable[[int, int], Tuple[int, int]]
+
+
+def first_click_excluded(rows: int, cols: int, mines: int, row: int, col: int,
+                         safe_radius: int = GameLogic.FIRST_CLICK_SAFE_RADIUS) -> Set[int]:
+    """首次点击时不放地雷的格子，规则与 GameLogic 相同：安全区放不下时只保护点击格子"""
+    if rows * cols - (2 * safe_radius + 1) ** 2 < mines:
+        safe_radius = 0
+    return {
+        r * cols + c
+        for r in range(row - safe_radius, row + safe_radius + 1)
+        for c in range(col - safe_radius, col + safe_radius + 1)
+        if 0 <= r < rows and 0 <= c < cols
+    }
+
+
+def is_no_guess(rows: int, cols: int, mines: Sequence[int], row: int, col: int) -> bool:
+    """从首次点击开始只揭开求解器推出的安全格子，判断能否不猜测地揭开全部安全格子"""
+    board = Board(rows, cols)
+    board.load_mines(mines)
+    if board.get_cell(row, col).is_mine:
+        return False
+
+    solver = Solver(board)
+    solver.notify_revealed(board.flood_reveal(row, col))
+    safe_total = rows * cols - len(mines)
+    while board.get_revealed_count() < safe_total:
+        safe, found_mines = solver.find_certain()
+        if not safe and len(found_mines) == len(mines):
+            # 地雷已全部推出，其余未揭开的格子都是安全的
+            safe = [divmod(index, cols) for index in range(rows * cols)
+                    if index not in solver.numbers and index not in solver.mines]
+        if not safe:
+            return False
+        for safe_row, safe_col in safe:
+            if not board.get_cell(safe_row, safe_col).is_revealed:
+                solver.notify_revealed(board.flood_reveal(safe_row, safe_col))
+    return True
+
+
+def generate_layout(rows: int, cols: int, mines: int, row: int, col: int,
+                    seed: Optional[int] = None, max_attempts: int = 100000) -> List[int]:
+    """反复随机布雷，直到得到从 (row, col) 开始不需要猜测的布局，返回地雷的一维索引"""
+    rng = random.Random(seed)
+    excluded = first_click_excluded(rows, cols, mines, row, col)
+    for _ in range(max_attempts):
+        indices = sample_mine_indices(rows * cols, mines, excluded, rng)
+        if is_no_guess(rows, cols, indices, row, col):
+            return indices
+    raise RuntimeError(f"{max_attempts} 次尝试内没有生成无猜测布局")
+
+
+def _symmetries(rows: int, cols: int) -> List[Tuple[Transform, Transform]]:
+    """游戏板的对称变换 (正变换, 逆变换)，正方形游戏板另有转置和旋转"""
+    transforms: List[Tuple[Transform, Transform]] = []
+    flips = [
+        lambda r, c: (r, c),
+        lambda r, c: (r, cols - 1 - c),
+        lambda r, c: (rows - 1 - r, c),
+        lambda r, c: (rows - 1 - r, cols - 1 - c),
+    ]
+    transforms.extend((flip, flip) for flip in flips)
+    if rows == cols:
+        n = rows - 1
+        transforms.append((lambda r, c: (c, r), lambda r, c: (c, r)))
+        transforms.append((lambda r, c: (n - c, n - r), lambda r, c: (n - c, n - r)))
+        transforms.append((lambda r, c: (c, n - r), lambda r, c: (n - c, r)))
+        transforms.append((lambda r, c: (n - c, r), lambda r, c: (c, n - r)))
+    return transforms
+
+
+def canonical_positions(rows: int, cols: int) -> List[Tuple[int, int]]:
+    """在对称变换下互不等价的首次点击位置（每类取行优先最小者）"""
+    transforms = _symmetries(rows, cols)
+    positions = []
+    for row in range(rows):
+        for col in range(cols):
+            if min(forward(row, col) for forward, _ in transforms) == (row, col):
+                positions.append((row, col))
+    return positions
+
+
+class LayoutPool:
+    """磁盘布局池类
+
+    每种游戏板规格（行x列x地雷数）一个目录，每个首次点击位置一个文件，
+    文件为固定文件头加若干条定长记录，每条记录是按位打包的地雷布局。
+    取用时从文件末尾弹出一条并截断文件。对称位置的布局经过翻转或旋转后同样可用。
+    """
+
+    def __init__(self, directory: str = DEFAULT_POOL_DIR):
+        self.directory = directory
+
+    def path(self, rows: int, cols: int, mines: int, row: int, col: int) -> str:
+        """布局文件路径"""
+        return os.path.join(self.directory, f"{rows}x{cols}x{mines}", f"{row}_{col}.pool")
+
+    @staticmethod
+    def _record_size(rows: int, cols: int) -> int:
+        return (rows * cols + 7) // 8
+
+    def count(self, rows: int, cols: int, mines: int, row: int, col: int) -> int:
+        """指定首次点击位置已有的布局数（不含对称位置）"""
+        path = self.path(rows, cols, mines, row, col)
+        if not os.path.exists(path):
+            return 0
+        return (os.path.getsize(path) - HEADER.size) // self._record_size(rows, cols)
+
+    def add(self, rows: int, cols: int, mines: int, row: int, col: int,
+            layouts: Iterable[Sequence[int]]):
+        """把布局追加到指定首次点击位置的文件"""
+        path = self.path(rows, cols, mines, row, col)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(HEADER.pack(MAGIC, VERSION, rows, cols, mines))
+            for layout in layouts:
+                bits = np.zeros(rows * cols, dtype=bool)
+                bits[np.asarray(layout, dtype=np.int64)] = True
+                f.write(np.packbits(bits).tobytes())
+
+    def _pop(self, rows: int, cols: int, mines: int, row: int, col: int) -> Optional[List[int]]:
+        """从指定位置的文件末尾弹出一条布局"""
+        path = self.path(rows, cols, mines, row, col)
+        if not os.path.exists(path):
+            return None
+        record = self._record_size(rows, cols)
+        with open(path, 'r+b') as f:
+            magic, version, *_ = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"不是有效的布局池文件: {path}")
+            size = os.path.getsize(path)
+            if size - HEADER.size < record:
+                return None
+            f.seek(size - record)
+            data = f.read(record)
+            f.truncate(size - record)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))[:rows * cols]
+        return np.flatnonzero(bits).tolist()
+
+    def take(self, rows: int, cols: int, mines: int, row: int, col: int) -> Optional[List[int]]:
+        """取出一条首次点击 (row, col) 可用的布局，没有时返回None"""
+        for forward, inverse in _symmetries(rows, cols):
+            source = inverse(row, col)
+            layout = self._pop(rows, cols, mines, *source)
+            if layout is not None:
+                return sorted(r * cols + c for r, c in
+                              (forward(*divmod(index, cols)) for index in layout))
+        return None
+
+    def available(self, rows: int, cols: int, mines: int, row: int, col: int) -> int:
+        """首次点击 (row, col) 可用的布局数（含对称位置）"""
+        sources = {inverse(row, col) for _, inverse in _symmetries(rows, cols)}
+        return sum(self.count(rows, cols, mines, *source) for source in sources)
+
+
+def _generate_batch(rows: int, cols: int, mines: int, row: int, col: int,
+                    count: int, seed: int) -> Tuple[Tuple[int, int], List[List[int]]]:
+    """在工作进程中生成一批布局"""
+    rng = random.Random(seed)
+    layouts = [generate_layout(rows, cols, mines, row, col, seed=rng.getrandbits(32))
+               for _ in range(count)]
+    return (row, col), layouts
+
+
+def fill_pool(pool: LayoutPool, rows: int, cols: int, mines: int,
+              positions: Optional[Sequence[Tuple[int, int]]] = None, count: int = 10,
+              workers: Optional[int] = None, seed: Optional[int] = None,
+              batch_size: int = 5) -> int:
+    """在进程池中预先生成布局，把每个位置补足到 count 条，返回新增的布局数
+
+    positions 默认为对称意义下互不等价的全部位置，其余位置通过对称变换取用。
+    """
+    if positions is None:
+        positions = canonical_positions(rows, cols)
+    rng = random.Random(seed)
+    tasks = []
+    for row, col in positions:
+        missing = count - pool.count(rows, cols, mines, row, col)
+        while missing > 0:
+            size = min(batch_size, missing)
+            tasks.append((rows, cols, mines, row, col, size, rng.getrandbits(32)))
+            missing -= size
+
+    added = 0
+    if workers == 1:
+        results = (_generate_batch(*task) for task in tasks)
+        for (row, col), layouts in results:
+            pool.add(rows, cols, mines, row, col, layouts)
+            added += len(layouts)
+        return added
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate_batch, *task) for task in tasks]
+        for future in as_completed(futures):
+            (row, col), layouts = future.result()
+            pool.add(rows, cols, mines, row, col, layouts)
+            added += len(layouts)
+    return added
+
+
+class PoolLayoutProvider:
+    """布局提供者，供 GameLogic 首次点击时调用
+
+    优先从布局池取用；池中没有且 generate_missing 为真时当场生成（较慢）。
+    """
+
+    def __init__(self, pool: Optional[LayoutPool] = None, generate_missing: bool = True,
+                 seed: Optional[int] = None):
+        self.pool = pool if pool is not None else LayoutPool()
+        self.generate_missing = generate_missing
+        self.rng = random.Random(seed)
+
+    def __call__(self, rows: int, cols: int, mines: int, row: int, col: int) -> Optional[List[int]]:
+        layout = self.pool.take(rows, cols, mines, row, col)
+        if layout is None and self.generate_missing:
+            layout = generate_layout(rows, cols, mines, row, col, seed=self.rng.getrandbits(32))
+        return layout
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """命令行入口：预先填充布局池"""
+    parser = argparse.ArgumentParser(description="预先生成无猜测扫雷布局")
+    add_difficulty_arguments(parser)
+    parser.add_argument('--count', type=int, default=10, help="每个首次点击位置的布局数")
+    parser.add_argument('--position', type=int, nargs=2, action='append', metavar=('ROW', 'COL'),
+                        help="只生成指定的首次点击位置，可重复；默认全部位置")
+    parser.add_argument('--pool', default=DEFAULT_POOL_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        difficulties = difficulties_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    difficulty = difficulty_from_args(args)
+    config = difficulties.get(difficulty, GameLogic.DIFFICULTIES.get(difficulty))
+    if config is None:
+        parser.error(f"未知难度: {difficulty}")
+
+    positions = [tuple(position) for position in args.position] if args.position else None
+    added = fill_pool(LayoutPool(args.pool), config['rows'], config['cols'], config['mines'],
+                      positions=positions, count=args.count, workers=args.workers, seed=args.seed)
+    print(f"新增 {added} 个布局，保存在 {args.pool}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+撤销/重做记录
+每个动作只记录它改变的格子（一维索引）和游戏状态的变化，内存与改变的格子数成正比，与游戏板大小无关
+"""
+
+from array import array
+from collections import deque
+from typing import Deque, Optional
+
+
+class ActionDelta:
+    """一次动作的增量
+
+    kind 和 index 为动作类型和操作格子的一维索引（时间到等非玩家动作为 None 和 -1），
+    revealed 为本次新揭开的格子（包括踩雷后显示的全部地雷），flagged 为切换过旗子的格子，
+    placement 仅在首次点击布雷时记录（Board.save_placement 的结果），撤销时清空游戏板、重做时按原布局重新布置。
+    """
+
+    __slots__ = ('kind', 'index', 'revealed', 'flagged', 'placement', 'state_before', 'state_after',
+                 'first_click_before', 'first_click_after', 'timer_before', 'timer_after')
+
+    def __init__(self, game_state, first_click: bool, timer_running: bool):
+        self.kind: Optional[str] = None
+        self.index = -1
+        self.revealed = array('i')
+        self.flagged = array('i')
+        self.placement: Optional[object] = None
+        self.state_before = game_state
+        self.state_after = game_state
+        self.first_click_before = first_click
+        self.first_click_after = first_click
+        self.timer_before = timer_running
+        self.timer_after = timer_running
+
+    def is_empty(self) -> bool:
+        """动作是否没有改变任何东西"""
+        return (not self.revealed and not self.flagged and self.placement is None
+                and self.state_before == self.state_after)
+
+    def cell_count(self) -> int:
+        """本次改变的格子数"""
+        return len(self.revealed) + len(self.flagged)
+
+
+class ActionHistory:
+    """撤销/重做栈
+
+    limit 为最多保留的撤销步数，None 表示不限制。记录新动作时清空重做栈。
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.undo_stack: Deque[ActionDelta] = deque(maxlen=limit)
+        self.redo_stack: Deque[ActionDelta] = deque()
+
+    def record(self, delta: ActionDelta):
+        """记录一个新动作"""
+        if delta.is_empty():
+            return
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+
+    def pop_undo(self) -> Optional[ActionDelta]:
+        """取出最近一个可撤销的动作，并移入重做栈"""
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        self.redo_stack.append(delta)
+        return delta
+
+    def pop_redo(self) -> Optional[ActionDelta]:
+        """取出最近一个可重做的动作，并移回撤销栈"""
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        self.undo_stack.append(delta)
+        return delta
+
+    def clear(self):
+        """清空全部记录"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def __len__(self) -> int:
+        return len(self.undo_stack)
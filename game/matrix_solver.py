@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+矩阵推理引擎
+把已揭开的数字转换为边界格子上的0/1约束矩阵，用批量高斯消元一次推出大量必然安全和必然是雷的格子
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .array_board import ArrayBoard
+from .board import Board, count_neighbor_mines
+
+# 8个邻居方向
+OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+def visible_state(board: Board) -> Tuple[np.ndarray, np.ndarray]:
+    """获取玩家可见的棋面：(已揭开的安全格子, 周围地雷数)，均为二维数组"""
+    shape = (board.rows, board.cols)
+    if isinstance(board, ArrayBoard):
+        revealed = board.revealed & ~board.mines
+        return revealed.reshape(shape), board.neighbor_mines.reshape(shape).astype(np.int16)
+
+    revealed = np.zeros(shape, dtype=bool)
+    counts = np.zeros(shape, dtype=np.int16)
+    for row in range(board.rows):
+        for col in range(board.cols):
+            cell = board.get_cell(row, col)
+            if cell.is_revealed and not cell.is_mine:
+                revealed[row, col] = True
+                counts[row, col] = cell.neighbor_mines
+    return revealed, counts
+
+
+def reduce_batch(matrices: np.ndarray, eps: float = 1e-9) -> np.ndarray:
+    """对一批增广矩阵（形状 (B, R, C+1)）同时做高斯-约当消元，原地修改并返回"""
+    batch, rows, width = matrices.shape
+    batch_index = np.arange(batch)
+    row_index = np.arange(rows)
+    pivot_row = np.zeros(batch, dtype=np.int64)
+    for col in range(width - 1):
+        candidates = (np.abs(matrices[:, :, col]) > eps) & (row_index[None, :] >= pivot_row[:, None])
+        has_pivot = candidates.any(axis=1)
+        if not has_pivot.any():
+            continue
+        b = batch_index[has_pivot]
+        target = pivot_row[b]
+        source = np.argmax(candidates[b], axis=1)
+
+        # 把主元行换到 target 位置并归一化
+        pivot = matrices[b, source]
+        matrices[b, source] = matrices[b, target]
+        pivot /= pivot[:, col][:, None]
+        matrices[b, target] = pivot
+
+        # 消去其他行在该列上的系数
+        factors = matrices[b, :, col]
+        factors[np.arange(len(b)), target] = 0.0
+        matrices[b] -= factors[:, :, None] * pivot[:, None, :]
+        pivot_row[b] += 1
+    return matrices
+
+
+def forced_columns(matrices: np.ndarray, eps: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+    """从消元后的矩阵中找出被确定的变量，返回 (必然是雷, 必然安全) 两个 (B, C) 布尔数组
+
+    每一行形如 sum(a_j * x_j) = b，x_j 取0或1：若 b 等于所有正系数之和，
+    则正系数变量全为1、负系数变量全为0；若 b 等于所有负系数之和，则相反。
+    """
+    coef = matrices[..., :-1]
+    rhs = matrices[..., -1]
+    positive = coef > eps
+    negative = coef < -eps
+    pos_sum = np.where(positive, coef, 0.0).sum(axis=-1)
+    neg_sum = np.where(negative, coef, 0.0).sum(axis=-1)
+    nonzero = positive.any(axis=-1) | negative.any(axis=-1)
+    upper = (nonzero & (np.abs(rhs - pos_sum) < eps))[..., None]
+    lower = (nonzero & (np.abs(rhs - neg_sum) < eps))[..., None]
+    mines = ((upper & positive) | (lower & negative)).any(axis=1)
+    safe = ((upper & negative) | (lower & positive)).any(axis=1)
+    return mines, safe
+
+
+class MatrixSolver:
+    """矩阵推理引擎类
+
+    任意一部分约束推出的结论都是正确的，因此把约束按所在位置分到 tile_size 见方的块中，
+    每块的约束和相关边界格子组成一个小矩阵，大小相近的块补齐后一次批量消元。
+    各轮的分块在行、列方向上轮流错开半块，跨块的推理在其他轮完成；
+    新结论周围的约束重新标记为待检查，直到所有分块方式下都没有待检查的约束。
+    全部运算都是整批数组运算，不逐格执行规则，适合边界极长的大游戏板，
+    也可以作为穷举或概率计算之前的第一轮筛选。
+    """
+
+    # 按矩阵宽度分组批量消元的组距
+    BUCKET = 4
+
+    def __init__(self, board: Board, tile_size: int = 4):
+        self.board = board
+        self.tile_size = tile_size
+        shape = (board.rows, board.cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.safe = np.zeros(shape, dtype=bool)
+
+    def _deduce(self, revealed: np.ndarray, counts: np.ndarray, offset: Tuple[int, int],
+                dirty: np.ndarray) -> np.ndarray:
+        """按指定偏移对含有待检查约束的块推理一轮，返回新推出格子的掩码"""
+        rows, cols = revealed.shape
+        size = rows * cols
+        found = np.zeros(revealed.shape, dtype=bool)
+        unknown = ~revealed & ~self.mines & ~self.safe
+        constraint = revealed & (count_neighbor_mines(unknown) > 0)
+        con_rows, con_cols = np.nonzero(constraint)
+        if not len(con_rows):
+            return found
+
+        # 约束所属的块；只保留含有待检查约束的块
+        row_offset, col_offset = offset
+        tiles_across = (cols + col_offset) // self.tile_size + 1
+        tile = (((con_rows + row_offset) // self.tile_size) * tiles_across
+                + (con_cols + col_offset) // self.tile_size)
+        active = np.unique(tile[dirty[con_rows, con_cols]])
+        keep = np.isin(tile, active)
+        if not keep.any():
+            return found
+        con_rows, con_cols, tile = con_rows[keep], con_cols[keep], tile[keep]
+        remaining = counts[con_rows, con_cols] - count_neighbor_mines(self.mines)[con_rows, con_cols]
+
+        # 块编号压缩为批次序号，并算出每条约束在块内的行号
+        tile_ids, con_tile = np.unique(tile, return_inverse=True)
+        order = np.argsort(con_tile, kind='stable')
+        first = np.searchsorted(con_tile[order], np.arange(len(tile_ids)))
+        con_local = np.empty(len(con_rows), dtype=np.int64)
+        con_local[order] = np.arange(len(con_rows)) - first[con_tile[order]]
+
+        # 每条约束与其未确定邻居组成的 (约束序号, 格子一维索引) 对
+        pair_con = []
+        pair_cell = []
+        con_ids = np.arange(len(con_rows))
+        for dr, dc in OFFSETS:
+            n_rows, n_cols = con_rows + dr, con_cols + dc
+            valid = (n_rows >= 0) & (n_rows < rows) & (n_cols >= 0) & (n_cols < cols)
+            valid[valid] = unknown[n_rows[valid], n_cols[valid]]
+            pair_con.append(con_ids[valid])
+            pair_cell.append(n_rows[valid] * cols + n_cols[valid])
+        pair_con = np.concatenate(pair_con)
+        pair_cell = np.concatenate(pair_cell)
+
+        # 块内的列号：同一块中出现的每个格子一列
+        keys, pair_col = np.unique(con_tile[pair_con] * size + pair_cell, return_inverse=True)
+        key_tile = keys // size
+        col_first = np.searchsorted(key_tile, np.arange(len(tile_ids)))
+        key_local = np.arange(len(keys)) - col_first[key_tile]
+
+        # 按矩阵宽度分组，同组补齐到相同大小后批量消元，减少补零
+        tile_height = np.bincount(con_tile, minlength=len(tile_ids))
+        tile_width = np.bincount(key_tile, minlength=len(tile_ids))
+        new_mines = []
+        new_safe = []
+        groups = (tile_width + self.BUCKET - 1) // self.BUCKET
+        for group in np.unique(groups):
+            members = np.flatnonzero(groups == group)
+            slot = np.full(len(tile_ids), -1, dtype=np.int64)
+            slot[members] = np.arange(len(members))
+            con_mask = slot[con_tile] >= 0
+            pair_mask = con_mask[pair_con]
+            key_mask = slot[key_tile] >= 0
+
+            height = int(tile_height[members].max())
+            width = int(tile_width[members].max())
+            matrices = np.zeros((len(members), height, width + 1))
+            matrices[slot[con_tile[pair_con[pair_mask]]], con_local[pair_con[pair_mask]],
+                     key_local[pair_col[pair_mask]]] = 1.0
+            matrices[slot[con_tile[con_mask]], con_local[con_mask], width] = remaining[con_mask]
+            column_cell = np.full((len(members), width), -1, dtype=np.int64)
+            column_cell[slot[key_tile[key_mask]], key_local[key_mask]] = keys[key_mask] % size
+
+            mines, safe = forced_columns(reduce_batch(matrices))
+            new_mines.append(column_cell[mines])
+            new_safe.append(column_cell[safe])
+        new_mines = np.concatenate(new_mines)
+        new_safe = np.concatenate(new_safe)
+        found.flat[new_mines] = ~self.mines.flat[new_mines]
+        found.flat[new_safe] = ~self.safe.flat[new_safe]
+        self.mines.flat[new_mines] = True
+        self.safe.flat[new_safe] = True
+        return found
+
+    def solve(self, max_rounds: Optional[int] = None):
+        """反复分块推理，直到各种分块偏移下都没有待检查的约束"""
+        revealed, counts = visible_state(self.board)
+        self.safe &= ~revealed
+        half = self.tile_size // 2
+        offsets = ((0, 0), (half, half), (0, half), (half, 0))
+        # 每种偏移各自的待检查约束；首次全部检查，之后只检查新结论周围的约束
+        dirty = [revealed.copy() for _ in offsets]
+        rounds = 0
+        while any(mask.any() for mask in dirty) and (max_rounds is None or rounds < max_rounds):
+            which = rounds % len(offsets)
+            found = self._deduce(revealed, counts, offsets[which], dirty[which])
+            dirty[which][:] = False
+            if found.any():
+                touched = (count_neighbor_mines(found) > 0) & revealed
+                for mask in dirty:
+                    mask |= touched
+            rounds += 1
+
+    def find_certain(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """返回 (必然安全且未揭开的格子, 必然是雷的格子)，按行优先排序"""
+        self.solve()
+        safe_rows, safe_cols = np.nonzero(self.safe)
+        mine_rows, mine_cols = np.nonzero(self.mines)
+        return (list(zip(safe_rows.tolist(), safe_cols.tolist())),
+                list(zip(mine_rows.tolist(), mine_cols.tolist())))
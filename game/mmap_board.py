@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+内存映射游戏板
+把数组游戏板的格子数组映射到磁盘文件，由操作系统按需换入，适用于超大游戏板的分析
+"""
+
+import struct
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from .array_board import ArrayBoard
+from .board import CellGrid
+
+# 文件头：魔数、版本、行数、列数、地雷总数、布雷种子（-1表示无）
+HEADER = struct.Struct('<4sHxxqqqq')
+HEADER_SIZE = 64
+MAGIC = b'MSWB'
+VERSION = 1
+
+
+class MmapBoard(ArrayBoard):
+    """内存映射游戏板类
+
+    文件布局为 64 字节文件头，之后依次是 mines、revealed、flagged、neighbor_mines
+    四个长度为 rows * cols 字节的数组。不指定 path 时使用自动删除的临时文件。
+    """
+
+    def __init__(self, rows: int, cols: int, path: Optional[str] = None):
+        self.path = path
+        self._map: Optional[np.memmap] = None
+        self._file = None
+        self._load_existing = False
+        super().__init__(rows, cols)
+
+    @classmethod
+    def open(cls, path: str) -> 'MmapBoard':
+        """重新打开已保存的游戏板文件，格子数据不复制，由操作系统按需换入"""
+        with open(path, 'rb') as f:
+            magic, version, rows, cols, _, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不是有效的游戏板文件: {path}")
+
+        board = cls.__new__(cls)
+        board.path = path
+        board._map = None
+        board._file = None
+        board._load_existing = True
+        ArrayBoard.__init__(board, rows, cols)
+        return board
+
+    def _map_file(self):
+        """映射游戏板文件，并把四个格子数组指向文件中的对应区域"""
+        size = self.rows * self.cols
+        length = HEADER_SIZE + 4 * size
+        if self._load_existing:
+            self._map = np.memmap(self.path, dtype=np.uint8, mode='r+', shape=(length,))
+        elif self.path is not None:
+            self._map = np.memmap(self.path, dtype=np.uint8, mode='w+', shape=(length,))
+        else:
+            self._file = tempfile.TemporaryFile()
+            self._map = np.memmap(self._file, dtype=np.uint8, mode='w+', shape=(length,))
+
+        offset = HEADER_SIZE
+        self.mines = self._map[offset:offset + size].view(bool)
+        self.revealed = self._map[offset + size:offset + 2 * size].view(bool)
+        self.flagged = self._map[offset + 2 * size:offset + 3 * size].view(bool)
+        self.neighbor_mines = self._map[offset + 3 * size:offset + 4 * size]
+
+    def _create_board(self):
+        """创建空白游戏板；打开已有文件时保留文件中的格子状态"""
+        if self._map is None:
+            self._map_file()
+        if self._load_existing:
+            self._load_existing = False
+            _, _, _, _, total_mines, seed = HEADER.unpack(bytes(self._map[:HEADER.size]))
+            self.total_mines = total_mines
+            self.seed = None if seed < 0 else seed
+            self.cells = CellGrid(self)
+            self.rebuild_indexes()
+            return
+        super()._create_board()
+        self._write_header()
+
+    def _write_header(self):
+        """把尺寸和布雷信息写入文件头"""
+        seed = -1 if self.seed is None else self.seed
+        header = HEADER.pack(MAGIC, VERSION, self.rows, self.cols, self.total_mines, seed)
+        self._map[:HEADER.size] = np.frombuffer(header, dtype=np.uint8)
+
+    def place_mines(self, *args, **kwargs):
+        """布置地雷，并更新文件头"""
+        super().place_mines(*args, **kwargs)
+        self._write_header()
+
+    def load_mines(self, indices):
+        """按给定布局布置地雷，并更新文件头"""
+        super().load_mines(indices)
+        self._write_header()
+
+    def load_layout(self, layout):
+        """载入算好的布局，并更新文件头"""
+        super().load_layout(layout)
+        self._write_header()
+
+    def set_state_bits(self, mines, revealed, flagged):
+        """整体写入格子数组，并更新文件头"""
+        super().set_state_bits(mines, revealed, flagged)
+        self._write_header()
+
+    def restore_placement(self, placement):
+        """恢复记录的布局，并更新文件头"""
+        super().restore_placement(placement)
+        self._write_header()
+
+    def reset(self):
+        """重置游戏板"""
+        super().reset()
+        self._write_header()
+
+    def flush(self):
+        """把修改写回磁盘"""
+        self._write_header()
+        self._map.flush()
+
+    def close(self):
+        """写回并关闭映射文件"""
+        if self._map is None:
+            return
+        self.flush()
+        self.mines = self.revealed = self.flagged = self.neighbor_mines = None
+        self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
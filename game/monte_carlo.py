@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+蒙特卡洛地雷概率估计
+精确枚举代价过高时，批量采样符合当前棋面的布雷方案，估计每个格子是雷的概率及其置信区间
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .board import Board
+from .solver import Solver
+
+# 95% 置信区间对应的正态分位数
+Z_95 = 1.96
+
+
+class SamplingProblem(NamedTuple):
+    """采样问题：边界格子上的约束，以及边界外格子数和剩余地雷数"""
+    cells: np.ndarray        # 边界格子的一维索引
+    cell_cons: np.ndarray    # 每个边界格子所属的约束编号，(F, 8)，不足补 -1
+    pair_con: np.ndarray     # (约束编号, 格子序号) 对
+    pair_cell: np.ndarray
+    remaining: np.ndarray    # 每条约束的剩余地雷数
+    cell_comp: np.ndarray    # 每个边界格子所属的连通分量
+    con_comp: np.ndarray     # 每条约束所属的连通分量
+    colors: List[np.ndarray]  # 按 (行%3, 列%3) 分组的格子序号，同组格子不共享约束
+    interior: int
+    mines_left: int
+
+
+class Estimate(NamedTuple):
+    """概率估计结果"""
+    probabilities: Dict[Tuple[int, int], float]
+    bounds: Dict[Tuple[int, int], Tuple[float, float]]
+    interior_probability: float
+    interior_bounds: Tuple[float, float]
+    samples: int             # 各边界格子中最少的有效样本数
+
+
+def _count_log_weights(problem: SamplingProblem, penalty: float) -> np.ndarray:
+    """边界布 k 个雷时边界外布雷方案数的对数 log C(I, M-k)，k = 0..F
+
+    超出可行范围的 k 按到可行范围的距离施加软惩罚，使从不可行状态出发的链也能回到可行区域。
+    """
+    interior, mines_left = problem.interior, problem.mines_left
+    size = len(problem.cells)
+    low = max(0, mines_left - interior)
+    high = min(size, mines_left)
+    weights = np.empty(size + 1)
+    for k in range(size + 1):
+        nearest = min(max(k, low), high)
+        rest = mines_left - nearest
+        if 0 <= rest <= interior:
+            base = math.lgamma(interior + 1) - math.lgamma(rest + 1) - math.lgamma(interior - rest + 1)
+        else:
+            base = 0.0
+        weights[k] = base - penalty * abs(k - nearest)
+    return weights
+
+
+def run_chains(problem: SamplingProblem, chains: int, seed: Optional[int],
+               max_samples: Optional[int], time_budget: Optional[float],
+               penalty: float = 2.0, burn_in: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """运行一组马尔可夫链，返回每条链上每个边界格子的 (是雷的有效样本数, 有效样本数)
+
+    状态为边界格子的0/1赋值，目标分布正比于 C(I, M-k) * exp(-penalty * 违反量)，
+    违反量为各约束 |已布雷数 - 剩余地雷数| 之和。各连通分量之间只通过地雷总数相互影响，
+    因此按分量分别判断：某个分量的违反量为0时，该分量内的格子记一个有效样本。
+    每轮按颜色分组并行翻转，同组格子不共享约束；组内的总数权重按该组开始时的地雷数计算，
+    边界外格子很多时（正是需要采样的场景）这一近似的影响可以忽略。
+    """
+    rng = np.random.default_rng(seed)
+    size = len(problem.cells)
+    cons = len(problem.remaining)
+    components = int(problem.cell_comp.max()) + 1
+    chain_index = np.arange(chains)[:, None]
+    remaining = problem.remaining.astype(np.int64)
+
+    density = problem.mines_left / max(size + problem.interior, 1)
+    state = rng.random((chains, size)) < density
+    sums = np.zeros((chains, cons), dtype=np.int64)
+    for chain in range(chains):
+        sums[chain] = np.bincount(problem.pair_con, weights=state[chain, problem.pair_cell],
+                                  minlength=cons).astype(np.int64)
+    mines = state.sum(axis=1)
+    log_weights = _count_log_weights(problem, penalty)
+    violation = np.zeros((chains, components), dtype=np.int64)
+    for chain in range(chains):
+        violation[chain] = np.bincount(problem.con_comp, weights=np.abs(sums[chain] - remaining),
+                                       minlength=components).astype(np.int64)
+
+    mine_hits = np.zeros((chains, size), dtype=np.int64)
+    valid = np.zeros((chains, size), dtype=np.int64)
+    flat_chain = np.arange(chains)[:, None] * components
+    started = time.perf_counter()
+    sweep = 0
+    while True:
+        for group in problem.colors:
+            group_cons = problem.cell_cons[group]           # (n, 8)
+            mask = group_cons >= 0
+            safe_cons = np.where(mask, group_cons, 0)
+            delta = np.where(state[:, group], -1, 1)         # (chains, n)
+            current = sums[:, safe_cons]                     # (chains, n, 8)
+            target = remaining[safe_cons]
+            change = (np.abs(current + delta[:, :, None] - target) - np.abs(current - target)) * mask
+            energy = change.sum(axis=2)
+
+            after = np.clip(mines[:, None] + delta, 0, size)
+            log_ratio = log_weights[after] - log_weights[mines][:, None] - penalty * energy
+            accept = np.log(rng.random(delta.shape)) < log_ratio
+            if not accept.any():
+                continue
+            state[:, group] ^= accept
+            step = delta * accept
+            for slot in range(group_cons.shape[1]):
+                column = group_cons[:, slot]
+                present = column >= 0
+                sums[chain_index, column[present]] += step[:, present]
+            mines += step.sum(axis=1)
+            violation += np.bincount((flat_chain + problem.cell_comp[group]).ravel(),
+                                     weights=(energy * accept).ravel(),
+                                     minlength=chains * components).reshape(chains, components).astype(np.int64)
+
+        sweep += 1
+        elapsed = time.perf_counter() - started
+        # 预热最多占用一半时间预算
+        if sweep > burn_in or (time_budget is not None and elapsed >= time_budget / 2):
+            feasible = (mines <= problem.mines_left) & (problem.mines_left - mines <= problem.interior)
+            ok = (violation[:, problem.cell_comp] == 0) & feasible[:, None]
+            mine_hits += state & ok
+            valid += ok
+            if max_samples is not None and valid.sum(axis=0).min() >= max_samples:
+                break
+        if time_budget is not None and elapsed >= time_budget:
+            break
+        if max_samples is None and time_budget is None and sweep >= burn_in + 1000:
+            break
+    return mine_hits, valid
+
+
+def _summarize(values: np.ndarray, present: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按链间差异计算均值和95%置信区间，values、present 形状为 (链数, 格子数)"""
+    chains = present.sum(axis=0)
+    safe_chains = np.maximum(chains, 1)
+    mean = np.where(present, values, 0.0).sum(axis=0) / safe_chains
+    spread = np.where(present, (values - mean) ** 2, 0.0).sum(axis=0) / np.maximum(chains - 1, 1)
+    error = np.sqrt(spread / safe_chains)
+    lower = np.where(chains >= 2, np.clip(mean - Z_95 * error, 0.0, 1.0), 0.0)
+    upper = np.where(chains >= 2, np.clip(mean + Z_95 * error, 0.0, 1.0), 1.0)
+    return mean, lower, upper
+
+
+class MonteCarloEstimator:
+    """蒙特卡洛概率估计类
+
+    约束与 ProbabilityEngine 相同（来自 Solver），但不枚举方案，而是运行 chains 条马尔可夫链采样。
+    采样在每个边界格子都有 max_samples 个有效样本或超过 time_budget 秒时停止，耗时不随边界复杂度增长。
+    workers 大于1时把链平均分到多个进程中运行。置信区间由各条链的估计之间的差异得出。
+    """
+
+    def __init__(self, board: Board, solver: Optional[Solver] = None, chains: int = 64,
+                 max_samples: Optional[int] = 2000, time_budget: Optional[float] = 0.5,
+                 workers: int = 1, seed: Optional[int] = None):
+        self.board = board
+        self.solver = solver if solver is not None else Solver(board)
+        self.chains = chains
+        self.max_samples = max_samples
+        self.time_budget = time_budget
+        self.workers = workers
+        self.seed = seed
+        self.last_estimate: Optional[Estimate] = None
+
+    def build_problem(self) -> SamplingProblem:
+        """把求解器中尚未确定的约束整理为采样问题"""
+        solver = self.solver
+        cols = self.board.cols
+        constraints = solver.get_constraints()
+        cells = sorted(set().union(*(unknown for unknown, _ in constraints))) if constraints else []
+        local = {cell: i for i, cell in enumerate(cells)}
+
+        cell_cons = np.full((len(cells), 8), -1, dtype=np.int64)
+        filled = np.zeros(len(cells), dtype=np.int64)
+        pair_con = []
+        pair_cell = []
+        for j, (unknown, _) in enumerate(constraints):
+            for cell in unknown:
+                i = local[cell]
+                cell_cons[i, filled[i]] = j
+                filled[i] += 1
+                pair_con.append(j)
+                pair_cell.append(i)
+
+        # 用并查集把共享格子的约束合并为连通分量
+        parent = list(range(len(constraints)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i in range(len(cells)):
+            first = cell_cons[i, 0]
+            for j in cell_cons[i, 1:filled[i]]:
+                root_a, root_b = find(int(first)), find(int(j))
+                if root_a != root_b:
+                    parent[root_a] = root_b
+        roots = [find(j) for j in range(len(constraints))]
+        labels = {root: label for label, root in enumerate(sorted(set(roots)))}
+        con_comp = np.array([labels[root] for root in roots], dtype=np.int64)
+        cell_comp = con_comp[cell_cons[:, 0]] if len(cells) else np.zeros(0, dtype=np.int64)
+
+        cells = np.array(cells, dtype=np.int64)
+        color = (cells // cols % 3) * 3 + cells % cols % 3
+        colors = [np.flatnonzero(color == c) for c in range(9)]
+        unknown = self.board.get_total_cells() - len(solver.numbers) - len(solver.mines) - len(solver.safe)
+        return SamplingProblem(
+            cells=cells,
+            cell_cons=cell_cons,
+            pair_con=np.array(pair_con, dtype=np.int64),
+            pair_cell=np.array(pair_cell, dtype=np.int64),
+            remaining=np.array([remaining for _, remaining in constraints], dtype=np.int64),
+            cell_comp=cell_comp,
+            con_comp=con_comp,
+            colors=[group for group in colors if len(group)],
+            interior=unknown - len(cells),
+            mines_left=self.board.total_mines - len(solver.mines),
+        )
+
+    def _sample(self, problem: SamplingProblem) -> Tuple[np.ndarray, np.ndarray]:
+        """在当前进程或进程池中运行所有链"""
+        if self.workers <= 1:
+            return run_chains(problem, self.chains, self.seed, self.max_samples, self.time_budget)
+
+        seeds = np.random.SeedSequence(self.seed).spawn(self.workers)
+        per_worker = max(1, self.chains // self.workers)
+        samples = None if self.max_samples is None else max(1, self.max_samples // self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(run_chains, problem, per_worker,
+                                       int(seed.generate_state(1)[0]), samples, self.time_budget)
+                       for seed in seeds]
+            results = [future.result() for future in futures]
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
+    def estimate(self) -> Estimate:
+        """采样并返回每个边界格子是雷的概率估计及95%置信区间"""
+        solver = self.solver
+        cols = self.board.cols
+        problem = self.build_problem()
+        probabilities: Dict[Tuple[int, int], float] = {}
+        bounds: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        for index in solver.mines:
+            probabilities[divmod(index, cols)] = 1.0
+            bounds[divmod(index, cols)] = (1.0, 1.0)
+        for index in solver.safe:
+            probabilities[divmod(index, cols)] = 0.0
+            bounds[divmod(index, cols)] = (0.0, 0.0)
+
+        density = problem.mines_left / max(len(problem.cells) + problem.interior, 1)
+        if not len(problem.cells):
+            estimate = Estimate(probabilities, bounds, density, (density, density), 0)
+            self.last_estimate = estimate
+            return estimate
+
+        mine_hits, valid = self._sample(problem)
+        present = valid > 0
+        ratios = mine_hits / np.maximum(valid, 1)
+        mean, lower, upper = _summarize(ratios, present)
+        # 预算内没有得到有效样本的格子退回按地雷密度估计
+        missing = ~present.any(axis=0)
+        mean[missing] = density
+        for i, index in enumerate(problem.cells.tolist()):
+            position = divmod(index, cols)
+            probabilities[position] = float(mean[i])
+            bounds[position] = (float(lower[i]), float(upper[i]))
+
+        # 边界外每个格子的概率 = (剩余地雷数 - 边界上的期望地雷数) / 边界外格子数
+        if problem.interior:
+            per_chain = np.where(present, ratios, mean).sum(axis=1)
+            outside = (problem.mines_left - per_chain) / problem.interior
+            chains = np.ones((len(outside), 1), dtype=bool)
+            interior_mean, interior_lower, interior_upper = _summarize(outside[:, None], chains)
+            interior = (float(interior_mean[0]), (float(interior_lower[0]), float(interior_upper[0])))
+        else:
+            interior = (0.0, (0.0, 0.0))
+        estimate = Estimate(probabilities, bounds, interior[0], interior[1],
+                            int(valid.sum(axis=0).min()))
+        self.last_estimate = estimate
+        return estimate
+
+    def best_guess(self) -> Optional[Tuple[int, int]]:
+        """采样并返回估计最不可能是雷的未揭开、未插旗格子"""
+        estimate = self.estimate()
+        candidates = []
+        for position, probability in estimate.probabilities.items():
+            cell = self.board.get_cell(*position)
+            if not cell.is_revealed and not cell.is_flagged:
+                candidates.append((probability, position))
+        best = min(candidates) if candidates else None
+        solver = self.solver
+        known = solver.frontier | solver.mines | solver.safe
+        if best is None or estimate.interior_probability < best[0]:
+            for index in range(self.board.get_total_cells()):
+                if index not in solver.numbers and index not in known:
+                    return divmod(index, self.board.cols)
+        return best[1] if best else None
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+邻居表
+按游戏板尺寸预先计算每个格子的邻居索引，同尺寸的游戏板共享同一张表
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+class NeighborTable:
+    """邻居表类（CSR格式）
+
+    格子 i（一维索引 row * cols + col）的邻居为 indices[indptr[i]:indptr[i + 1]]，
+    按行优先顺序排列。
+    """
+
+    __slots__ = ('rows', 'cols', 'indptr', 'indices')
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+
+        # 先按 (行, 列, 8个偏移) 填出稠密的 int32 表，越界处为 -1，再按行优先顺序压缩掉 -1，
+        # 每个格子的邻居自然按偏移量顺序（即行优先）排列；构建时的峰值内存约为每格72字节
+        size = rows * cols
+        grid = np.arange(size, dtype=np.int32).reshape(rows, cols)
+        dense = np.full((rows, cols, 8), -1, dtype=np.int32)
+        slot = 0
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr == 0 and dc == 0:
+                    continue
+                r0, r1 = max(0, -dr), rows - max(0, dr)
+                c0, c1 = max(0, -dc), cols - max(0, dc)
+                dense[r0:r1, c0:c1, slot] = grid[r0 + dr:r1 + dr, c0 + dc:c1 + dc]
+                slot += 1
+        del grid
+
+        valid = dense >= 0
+        indptr = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=2, dtype=np.int32).ravel(), out=indptr[1:])
+        targets = dense[valid]
+        del dense, valid
+
+        self.indptr = array('i')
+        self.indptr.frombytes(memoryview(indptr).cast('B'))
+        self.indices = array('i')
+        self.indices.frombytes(memoryview(targets).cast('B'))
+
+    def neighbors(self, index: int) -> array:
+        """获取指定格子的邻居索引"""
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def nbytes(self) -> int:
+        """获取邻居表占用的字节数"""
+        return (len(self.indptr) + len(self.indices)) * self.indices.itemsize
+
+
+# 超过该格子数的邻居表（每格约36字节）不进入缓存，只保留最近用到的一张，避免同时占用几张大表
+LARGE_TABLE_CELLS = 1 << 16
+
+_large_table: Optional[NeighborTable] = None
+
+
+@lru_cache(maxsize=8)
+def _cached_table(rows: int, cols: int) -> NeighborTable:
+    """小尺寸的邻居表，最近使用的几种尺寸会被缓存"""
+    return NeighborTable(rows, cols)
+
+
+def get_neighbor_table(rows: int, cols: int) -> NeighborTable:
+    """获取指定尺寸的邻居表
+
+    小尺寸的表缓存最近使用的几种；大尺寸的表只保留一张，换尺寸时先释放旧表再建新表。
+    """
+    global _large_table
+    if rows * cols <= LARGE_TABLE_CELLS:
+        return _cached_table(rows, cols)
+    table = _large_table
+    if table is None or (table.rows, table.cols) != (rows, cols):
+        _large_table = None
+        table = _large_table = NeighborTable(rows, cols)
+    return table
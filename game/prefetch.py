@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+后台布局预取
+新游戏开始后在后台线程中预先生成随机布局，首次点击时取出一份并让出点击位置周围的安全区
+"""
+
+import random
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .board import PreparedLayout, prepare_layout, relocate_mines, sample_mine_indices
+
+
+class LayoutPrefetcher:
+    """后台布局预取类
+
+    守护线程按当前规格（行、列、地雷数）不断生成候选布局，连同周围地雷数和空白区域一起算好，
+    最多保留 capacity 份，且候选的格子总数不超过 max_cells（大型游戏板只保留一两份）。
+    首次点击时取出最早的一份，把落在安全区内的少数地雷移到别处并局部修补计数和空白区域，
+    每份候选都能用上，且结果仍在满足安全区的布局中均匀分布。规格改变时丢弃全部旧候选。
+    """
+
+    def __init__(self, capacity: int = 8, max_cells: int = 1 << 21):
+        self.capacity = capacity
+        self.max_cells = max_cells
+        self._condition = threading.Condition()
+        self._spec: Optional[Tuple[int, int, int]] = None
+        self._generation = 0
+        self._rng = random.Random()
+        self._candidates: List[Tuple[PreparedLayout, np.ndarray]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self, rows: int, cols: int, mines: int, seed: Optional[int] = None):
+        """开始（或重新开始）为指定规格预取布局"""
+        with self._condition:
+            self._spec = (rows, cols, mines)
+            self._generation += 1
+            self._rng = random.Random(seed)
+            self._candidates.clear()
+            self._stopped = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='layout-prefetch', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def stop(self):
+        """停止后台线程并丢弃候选布局"""
+        with self._condition:
+            self._stopped = True
+            self._spec = None
+            self._candidates.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _limit(self) -> int:
+        """当前规格下最多保留的候选数，至少一份"""
+        if self._spec is None:
+            return self.capacity
+        rows, cols, _ = self._spec
+        return max(1, min(self.capacity, self.max_cells // (rows * cols)))
+
+    def ready_count(self) -> int:
+        """已经生成好的候选布局数"""
+        with self._condition:
+            return len(self._candidates)
+
+    def wait_ready(self, count: int = 1, timeout: Optional[float] = None) -> bool:
+        """等待至少 count 份候选布局生成完毕"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: len(self._candidates) >= min(count, self._limit()), timeout)
+
+    def take(self, rows: int, cols: int, mines: int,
+             excluded: Iterable[int]) -> Optional[PreparedLayout]:
+        """取出一份在 excluded 格子上没有地雷的布局，没有当前规格的候选或安全区外放不下时返回None"""
+        excluded = set(excluded)
+        if rows * cols - len(excluded) < mines:
+            return None
+        with self._condition:
+            if self._spec != (rows, cols, mines) or not self._candidates:
+                return None
+            layout, mask = self._candidates.pop(0)
+            seed = self._rng.getrandbits(32)
+            self._condition.notify_all()
+        return relocate_mines(rows, cols, layout, excluded, random.Random(seed), mask)
+
+    def _run(self):
+        """后台线程：候选不足时生成新布局"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopped or (self._spec is not None
+                                              and len(self._candidates) < self._limit()))
+                if self._stopped:
+                    return
+                rows, cols, mines = self._spec
+                generation = self._generation
+                seed = self._rng.getrandbits(32)
+
+            # 生成过程不持有锁，规格在此期间改变时丢弃结果
+            indices = sample_mine_indices(rows * cols, mines, (), random.Random(seed))
+            layout = prepare_layout(rows, cols, indices)
+            mask = np.zeros(rows * cols, dtype=bool)
+            mask[np.asarray(indices, dtype=np.int64)] = True
+
+            with self._condition:
+                if generation == self._generation and len(self._candidates) < self._limit():
+                    self._candidates.append((layout, mask))
+                    self._condition.notify_all()
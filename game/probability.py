@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+地雷概率计算
+把边界拆分为互不相关的连通分量，逐个枚举分量内的布雷方案，再结合地雷总数精确计算每个格子是雷的概率
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .board import Board
+from .solver import Solver
+
+# 分量的规范键：(格子数, 排序后的约束元组)，约束为 (分量内局部编号元组, 剩余地雷数)
+ComponentKey = Tuple[int, Tuple[Tuple[Tuple[int, ...], int], ...]]
+
+
+class ComponentTooLargeError(ValueError):
+    """连通分量的格子数超过枚举上限"""
+
+
+def _add_poly(target: Dict, key, poly: List[int]):
+    """把按地雷数索引的方案数多项式累加到字典中"""
+    current = target.get(key)
+    if current is None:
+        target[key] = list(poly)
+        return
+    if len(current) < len(poly):
+        current.extend([0] * (len(poly) - len(current)))
+    for k, value in enumerate(poly):
+        current[k] += value
+
+
+def _shift(poly: List[int], mine: int) -> List[int]:
+    """格子是雷时方案的地雷数加1"""
+    return [0] + poly if mine else poly
+
+
+@lru_cache(maxsize=4096)
+def enumerate_component(key: ComponentKey) -> Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]:
+    """统计一个分量的全部布雷方案
+
+    返回 (ways, mine_counts)：ways[k] 为恰好布 k 个雷的方案数，
+    mine_counts[k][i] 为其中第 i 个格子是雷的方案数。
+    按局部编号逐格决定是否是雷，状态为尚未结束的约束已布的雷数，
+    前向、后向各做一遍动态规划，代价与分量长度成线性、与状态数（约束重叠宽度）成正比，
+    不随方案数指数增长。结果只依赖规范键，位置不同但结构相同的分量共享缓存。
+    """
+    size, constraints = key
+    need = [remaining for _, remaining in constraints]
+    last = [cells[-1] for cells, _ in constraints]
+    cell_constraints: List[List[int]] = [[] for _ in range(size)]
+    # 约束 j 在格子 i 之后还剩几个格子
+    cells_after: Dict[Tuple[int, int], int] = {}
+    for j, (cells, _) in enumerate(constraints):
+        for position, cell in enumerate(cells):
+            cell_constraints[cell].append(j)
+            cells_after[(j, cell)] = len(cells) - position - 1
+
+    # open_after[i]：决定完格子 i 后仍未结束的约束
+    open_after: List[Tuple[int, ...]] = []
+    opened = set()
+    for i in range(size):
+        opened.update(cell_constraints[i])
+        opened = {j for j in opened if last[j] > i}
+        open_after.append(tuple(sorted(opened)))
+
+    def step(i: int, state: Tuple[int, ...], mine: int) -> Optional[Tuple[int, ...]]:
+        have = dict(zip(open_after[i - 1] if i else (), state))
+        for j in cell_constraints[i]:
+            count = have.get(j, 0) + mine
+            if count > need[j] or count + cells_after[(j, i)] < need[j]:
+                return None
+            have[j] = count
+        return tuple(have[j] for j in open_after[i])
+
+    forward: List[Dict[Tuple[int, ...], List[int]]] = [{(): [1]}]
+    transitions = []
+    for i in range(size):
+        layer: Dict[Tuple[int, ...], List[int]] = {}
+        moves = []
+        for state, poly in forward[i].items():
+            for mine in (0, 1):
+                new_state = step(i, state, mine)
+                if new_state is not None:
+                    moves.append((state, mine, new_state))
+                    _add_poly(layer, new_state, _shift(poly, mine))
+        forward.append(layer)
+        transitions.append(moves)
+
+    backward: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(size)] + [{(): [1]}]
+    for i in range(size - 1, -1, -1):
+        for state, mine, new_state in transitions[i]:
+            poly = backward[i + 1].get(new_state)
+            if poly is not None:
+                _add_poly(backward[i], state, _shift(poly, mine))
+
+    ways = [0] * (size + 1)
+    for k, value in enumerate(forward[size].get((), [])):
+        ways[k] = value
+    mine_counts = [[0] * size for _ in range(size + 1)]
+    for i in range(size):
+        for state, mine, new_state in transitions[i]:
+            tail = backward[i + 1].get(new_state) if mine else None
+            if tail is None:
+                continue
+            for a, x in enumerate(forward[i][state]):
+                if x:
+                    for b, y in enumerate(tail):
+                        if y:
+                            mine_counts[a + b + 1][i] += x * y
+    return tuple(ways), tuple(tuple(counts) for counts in mine_counts)
+
+
+def _log_comb(n: int, k: int) -> float:
+    """组合数的自然对数"""
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _convolve(a: Sequence[float], b: Sequence[float]) -> List[float]:
+    """多项式乘法（按地雷数合并两组方案数）"""
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+
+class ProbabilityEngine:
+    """地雷概率计算类
+
+    约束来自 Solver，先用确定性推理排除必然安全和必然是雷的格子，
+    再用并查集把剩余边界格子按共享约束划分为连通分量。每个分量按规范键枚举（带缓存），
+    分量之间只通过地雷总数相互影响：设边界外还有 I 个未确定格子，
+    分量合计布 K 个雷的权重乘以 C(I, 剩余地雷数 - K)。
+    """
+
+    def __init__(self, board: Board, solver: Optional[Solver] = None,
+                 max_component_cells: int = 400):
+        self.board = board
+        self.solver = solver if solver is not None else Solver(board)
+        self.max_component_cells = max_component_cells
+        self.interior_probability = 0.0
+        self.interior_cells = 0
+        self._probabilities: Dict[Tuple[int, int], float] = {}
+
+    def _components(self, constraints: List[Tuple[set, int]]) -> List[List[int]]:
+        """用并查集把约束按共享格子划分为连通分量，返回每个分量的约束编号"""
+        parent = list(range(len(constraints)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        owner: Dict[int, int] = {}
+        for j, (cells, _) in enumerate(constraints):
+            for cell in cells:
+                if cell in owner:
+                    root_a, root_b = find(owner[cell]), find(j)
+                    if root_a != root_b:
+                        parent[root_a] = root_b
+                else:
+                    owner[cell] = j
+
+        groups: Dict[int, List[int]] = {}
+        for j in range(len(constraints)):
+            groups.setdefault(find(j), []).append(j)
+        return list(groups.values())
+
+    def _component_key(self, constraints: List[Tuple[set, int]]) -> Tuple[List[int], ComponentKey]:
+        """返回分量的格子（按一维索引排序）和规范键"""
+        cells = sorted(set().union(*(unknown for unknown, _ in constraints)))
+        if len(cells) > self.max_component_cells:
+            raise ComponentTooLargeError(
+                f"连通分量有 {len(cells)} 个格子，超过上限 {self.max_component_cells}")
+        local = {cell: i for i, cell in enumerate(cells)}
+        canonical = sorted({(tuple(sorted(local[cell] for cell in unknown)), remaining)
+                            for unknown, remaining in constraints})
+        return cells, (len(cells), tuple(canonical))
+
+    def compute(self) -> Dict[Tuple[int, int], float]:
+        """计算所有边界格子及已推出格子是雷的概率，边界外格子的概率记在 interior_probability"""
+        solver = self.solver
+        cols = self.board.cols
+        constraints = solver.get_constraints()
+        probabilities: Dict[Tuple[int, int], float] = {}
+        for index in solver.mines:
+            probabilities[divmod(index, cols)] = 1.0
+        for index in solver.safe:
+            probabilities[divmod(index, cols)] = 0.0
+
+        components = []
+        frontier_cells = 0
+        for group in self._components(constraints):
+            cells, key = self._component_key([constraints[j] for j in group])
+            ways, mine_counts = enumerate_component(key)
+            scale = max(ways)
+            components.append((cells, [w / scale for w in ways],
+                               [[c / scale for c in counts] for counts in mine_counts]))
+            frontier_cells += len(cells)
+
+        unknown = self.board.get_total_cells() - len(solver.numbers) - len(solver.mines) - len(solver.safe)
+        interior = unknown - frontier_cells
+        self.interior_cells = interior
+        mines_left = self.board.total_mines - len(solver.mines)
+
+        # 除第 i 个分量外其余分量的合并方案数（前缀与后缀卷积）
+        prefix = [[1.0]]
+        for _, ways, _ in components:
+            prefix.append(_convolve(prefix[-1], ways))
+        suffix = [[1.0]]
+        for _, ways, _ in reversed(components):
+            suffix.append(_convolve(suffix[-1], ways))
+        suffix.reverse()
+
+        # 边界外格子的权重 C(interior, mines_left - K)，按对数归一化避免溢出
+        log_weights = {}
+        for k in range(len(prefix[-1])):
+            rest = mines_left - k
+            if 0 <= rest <= interior:
+                log_weights[k] = _log_comb(interior, rest)
+        if not log_weights:
+            raise ValueError("当前局面与地雷总数矛盾")
+        top = max(log_weights.values())
+        weights = {k: math.exp(w - top) for k, w in log_weights.items()}
+
+        total = sum(prefix[-1][k] * w for k, w in weights.items())
+        if total == 0:
+            raise ValueError("当前局面与地雷总数矛盾")
+        if interior:
+            expected = sum(prefix[-1][k] * w * (mines_left - k) for k, w in weights.items())
+            self.interior_probability = expected / total / interior
+        else:
+            self.interior_probability = 0.0
+
+        for i, (cells, ways, mine_counts) in enumerate(components):
+            others = _convolve(prefix[i], suffix[i + 1])
+            for cell_index, cell in enumerate(cells):
+                weight = 0.0
+                for k, counts in enumerate(mine_counts):
+                    if not counts[cell_index]:
+                        continue
+                    for j, other in enumerate(others):
+                        w = weights.get(k + j)
+                        if w is not None and other:
+                            weight += counts[cell_index] * other * w
+                probabilities[divmod(cell, cols)] = weight / total
+
+        self._probabilities = probabilities
+        return probabilities
+
+    def get_probability(self, row: int, col: int) -> float:
+        """获取最近一次 compute 结果中指定格子是雷的概率"""
+        if (row, col) in self._probabilities:
+            return self._probabilities[(row, col)]
+        if row * self.board.cols + col in self.solver.numbers:
+            return 0.0
+        return self.interior_probability
+
+    def best_guess(self) -> Optional[Tuple[int, int]]:
+        """计算概率并返回最不可能是雷的未揭开、未插旗格子"""
+        probabilities = self.compute()
+        candidates = []
+        for position, probability in probabilities.items():
+            cell = self.board.get_cell(*position)
+            if not cell.is_revealed and not cell.is_flagged:
+                candidates.append((probability, position))
+        best = min(candidates) if candidates else None
+        if self.interior_cells and (best is None or self.interior_probability < best[0]):
+            return self._find_interior_cell()
+        return best[1] if best else None
+
+    def _find_interior_cell(self) -> Optional[Tuple[int, int]]:
+        """找一个边界外的未揭开格子"""
+        solver = self.solver
+        known = solver.frontier | solver.mines | solver.safe
+        for index in range(self.board.get_total_cells()):
+            if index not in solver.numbers and index not in known:
+                return divmod(index, self.board.cols)
+        return None
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+对局录像
+把一局的游戏板规格、地雷布局和带时间戳的动作压缩为变长整数（varint）序列，
+可以在无头 GameLogic 上快速回放，并借助定期保存的状态快照跳转到任意一步
+"""
+
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Type
+
+import numpy as np
+
+from .board import Board, PreparedLayout, prepare_layout
+from .game_logic import (ACTION_CHORD, ACTION_FLAG, ACTION_REVEAL, SOURCE_ACTION, SOURCE_REDO, SOURCE_UNDO,
+                         ChangeSet, GameLogic, GameState)
+
+# 录像文件头：魔数和版本号，之后全部是 varint
+MAGIC = b'MSRP'
+VERSION = 1
+
+# 动作编码为 (一维索引 << KIND_BITS) | 动作类型编号
+KIND_BITS = 2
+KIND_CODES = {ACTION_REVEAL: 0, ACTION_FLAG: 1, ACTION_CHORD: 2}
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+
+# 回放专用的难度名称
+REPLAY_DIFFICULTY = 'replay'
+
+
+def encode_varints(values: Sequence[int]) -> bytes:
+    """把非负整数序列编码为 LEB128 变长整数，每字节7位，最高位表示后面还有字节"""
+    values = np.asarray(values, dtype=np.uint64)
+    if not values.size:
+        return b''
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+    starts = np.cumsum(lengths) - lengths
+    owner = np.repeat(np.arange(len(values)), lengths)
+    position = np.arange(int(lengths.sum())) - starts[owner]
+    out = ((values[owner] >> (7 * position).astype(np.uint64)) & np.uint64(0x7f)).astype(np.uint8)
+    out[position < lengths[owner] - 1] |= 0x80
+    return out.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """解码 LEB128 变长整数序列，整段数据一次性向量化解码"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not raw.size:
+        return np.zeros(0, dtype=np.uint64)
+    ends = np.flatnonzero(raw < 0x80)
+    if not ends.size or ends[-1] != raw.size - 1:
+        raise ValueError("变长整数数据不完整")
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    owner = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = 7 * (np.arange(raw.size) - starts[owner])
+    if shift.max() > 63:
+        raise ValueError("变长整数超出64位")
+    parts = (raw & 0x7f).astype(np.uint64) << shift.astype(np.uint64)
+    return np.add.reduceat(parts, starts)
+
+
+class ReplayEvent(NamedTuple):
+    """录像中的一个动作，time_ms 为距录制开始的毫秒数"""
+    time_ms: int
+    kind: str
+    row: int
+    col: int
+
+
+class Replay:
+    """一局对局的录像
+
+    动作按列存放在数组中（时间、类型、一维索引），便于批量分析成千上万局录像。
+    文件格式为文件头加一串 varint：行数、列数、时限、地雷数、按差分编码的有序地雷索引、
+    动作数，以及每个动作的 (距上一动作的毫秒数, 索引与类型的组合编码)。
+    """
+
+    def __init__(self, rows: int, cols: int, time_limit: int, mines: Sequence[int],
+                 times: Sequence[int] = (), kinds: Sequence[int] = (), cells: Sequence[int] = ()):
+        self.rows = rows
+        self.cols = cols
+        self.time_limit = time_limit
+        self.mines = sorted(int(index) for index in mines)
+        self.times = np.asarray(times, dtype=np.int64)
+        self.kinds = np.asarray(kinds, dtype=np.uint8)
+        self.cells = np.asarray(cells, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def event(self, index: int) -> ReplayEvent:
+        """获取第 index 个动作"""
+        row, col = divmod(int(self.cells[index]), self.cols)
+        return ReplayEvent(int(self.times[index]), KIND_NAMES[int(self.kinds[index])], row, col)
+
+    def events(self) -> Iterator[ReplayEvent]:
+        """按顺序遍历全部动作"""
+        for index in range(len(self)):
+            yield self.event(index)
+
+    def duration_ms(self) -> int:
+        """录像时长（毫秒）"""
+        return int(self.times[-1]) if len(self) else 0
+
+    def to_bytes(self) -> bytes:
+        """编码为录像数据"""
+        mines = np.asarray(self.mines, dtype=np.int64)
+        mine_deltas = np.diff(mines, prepend=0)
+        time_deltas = np.diff(self.times, prepend=0)
+        codes = (self.cells << KIND_BITS) | self.kinds
+        events = np.empty(2 * len(self), dtype=np.int64)
+        events[0::2] = time_deltas
+        events[1::2] = codes
+        values = np.concatenate(([self.rows, self.cols, self.time_limit, len(mines)], mine_deltas,
+                                 [len(self)], events))
+        return MAGIC + bytes([VERSION]) + encode_varints(values)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """从录像数据解码"""
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("不是有效的录像数据")
+        version = data[len(MAGIC)]
+        if version != VERSION:
+            raise ValueError(f"不支持的录像版本: {version}")
+        values = decode_varints(data[len(MAGIC) + 1:]).astype(np.int64)
+        rows, cols, time_limit, mine_count = (int(v) for v in values[:4])
+        mines = np.cumsum(values[4:4 + mine_count])
+        position = 4 + mine_count
+        event_count = int(values[position])
+        events = values[position + 1:position + 1 + 2 * event_count]
+        if len(events) != 2 * event_count:
+            raise ValueError("录像数据不完整")
+        codes = events[1::2]
+        return cls(rows, cols, time_limit, mines.tolist(), np.cumsum(events[0::2]),
+                   codes & ((1 << KIND_BITS) - 1), codes >> KIND_BITS)
+
+    def save(self, path: str):
+        """保存到文件"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """从文件读取"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """录像器类
+
+    订阅 GameLogic 的变化记录一局：布雷时记下地雷布局，每个动作记下距录制开始的毫秒数。
+    撤销时删去最后一个动作（撤销首次点击时同时丢弃布局），重做时重新记下该动作，
+    录像因此只包含最终保留下来的动作。一局结束后调用 finish 得到录像并停止订阅。
+    """
+
+    def __init__(self, game: GameLogic, clock: Callable[[], float] = time.monotonic):
+        self.game = game
+        self.clock = clock
+        self.started = clock()
+        self.mines: Optional[List[int]] = None
+        self.times: List[int] = []
+        self.kinds: List[int] = []
+        self.cells: List[int] = []
+        game.subscribe(self._on_changes)
+
+    def _on_changes(self, changes: ChangeSet):
+        """变化订阅回调"""
+        if changes.kind is None:
+            # 时间到不是玩家动作，不记入录像
+            return
+        if changes.source == SOURCE_UNDO:
+            if self.cells:
+                del self.times[-1], self.kinds[-1], self.cells[-1]
+            if changes.layout_changed:
+                self.mines = None
+            return
+        if changes.source not in (SOURCE_ACTION, SOURCE_REDO):
+            return
+        if changes.layout_changed:
+            board = self.game.board
+            self.mines = [r * board.cols + c for r, c in board.mine_positions]
+        self.times.append(int((self.clock() - self.started) * 1000))
+        self.kinds.append(KIND_CODES[changes.kind])
+        self.cells.append(changes.index)
+
+    def finish(self) -> Replay:
+        """停止监听并返回录像"""
+        self.game.unsubscribe(self._on_changes)
+        board = self.game.board
+        config = self.game.get_difficulty_config()
+        return Replay(board.rows, board.cols, config['time'], self.mines or [],
+                      self.times, self.kinds, self.cells)
+
+
+class _Snapshot(NamedTuple):
+    """回放状态快照：已揭开格子的数量（按揭开顺序的前缀）、插旗格子和游戏状态"""
+    revealed: int
+    flagged: frozenset
+    game_state: GameState
+    first_click: bool
+
+
+class ReplayPlayer:
+    """录像回放类
+
+    在无头、无音效的 GameLogic 上逐个执行录像中的动作，地雷布局通过布局提供者注入。
+    每 snapshot_interval 个动作保存一次快照：揭开的格子只增不减且顺序由录像决定，
+    快照只需记下揭开顺序列表的前缀长度，跳转时从最近的快照恢复再向前执行，不必从头回放。
+    """
+
+    def __init__(self, replay: Replay, board_class: Type[Board] = Board,
+                 snapshot_interval: int = 64):
+        if not board_class.LOADS_LAYOUTS:
+            # 回放依赖整盘载入录像中的布局，分块游戏板只能当场随机布雷
+            raise ValueError(f"{board_class.__name__} 不支持载入整盘布局，无法回放录像")
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.game = GameLogic(board_class=board_class, headless=True,
+                              layout_provider=self._provide_layout)
+        self.game.difficulties[REPLAY_DIFFICULTY] = {
+            'rows': replay.rows,
+            'cols': replay.cols,
+            'mines': len(replay.mines),
+            'time': replay.time_limit,
+        }
+        self.game.set_difficulty(REPLAY_DIFFICULTY)
+        self.position = 0
+        # 已知的揭开顺序（可能长于当前位置），以及当前状态对应的前缀长度
+        self._revealed_order: List[int] = []
+        self._revealed_count = 0
+        self._flagged: Set[int] = set()
+        self._prepared: Optional[PreparedLayout] = None
+        self._snapshots: Dict[int, _Snapshot] = {0: self._snapshot()}
+
+    def _provide_layout(self, rows: int, cols: int, mines: int, row: int, col: int) -> List[int]:
+        """布局提供者：始终返回录像中的布局"""
+        return self.replay.mines
+
+    def _snapshot(self) -> _Snapshot:
+        game = self.game
+        return _Snapshot(self._revealed_count, frozenset(self._flagged),
+                         game.game_state, game.first_click)
+
+    def step(self) -> Optional[ReplayEvent]:
+        """执行下一个动作，录像结束时返回None"""
+        if self.position >= len(self.replay):
+            return None
+        event = self.replay.event(self.position)
+        index = event.row * self.replay.cols + event.col
+        if event.kind in (ACTION_REVEAL, ACTION_CHORD):
+            if event.kind == ACTION_REVEAL:
+                opened = self.game.left_click(event.row, event.col)
+            else:
+                opened = self.game.chord(event.row, event.col)
+            if self._revealed_count == len(self._revealed_order):
+                cols = self.replay.cols
+                self._revealed_order.extend(row * cols + col for row, col in opened)
+            self._revealed_count += len(opened)
+        else:
+            self.game.toggle_flag(event.row, event.col)
+            self._flagged ^= {index}
+        self.position += 1
+        if self.position % self.snapshot_interval == 0 and self.position not in self._snapshots:
+            self._snapshots[self.position] = self._snapshot()
+        return event
+
+    def run(self) -> GameState:
+        """快速回放到结尾，返回最终的游戏状态"""
+        while self.step() is not None:
+            pass
+        return self.game.get_game_state()
+
+    def seek(self, position: int):
+        """跳转到执行完前 position 个动作的状态"""
+        position = max(0, min(position, len(self.replay)))
+        base = max(key for key in self._snapshots if key <= position)
+        if self.position > position or base > self.position:
+            self._restore(base)
+        while self.position < position:
+            self.step()
+
+    def seek_time(self, time_ms: int):
+        """跳转到录制开始后 time_ms 毫秒时的状态"""
+        self.seek(int(np.searchsorted(self.replay.times, time_ms, side='right')))
+
+    def _restore(self, position: int):
+        """从快照恢复游戏状态"""
+        snapshot = self._snapshots[position]
+        game = self.game
+        board = game.board
+        board.reset()
+        if not snapshot.first_click:
+            if self._prepared is None:
+                self._prepared = prepare_layout(board.rows, board.cols, self.replay.mines)
+            board.load_layout(self._prepared)
+
+        self._revealed_count = snapshot.revealed
+        cols = self.replay.cols
+        for index in self._revealed_order[:snapshot.revealed]:
+            board.get_cell(*divmod(index, cols)).is_revealed = True
+        self._flagged = set(snapshot.flagged)
+        for index in self._flagged:
+            board.get_cell(*divmod(index, cols)).is_flagged = True
+
+        game.first_click = snapshot.first_click
+        game.game_state = snapshot.game_state
+        if snapshot.game_state == GameState.LOST:
+            game._reveal_all_mines()
+        self.position = position
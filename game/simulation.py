@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+批量模拟
+在进程池中用指定策略批量进行对局，并以流式方式汇总统计结果
+
+命令行用法：
+    python -m game.simulation --difficulty hard --games 10000 --strategy random --workers 8
+"""
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from .board import Board
+from .difficulty import add_difficulty_arguments, difficulties_from_args, difficulty_from_args
+from .game_logic import ACTION_CHORD, ACTION_FLAG, ACTION_REVEAL, GameLogic, GameState
+from .monte_carlo import MonteCarloEstimator
+from .probability import ComponentTooLargeError, ProbabilityEngine
+from .solver import Solver
+
+Action = Tuple[str, int, int]
+
+
+class Strategy:
+    """策略基类，每步给出一个动作 (动作类型, 行, 列)，返回None表示放弃"""
+
+    def start(self, game: GameLogic, rng: random.Random):
+        """新对局开始时调用"""
+
+    def next_action(self, game: GameLogic) -> Optional[Action]:
+        """给出下一步动作"""
+        raise NotImplementedError
+
+    def observe(self, game: GameLogic, action: Action, opened: List[Tuple[int, int]]):
+        """动作执行后调用，opened 为本次新揭开的格子"""
+
+
+class RandomStrategy(Strategy):
+    """随机策略：按随机顺序逐个揭开尚未揭开且未插旗的格子"""
+
+    def __init__(self):
+        self._order: List[int] = []
+        self._position = 0
+
+    def start(self, game: GameLogic, rng: random.Random):
+        self._order = list(range(game.board.get_total_cells()))
+        rng.shuffle(self._order)
+        self._position = 0
+
+    def next_action(self, game: GameLogic) -> Optional[Action]:
+        board = game.board
+        while self._position < len(self._order):
+            row, col = divmod(self._order[self._position], board.cols)
+            self._position += 1
+            cell = board.get_cell(row, col)
+            if not cell.is_revealed and not cell.is_flagged:
+                return ACTION_REVEAL, row, col
+        return None
+
+
+class ScriptedStrategy(Strategy):
+    """脚本策略：每局按相同的动作列表依次执行"""
+
+    def __init__(self, actions: Sequence[Action]):
+        self.actions = [tuple(action) for action in actions]
+        self._position = 0
+
+    def start(self, game: GameLogic, rng: random.Random):
+        self._position = 0
+
+    def next_action(self, game: GameLogic) -> Optional[Action]:
+        if self._position >= len(self.actions):
+            return None
+        action = self.actions[self._position]
+        self._position += 1
+        return action
+
+
+class SolverStrategy(Strategy):
+    """求解器策略：先揭开必然安全的格子，推不出时随机揭开一个未推出是雷的格子"""
+
+    # 随机猜测时先尝试的次数，失败再整盘扫描
+    GUESS_ATTEMPTS = 32
+
+    def __init__(self):
+        self.solver: Optional[Solver] = None
+        self.rng = random.Random()
+
+    def start(self, game: GameLogic, rng: random.Random):
+        self.solver = Solver(game.board)
+        self.rng = rng
+
+    def next_action(self, game: GameLogic) -> Optional[Action]:
+        board = game.board
+        if game.is_first_click():
+            return ACTION_REVEAL, board.rows // 2, board.cols // 2
+        safe, _ = self.solver.find_certain()
+        if safe:
+            return (ACTION_REVEAL,) + safe[0]
+        return self._guess(board)
+
+    def _guess(self, board: Board) -> Optional[Action]:
+        """随机选一个未揭开、未插旗且未推出是雷的格子"""
+        solver = self.solver
+        total = board.get_total_cells()
+        for _ in range(self.GUESS_ATTEMPTS):
+            index = self.rng.randrange(total)
+            if index not in solver.numbers and index not in solver.mines:
+                row, col = divmod(index, board.cols)
+                if not board.get_cell(row, col).is_flagged:
+                    return ACTION_REVEAL, row, col
+        for index in range(total):
+            if index not in solver.numbers and index not in solver.mines:
+                row, col = divmod(index, board.cols)
+                if not board.get_cell(row, col).is_flagged:
+                    return ACTION_REVEAL, row, col
+        return None
+
+    def observe(self, game: GameLogic, action: Action, opened: List[Tuple[int, int]]):
+        if action[0] == ACTION_FLAG:
+            self.solver.notify_flag(action[1], action[2])
+        else:
+            self.solver.notify_revealed(opened)
+
+
+class ProbabilityStrategy(SolverStrategy):
+    """概率策略：推不出安全格子时揭开是雷概率最低的格子，边界过于复杂时改用采样估计"""
+
+    # 采样估计的时间预算（秒）
+    SAMPLING_BUDGET = 0.05
+
+    def start(self, game: GameLogic, rng: random.Random):
+        super().start(game, rng)
+        self.engine = ProbabilityEngine(game.board, self.solver)
+        self.estimator = MonteCarloEstimator(game.board, self.solver, time_budget=self.SAMPLING_BUDGET,
+                                             seed=rng.getrandbits(32))
+
+    def _guess(self, board: Board) -> Optional[Action]:
+        try:
+            position = self.engine.best_guess()
+        except ComponentTooLargeError:
+            position = self.estimator.best_guess()
+        if position is None:
+            return super()._guess(board)
+        return (ACTION_REVEAL,) + position
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    'random': RandomStrategy,
+    'scripted': ScriptedStrategy,
+    'solver': SolverStrategy,
+    'probability': ProbabilityStrategy,
+}
+
+
+def make_strategy(name: str, script: Optional[Sequence[Action]] = None) -> Strategy:
+    """按名称创建策略"""
+    if name not in STRATEGIES:
+        raise ValueError(f"未知策略: {name}")
+    if name == 'scripted':
+        return ScriptedStrategy(script or [])
+    return STRATEGIES[name]()
+
+
+class GameResult(NamedTuple):
+    """单局结果"""
+    state: GameState
+    clicks: int
+    reveal_sizes: List[int]
+    seconds: float
+
+
+def play_game(game: GameLogic, strategy: Strategy, rng: random.Random,
+              max_actions: Optional[int] = None) -> GameResult:
+    """用指定策略进行一局，复用传入GameLogic的游戏板"""
+    started = time.perf_counter()
+    game.new_game()
+    strategy.start(game, rng)
+
+    clicks = 0
+    reveal_sizes = []
+    actions = 0
+    while game.get_game_state() in (GameState.READY, GameState.PLAYING):
+        if max_actions is not None and actions >= max_actions:
+            break
+        action = strategy.next_action(game)
+        if action is None:
+            break
+        kind, row, col = action
+        actions += 1
+        if kind in (ACTION_REVEAL, ACTION_CHORD):
+            opened = game.left_click(row, col) if kind == ACTION_REVEAL else game.chord(row, col)
+            if opened:
+                clicks += 1
+                reveal_sizes.append(len(opened))
+        elif kind == ACTION_FLAG:
+            game.toggle_flag(row, col)
+            opened = []
+        else:
+            raise ValueError(f"未知动作: {kind}")
+        strategy.observe(game, action, opened)
+
+    return GameResult(game.get_game_state(), clicks, reveal_sizes, time.perf_counter() - started)
+
+
+class SimulationStats:
+    """模拟统计类，可以逐局累加，也可以合并其他批次的统计"""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.clicks = 0
+        self.reveals = 0
+        self.revealed_cells = 0
+        self.max_reveal = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add_result(self, result: GameResult):
+        """累加一局的结果"""
+        self.games += 1
+        if result.state == GameState.WON:
+            self.wins += 1
+        elif result.state == GameState.LOST:
+            self.losses += 1
+        self.clicks += result.clicks
+        self.reveals += len(result.reveal_sizes)
+        self.revealed_cells += sum(result.reveal_sizes)
+        self.max_reveal = max([self.max_reveal] + result.reveal_sizes)
+        self.total_seconds += result.seconds
+        self.max_seconds = max(self.max_seconds, result.seconds)
+
+    def merge(self, other: 'SimulationStats'):
+        """合并另一批次的统计"""
+        self.games += other.games
+        self.wins += other.wins
+        self.losses += other.losses
+        self.clicks += other.clicks
+        self.reveals += other.reveals
+        self.revealed_cells += other.revealed_cells
+        self.max_reveal = max(self.max_reveal, other.max_reveal)
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_clicks(self) -> float:
+        return self.clicks / self.games if self.games else 0.0
+
+    @property
+    def mean_reveal(self) -> float:
+        return self.revealed_cells / self.reveals if self.reveals else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.games if self.games else 0.0
+
+    def as_dict(self) -> dict:
+        """转换为字典，便于输出JSON"""
+        return {
+            'games': self.games,
+            'wins': self.wins,
+            'losses': self.losses,
+            'win_rate': self.win_rate,
+            'mean_clicks': self.mean_clicks,
+            'mean_reveal': self.mean_reveal,
+            'max_reveal': self.max_reveal,
+            'mean_seconds': self.mean_seconds,
+            'max_seconds': self.max_seconds,
+        }
+
+    def __str__(self) -> str:
+        return (f"对局 {self.games}，胜率 {self.win_rate:.2%}，平均点击 {self.mean_clicks:.1f}，"
+                f"平均展开 {self.mean_reveal:.1f} 格（最大 {self.max_reveal}），"
+                f"平均每局 {self.mean_seconds * 1000:.3f} ms")
+
+
+# 工作进程内缓存的GameLogic，同一进程的各批次复用同一个游戏板
+_worker_games: Dict[Tuple[str, type, Optional[Tuple[int, ...]]], GameLogic] = {}
+
+
+def _get_worker_game(difficulty: str, board_class: Type[Board],
+                     config: Optional[dict] = None) -> GameLogic:
+    """获取当前进程缓存的无头GameLogic，config 为自定义难度的配置"""
+    key = (difficulty, board_class, tuple(sorted(config.items())) if config else None)
+    game = _worker_games.get(key)
+    if game is None:
+        difficulties = {difficulty: config} if config else None
+        game = GameLogic(difficulty, board_class=board_class, headless=True, difficulties=difficulties)
+        _worker_games[key] = game
+    return game
+
+
+def run_batch(games: int, difficulty: str, strategy: str, script: Optional[Sequence[Action]],
+              seed: int, board_class: Type[Board] = Board,
+              max_actions: Optional[int] = None, config: Optional[dict] = None) -> SimulationStats:
+    """在当前进程中进行一批对局，返回这一批的统计"""
+    game = _get_worker_game(difficulty, board_class, config)
+    game.rng.seed(seed)
+    rng = random.Random(seed)
+    player = make_strategy(strategy, script)
+
+    stats = SimulationStats()
+    for _ in range(games):
+        stats.add_result(play_game(game, player, rng, max_actions))
+    return stats
+
+
+def iter_simulation(games: int, difficulty: str = 'easy', strategy: str = 'random',
+                    script: Optional[Sequence[Action]] = None, workers: Optional[int] = None,
+                    batch_size: int = 100, seed: Optional[int] = None,
+                    board_class: Type[Board] = Board,
+                    max_actions: Optional[int] = None,
+                    config: Optional[dict] = None) -> Iterator[SimulationStats]:
+    """按批次进行模拟，每完成一批就产出该批的统计
+
+    workers 为进程数（None表示CPU核数），为1时在当前进程中运行。
+    config 为自定义难度的配置（以 difficulty 为名称注册），None 表示使用内置难度。
+    相同的 seed 与 batch_size 得到相同的对局序列，与进程数无关。
+    """
+    if seed is None:
+        seed = random.getrandbits(32)
+    batches = []
+    remaining = games
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        batches.append((count, difficulty, strategy, script, seed + len(batches), board_class,
+                        max_actions, config))
+        remaining -= count
+
+    if workers == 1:
+        for batch in batches:
+            yield run_batch(*batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_batch, *batch) for batch in batches]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def simulate(games: int, **kwargs) -> SimulationStats:
+    """进行模拟并返回汇总统计，参数同 iter_simulation"""
+    total = SimulationStats()
+    for stats in iter_simulation(games, **kwargs):
+        total.merge(stats)
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="扫雷批量模拟")
+    add_difficulty_arguments(parser)
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--strategy', default='random', choices=sorted(STRATEGIES))
+    parser.add_argument('--script', help="脚本策略的动作列表JSON文件，格式为 [[\"reveal\", 行, 列], ...]")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help="以JSON输出最终统计")
+    args = parser.parse_args(argv)
+    try:
+        difficulties = difficulties_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    difficulty = difficulty_from_args(args)
+    if difficulty not in GameLogic.DIFFICULTIES and difficulty not in difficulties:
+        parser.error(f"未知难度: {difficulty}")
+
+    script = None
+    if args.script:
+        with open(args.script, 'r', encoding='utf-8') as f:
+            script = [tuple(action) for action in json.load(f)]
+
+    total = SimulationStats()
+    for stats in iter_simulation(args.games, difficulty=difficulty, strategy=args.strategy,
+                                 script=script, workers=args.workers,
+                                 batch_size=args.batch_size, seed=args.seed,
+                                 config=difficulties.get(difficulty)):
+        total.merge(stats)
+        if not args.json:
+            print(f"[{total.games}/{args.games}] {total}")
+
+    if args.json:
+        print(json.dumps(total.as_dict(), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+游戏存档
+把进行中的对局（游戏板状态、难度、计时器、首次点击标记和游戏状态）保存为带版本号的二进制快照，
+并恢复到 GameLogic 中
+"""
+
+import struct
+from typing import Union
+
+import numpy as np
+
+from .game_logic import GameLogic, GameState
+
+# 文件头：魔数、版本、游戏状态、是否首次点击、计时器是否在运行、
+# 行数、列数、难度的地雷数、时限、已用秒数、布雷种子（-1表示无）、难度名称字节数
+HEADER = struct.Struct('<4sHB??xqqqqdqH')
+MAGIC = b'MSSV'
+VERSION = 1
+
+GAME_STATES = list(GameState)
+
+
+def dumps(game: GameLogic) -> bytes:
+    """把对局编码为快照
+
+    快照为文件头、UTF-8 难度名称，之后是地雷、已揭开、已插旗三段按位打包的格子状态，
+    每段 ceil(行数 * 列数 / 8) 字节。周围地雷数可以从地雷位置算出，不保存。
+    """
+    board = game.board
+    config = game.get_difficulty_config()
+    name = game.current_difficulty.encode('utf-8')
+    timer = game.timer
+    seed = -1 if board.seed is None else board.seed
+    header = HEADER.pack(MAGIC, VERSION, GAME_STATES.index(game.game_state), game.first_click,
+                         timer.is_running, board.rows, board.cols, config['mines'], config['time'],
+                         timer.get_elapsed(), seed, len(name))
+    parts = [header, name]
+    parts.extend(np.packbits(bits).tobytes() for bits in board.get_state_bits())
+    return b''.join(parts)
+
+
+def loads(game: GameLogic, data: Union[bytes, bytearray, memoryview]):
+    """把快照恢复到 game 中，保留其音效、监听器等与对局无关的设置
+
+    格子状态直接从快照数据解包写入游戏板存储，不逐个创建或修改格子对象
+    （Board 后端除外，其存储本身就是格子对象）。
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError("存档数据不完整")
+    (magic, version, state, first_click, running, rows, cols, mines_config, time_limit,
+     elapsed, seed, name_length) = HEADER.unpack(data[:HEADER.size])
+    if magic != MAGIC:
+        raise ValueError("不是有效的存档数据")
+    if version != VERSION:
+        raise ValueError(f"不支持的存档版本: {version}")
+
+    offset = HEADER.size
+    name = bytes(data[offset:offset + name_length]).decode('utf-8')
+    offset += name_length
+    size = rows * cols
+    packed = (size + 7) // 8
+    if len(data) != offset + 3 * packed:
+        raise ValueError("存档数据不完整")
+    mines, revealed, flagged = (
+        np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=packed, offset=offset + i * packed),
+                      count=size).view(bool)
+        for i in range(3)
+    )
+
+    # 难度：按快照中的配置恢复，自定义尺寸同样适用
+    config = dict(game.difficulties.get(name, {}))
+    config.update(rows=rows, cols=cols, mines=mines_config, time=time_limit)
+    game.difficulties[name] = config
+    game.current_difficulty = name
+
+    board = game.board
+    if (board.rows, board.cols) != (rows, cols):
+        board = game.board = game.board_class(rows, cols)
+    else:
+        board.reset()
+    board.seed = None if seed < 0 else seed
+    board.set_state_bits(mines, revealed, flagged)
+
+    game.first_click = first_click
+    game.game_state = GAME_STATES[state]
+    game.history.clear()
+    game.timer.reset(time_limit)
+    if first_click:
+        game._start_prefetch()
+    else:
+        game.timer.restore(elapsed, running)
+    game._publish_reset()
+
+
+def save(game: GameLogic, path: str):
+    """把对局保存到文件"""
+    with open(path, 'wb') as f:
+        f.write(dumps(game))
+
+
+def load(game: GameLogic, path: str):
+    """从文件恢复对局"""
+    with open(path, 'rb') as f:
+        loads(game, f.read())
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+约束传播求解器
+增量维护边界（与已揭开数字相邻的未揭开格子），用单格规则和子集规则推出必然安全和必然是雷的格子
+"""
+
+from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+from .board import Board
+from .game_logic import ChangeSet
+
+
+class Solver:
+    """约束传播求解器类
+
+    每个已揭开的安全格子是一条约束：其未确定的邻居中恰有（数字 - 已推出的相邻地雷数）个地雷。
+    通过 notify_revealed / notify_flag 告知棋面变化，只有受影响的约束被标记为待检查，
+    find_certain 只处理这些约束，单次调用的开销与本次变化的范围成正比，与游戏板大小无关。
+    求解器只使用自己推出的地雷，不信任玩家的旗子（trust_flags=True 时把旗子当作地雷）。
+    """
+
+    def __init__(self, board: Board, trust_flags: bool = False):
+        self.board = board
+        self.trust_flags = trust_flags
+        self.numbers: Dict[int, int] = {}   # 已揭开的安全格子 -> 周围地雷数
+        self.mines: Set[int] = set()        # 已推出（或信任旗子）的地雷
+        self.safe: Set[int] = set()         # 已推出但尚未揭开的安全格子
+        self.frontier: Set[int] = set()     # 与已揭开格子相邻的未揭开格子
+        self._active: Set[int] = set()      # 仍有未确定邻居的约束
+        self._dirty: Set[int] = set()       # 待检查的约束
+        self._neighbors = self._bind_neighbors(board)
+        if board.get_revealed_count() or (trust_flags and board.get_flagged_count()):
+            self.rebuild()
+
+    @staticmethod
+    def _bind_neighbors(board: Board) -> Callable[[int], Sequence[int]]:
+        """获取邻居查询函数；使用整盘邻居表的游戏板直接切片，省去每次查表"""
+        if type(board).get_neighbor_indices is not Board.get_neighbor_indices:
+            return board.get_neighbor_indices
+        table = board.neighbor_table
+        indptr, indices = table.indptr, table.indices
+        return lambda index: indices[indptr[index]:indptr[index + 1]]
+
+    def rebuild(self):
+        """按游戏板当前状态整体重建（仅在中途接入时需要）"""
+        self.numbers.clear()
+        self.mines.clear()
+        self.safe.clear()
+        self.frontier.clear()
+        self._active.clear()
+        self._dirty.clear()
+        cols = self.board.cols
+        revealed = [divmod(index, cols) for index in range(self.board.get_total_cells())
+                    if self.board.get_cell(*divmod(index, cols)).is_revealed]
+        self.notify_revealed(revealed)
+        if self.trust_flags:
+            for row, col in self.board.flagged_positions:
+                self.notify_flag(row, col)
+
+    def _position(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.board.cols)
+
+    def notify_revealed(self, cells: Iterable[Tuple[int, int]]):
+        """告知新揭开的格子（reveal_cell 的返回值）"""
+        board = self.board
+        for row, col in cells:
+            cell = board.get_cell(row, col)
+            if cell.is_mine:
+                continue
+            index = row * board.cols + col
+            if index in self.numbers:
+                continue
+            self.numbers[index] = cell.neighbor_mines
+            self.safe.discard(index)
+            self.frontier.discard(index)
+            self._active.add(index)
+            self._dirty.add(index)
+            for neighbor in self._neighbors(index):
+                if neighbor in self.numbers:
+                    self._dirty.add(neighbor)
+                else:
+                    self.frontier.add(neighbor)
+
+    def notify_flag(self, row: int, col: int):
+        """告知旗子变化；只有信任旗子时才影响推理"""
+        if not self.trust_flags:
+            return
+        index = row * self.board.cols + col
+        if index in self.numbers:
+            return
+        if self.board.get_cell(row, col).is_flagged:
+            self.mines.add(index)
+        else:
+            self.mines.discard(index)
+        self._touch(index)
+
+    def apply_changes(self, changes: ChangeSet):
+        """按 GameLogic 发布的 ChangeSet 更新，可以直接订阅：game.subscribe(solver.apply_changes)
+
+        格子被撤销揭开或布局改变时已推出的结论可能失效，整体重建；否则增量更新。
+        """
+        if changes.hidden or changes.layout_changed:
+            self.rebuild()
+            return
+        self.notify_revealed(changes.positions(changes.revealed))
+        for row, col in changes.positions(changes.flagged) + changes.positions(changes.unflagged):
+            self.notify_flag(row, col)
+
+    def _touch(self, index: int):
+        """把与指定格子相邻的约束标记为待检查"""
+        for neighbor in self._neighbors(index):
+            if neighbor in self._active:
+                self._dirty.add(neighbor)
+
+    def _constraint(self, index: int) -> Tuple[Set[int], int]:
+        """返回约束的未确定邻居集合和其中剩余的地雷数"""
+        unknown = set()
+        remaining = self.numbers[index]
+        for neighbor in self._neighbors(index):
+            if neighbor in self.mines:
+                remaining -= 1
+            elif neighbor not in self.numbers and neighbor not in self.safe:
+                unknown.add(neighbor)
+        return unknown, remaining
+
+    def _mark(self, cells: Iterable[int], is_mine: bool):
+        """记录推出的格子，并唤醒受影响的约束"""
+        target = self.mines if is_mine else self.safe
+        for index in cells:
+            if index not in target:
+                target.add(index)
+                self._touch(index)
+
+    def _nearby_constraints(self, unknown: Set[int]) -> Set[int]:
+        """与指定格子集合共享格子的约束"""
+        nearby = set()
+        for cell in unknown:
+            for neighbor in self._neighbors(cell):
+                if neighbor in self._active:
+                    nearby.add(neighbor)
+        return nearby
+
+    def solve(self):
+        """处理所有待检查的约束，直到推不出新的格子"""
+        while self._dirty:
+            index = self._dirty.pop()
+            if index not in self._active:
+                continue
+            unknown, remaining = self._constraint(index)
+            if not unknown:
+                self._active.discard(index)
+                continue
+            # 单格规则
+            if remaining == 0:
+                self._mark(unknown, False)
+                continue
+            if remaining == len(unknown):
+                self._mark(unknown, True)
+                continue
+            # 子集规则：A 的未确定格子是 B 的子集时，差集中恰有 (B剩余 - A剩余) 个地雷
+            for other in self._nearby_constraints(unknown):
+                if other == index:
+                    continue
+                other_unknown, other_remaining = self._constraint(other)
+                for small, small_remaining, large, large_remaining in (
+                        (unknown, remaining, other_unknown, other_remaining),
+                        (other_unknown, other_remaining, unknown, remaining)):
+                    if not small or not small < large:
+                        continue
+                    difference = large - small
+                    mines = large_remaining - small_remaining
+                    if mines == 0:
+                        self._mark(difference, False)
+                    elif mines == len(difference):
+                        self._mark(difference, True)
+
+    def get_constraints(self) -> List[Tuple[Set[int], int]]:
+        """返回所有仍有未确定格子的约束 (未确定格子的一维索引集合, 剩余地雷数)"""
+        self.solve()
+        constraints = []
+        for index in list(self._active):
+            unknown, remaining = self._constraint(index)
+            if unknown:
+                constraints.append((unknown, remaining))
+            else:
+                self._active.discard(index)
+        return constraints
+
+    def find_certain(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """返回 (必然安全且未揭开的格子, 必然是雷的格子)，按行优先排序"""
+        self.solve()
+        safe = [self._position(index) for index in sorted(self.safe)]
+        mines = [self._position(index) for index in sorted(self.mines)]
+        return safe, mines
+
+    def get_unknown_frontier(self) -> List[Tuple[int, int]]:
+        """尚未推出结果的边界格子"""
+        self.solve()
+        return [self._position(index) for index in sorted(self.frontier - self.mines - self.safe)]
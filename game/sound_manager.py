@@ -6,6 +6,7 @@
 
 import pygame
 import os
+import sys
 from typing import Dict, Optional
 
 
@@ -183,4 +184,67 @@ class SoundManager:
             sound.set_volume(self.volume)
             self.sounds['game_over'] = sound
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+class NullSoundManager:
+    """空音效管理器类
+
+    接口与SoundManager相同但不做任何事，不初始化pygame音频，也不读取音效文件。
+    GameLogic只调用 play_sound，任何提供相同方法的对象都可以作为音效后端注入。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.volume = 0.5
+
+    def play_sound(self, sound_name: str):
+        """播放音效（无操作）"""
+
+    def set_volume(self, volume: float):
+        """设置音量"""
+        self.volume = max(0.0, min(1.0, volume))
+
+    def toggle_sound(self):
+        """切换音效开关"""
+        self.enabled = not self.enabled
+
+    def is_enabled(self) -> bool:
+        """检查音效是否启用"""
+        return self.enabled
+
+    def get_volume(self) -> float:
+        """获取当前音量"""
+        return self.volume
+
+    def create_default_sounds(self):
+        """创建默认的简单音效（无操作）"""
+
+
+def is_headless_environment() -> bool:
+    """检查当前环境是否没有可用的显示或音频设备"""
+    if os.environ.get('SDL_AUDIODRIVER') in ('dummy', 'disk'):
+        return True
+    if os.environ.get('SDL_VIDEODRIVER') in ('dummy', 'offscreen'):
+        return True
+    if sys.platform.startswith('linux'):
+        return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return False
+
+
+def create_sound_manager(headless: Optional[bool] = None):
+    """创建音效管理器
+
+    headless 为 True 时使用空音效后端；为 None 时自动检测，
+    没有显示或音频设备、或者音频初始化失败时也使用空音效后端。
+    """
+    if headless is None:
+        headless = is_headless_environment()
+    if headless:
+        return NullSoundManager()
+
+    try:
+        return SoundManager()
+    except pygame.error as e:
+        print(f"音频设备不可用，已关闭音效: {e}")
+        return NullSoundManager()
@@ -16,6 +16,8 @@ class Timer:
         self.time_left = duration_seconds
         self.is_running = False
         self.start_time = 0
+        # 停止时已经过的秒数，用于存档
+        self.stopped_elapsed = 0.0
         self.on_time_up_callback: Optional[Callable] = None
         self.on_tick_callback: Optional[Callable] = None
 
@@ -27,6 +29,8 @@ class Timer:
 
     def stop(self):
         """停止计时器"""
+        if self.is_running:
+            self.stopped_elapsed = time.time() - self.start_time
         self.is_running = False
 
     def reset(self, duration_seconds: Optional[int] = None):
@@ -36,6 +40,20 @@ class Timer:
         self.time_left = self.duration
         self.is_running = False
         self.start_time = 0
+        self.stopped_elapsed = 0.0
+
+    def get_elapsed(self) -> float:
+        """获取已经过的秒数"""
+        if self.is_running:
+            return time.time() - self.start_time
+        return self.stopped_elapsed
+
+    def restore(self, elapsed: float, running: bool):
+        """恢复到已经过 elapsed 秒的状态，running 为真时继续计时"""
+        self.start_time = time.time() - elapsed
+        self.stopped_elapsed = elapsed
+        self.time_left = max(0, self.duration - int(elapsed))
+        self.is_running = running
 
     def update(self):
         """更新计时器状态"""
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+向量化多游戏板环境
+把K个同尺寸游戏板堆叠成三维数组，每一步对所有游戏板同时执行一个动作，供训练机器人使用
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .board import count_neighbor_mines
+from .game_logic import GameLogic
+
+# 动作类型
+ACTION_REVEAL = 0
+ACTION_FLAG = 1
+
+# 观测值：未揭开、已插旗、已揭开的地雷；已揭开的安全格子为周围地雷数 0-8
+OBS_HIDDEN = -1
+OBS_FLAG = -2
+OBS_MINE = 9
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """把最后两维上的布尔掩码向8个方向各扩张一格"""
+    result = mask.copy()
+    result[..., 1:, :] |= mask[..., :-1, :]
+    result[..., :-1, :] |= mask[..., 1:, :]
+    horizontal = result.copy()
+    result[..., :, 1:] |= horizontal[..., :, :-1]
+    result[..., :, :-1] |= horizontal[..., :, 1:]
+    return result
+
+
+class VectorEnv:
+    """向量化多游戏板环境类
+
+    规则与 GameLogic.reveal_cell 相同：首次揭开时才布雷并保护点击位置周围3x3区域，
+    踩雷则失败并显示所有地雷，揭开空格子时展开整片空白区域，揭开全部安全格子即胜利。
+    step 接收形状为 (K, 3) 的动作数组，每行为 (动作类型, 行, 列)，返回观测、奖励和结束标记。
+    奖励为本步新揭开的安全格子占全部安全格子的比例，胜利额外 +1，踩雷为 -1。
+    已结束的游戏板忽略动作，调用 reset 重新开始。
+    """
+
+    def __init__(self, num_boards: int, rows: int, cols: int, mines: int,
+                 seed: Optional[int] = None):
+        if mines > rows * cols - 1:
+            raise ValueError(f"无法在 {rows * cols} 个格子中布置 {mines} 个地雷")
+        self.num_boards = num_boards
+        self.rows = rows
+        self.cols = cols
+        self.total_mines = mines
+        self.safe_cells = rows * cols - mines
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_boards, rows, cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.counts = np.zeros(shape, dtype=np.uint8)
+        self.started = np.zeros(num_boards, dtype=bool)
+        self.done = np.zeros(num_boards, dtype=bool)
+        self.won = np.zeros(num_boards, dtype=bool)
+        self.revealed_count = np.zeros(num_boards, dtype=np.int64)
+
+    @classmethod
+    def from_difficulty(cls, difficulty: str, num_boards: int,
+                        seed: Optional[int] = None) -> 'VectorEnv':
+        """按GameLogic的难度配置创建环境"""
+        config = GameLogic.DIFFICULTIES[difficulty]
+        return cls(num_boards, config['rows'], config['cols'], config['mines'], seed)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """重置指定的游戏板（默认全部），返回观测"""
+        if mask is None:
+            mask = np.ones(self.num_boards, dtype=bool)
+        for array in (self.mines, self.revealed, self.flagged):
+            array[mask] = False
+        self.counts[mask] = 0
+        self.started[mask] = False
+        self.done[mask] = False
+        self.won[mask] = False
+        self.revealed_count[mask] = 0
+        return self.observe()
+
+    def set_layout(self, board: int, mines: np.ndarray):
+        """直接指定某个游戏板的地雷布局（视为已完成首次点击的布雷）"""
+        self.mines[board] = mines
+        self.counts[board] = count_neighbor_mines(self.mines[board])
+        self.started[board] = True
+
+    def observe(self) -> np.ndarray:
+        """获取所有游戏板的观测，形状为 (K, rows, cols) 的 int8 数组"""
+        obs = np.full(self.mines.shape, OBS_HIDDEN, dtype=np.int8)
+        obs[self.flagged] = OBS_FLAG
+        obs[self.revealed] = self.counts[self.revealed]
+        obs[self.revealed & self.mines] = OBS_MINE
+        return obs
+
+    def _place_mines(self, boards: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+        """为首次揭开的游戏板一次性布雷，避开点击位置周围3x3区域"""
+        size = self.rows * self.cols
+        keys = self.rng.random((len(boards), size))
+        grid_rows, grid_cols = np.divmod(np.arange(size), self.cols)
+        radius = 1 if size - 9 >= self.total_mines else 0
+        excluded = ((np.abs(grid_rows[None, :] - rows[:, None]) <= radius) &
+                    (np.abs(grid_cols[None, :] - cols[:, None]) <= radius))
+        keys[excluded] = 2.0
+
+        mines = np.zeros((len(boards), size), dtype=bool)
+        if self.total_mines:
+            chosen = np.argpartition(keys, self.total_mines - 1, axis=1)[:, :self.total_mines]
+            np.put_along_axis(mines, chosen, True, axis=1)
+        mines = mines.reshape(len(boards), self.rows, self.cols)
+        self.mines[boards] = mines
+        self.counts[boards] = count_neighbor_mines(mines)
+        self.started[boards] = True
+
+    def _reveal(self, boards: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """在指定游戏板上揭开格子，返回 (新揭开的安全格子数, 是否踩雷)"""
+        hit = self.mines[boards, rows, cols]
+        opened_counts = np.zeros(len(boards), dtype=np.int64)
+
+        # 踩雷：显示所有地雷
+        if hit.any():
+            lost = boards[hit]
+            self.revealed[lost] |= self.mines[lost]
+
+        safe = ~hit
+        if safe.any():
+            safe_boards = boards[safe]
+            seeds = np.zeros((len(safe_boards), self.rows, self.cols), dtype=bool)
+            seeds[np.arange(len(safe_boards)), rows[safe], cols[safe]] = True
+
+            allowed = ~(self.revealed[safe_boards] | self.flagged[safe_boards] | self.mines[safe_boards])
+            zero = self.counts[safe_boards] == 0
+            opened = seeds & allowed
+            frontier = seeds & zero
+            # 所有游戏板同时逐层扩张，轮数等于本批中最大空白区域的直径
+            while frontier.any():
+                grown = dilate(frontier) & allowed & ~opened
+                opened |= grown
+                frontier = grown & zero
+
+            self.revealed[safe_boards] |= opened
+            opened_counts[safe] = opened.reshape(len(safe_boards), -1).sum(axis=1)
+
+        return opened_counts, hit
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """对每个游戏板执行一个动作，返回 (观测, 奖励, 结束标记)"""
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_boards, 3)
+        kinds, rows, cols = actions[:, 0], actions[:, 1], actions[:, 2]
+        rewards = np.zeros(self.num_boards, dtype=np.float32)
+
+        valid = (~self.done & (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols))
+        board_index = np.arange(self.num_boards)
+        safe_rows = np.where(valid, rows, 0)
+        safe_cols = np.where(valid, cols, 0)
+        revealed = self.revealed[board_index, safe_rows, safe_cols]
+        flagged = self.flagged[board_index, safe_rows, safe_cols]
+
+        # 插旗/取消插旗：只对未揭开的格子有效
+        flag = valid & (kinds == ACTION_FLAG) & ~revealed
+        self.flagged[board_index[flag], rows[flag], cols[flag]] ^= True
+
+        # 揭开：已揭开或已插旗的格子无效
+        reveal = valid & (kinds == ACTION_REVEAL) & ~revealed & ~flagged
+        first = reveal & ~self.started
+        if first.any():
+            self._place_mines(board_index[first], rows[first], cols[first])
+
+        if reveal.any():
+            boards = board_index[reveal]
+            opened, hit = self._reveal(boards, rows[reveal], cols[reveal])
+            self.revealed_count[boards] += opened
+            rewards[boards] = opened / self.safe_cells
+
+            lost = boards[hit]
+            rewards[lost] = -1.0
+            self.done[lost] = True
+
+            won = boards[~hit][self.revealed_count[boards[~hit]] == self.safe_cells]
+            rewards[won] += 1.0
+            self.won[won] = True
+            self.done[won] = True
+
+        return self.observe(), rewards, self.done.copy()
@@ -5,16 +5,45 @@
 基于Pygame的扫雷游戏实现
 """
 
+import argparse
 import pygame
 import sys
+from game.array_board import ArrayBoard
+from game.difficulty import add_difficulty_arguments, difficulties_from_args, difficulty_from_args
 from game.game_logic import GameLogic
 from ui.renderer import Renderer
 from ui.colors import Colors
 from ui.fonts import Fonts
 
 
-def main():
+# 数字键依次对应难度表中的难度（1 简单、2 困难，之后是自定义难度）
+DIFFICULTY_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5,
+                   pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]
+
+# 方向键滚动视口：(行, 列)
+SCROLL_KEYS = {pygame.K_UP: (-1, 0), pygame.K_DOWN: (1, 0),
+               pygame.K_LEFT: (0, -1), pygame.K_RIGHT: (0, 1)}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="扫雷游戏")
+    add_difficulty_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        args.difficulties = difficulties_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    difficulty = difficulty_from_args(args)
+    if difficulty not in GameLogic.DIFFICULTIES and difficulty not in args.difficulties:
+        parser.error(f"未知难度: {difficulty}")
+    args.difficulty = difficulty
+    return args
+
+
+def main(argv=None):
     """主游戏循环"""
+    args = parse_args(argv)
     pygame.init()
 
     # 游戏设置
@@ -26,8 +55,9 @@ def main():
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("扫雷游戏")
 
-    # 创建游戏对象
-    game_logic = GameLogic()
+    # 创建游戏对象；数组游戏板在百万格规模下仍能保持每次操作的开销与改变的格子数成正比
+    game_logic = GameLogic(args.difficulty, board_class=ArrayBoard, prefetch=True,
+                           difficulties=args.difficulties)
     renderer = Renderer(screen)
     fonts = Fonts()
     colors = Colors()
@@ -48,20 +78,33 @@ def main():
                 if event.button == 1:  # 左键
                     x, y = event.pos
                     game_logic.handle_left_click(x, y, renderer)
+                elif event.button == 2:  # 中键双键
+                    x, y = event.pos
+                    game_logic.handle_middle_click(x, y, renderer)
                 elif event.button == 3:  # 右键
                     x, y = event.pos
                     game_logic.handle_right_click(x, y, renderer)
 
+            # 滚轮滚动视口
+            elif event.type == pygame.MOUSEWHEEL:
+                renderer.scroll(game_logic.get_board(), -event.y, event.x)
+
             # 键盘事件
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_n:  # N键开始新游戏
                     game_logic.new_game()
-                elif event.key == pygame.K_1:  # 1键简单模式
-                    game_logic.set_difficulty('easy')
-                    game_logic.new_game()
-                elif event.key == pygame.K_2:  # 2键困难模式
-                    game_logic.set_difficulty('hard')
-                    game_logic.new_game()
+                elif event.key in DIFFICULTY_KEYS:  # 数字键切换难度
+                    names = list(game_logic.difficulties)
+                    index = DIFFICULTY_KEYS.index(event.key)
+                    if index < len(names):
+                        game_logic.set_difficulty(names[index])
+                elif event.key in SCROLL_KEYS:  # 方向键滚动视口
+                    rows, cols = SCROLL_KEYS[event.key]
+                    renderer.scroll(game_logic.get_board(), rows, cols)
+                elif event.key == pygame.K_z:  # Z键撤销
+                    game_logic.undo()
+                elif event.key == pygame.K_y:  # Y键重做
+                    game_logic.redo()
                 elif event.key == pygame.K_s:  # S键切换音效
                     game_logic.sound_manager.toggle_sound()
                 elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:  # +键增加音量
@@ -82,6 +125,7 @@ def main():
         pygame.display.flip()
         clock.tick(FPS)
 
+    game_logic.close()
     pygame.quit()
     sys.exit()
 
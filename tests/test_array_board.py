@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+数组游戏板测试
+测试ArrayBoard类和CellView类的功能
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard, CellView
+from game.board import Board
+from game.game_logic import GameLogic, GameState
+
+
+class TestArrayBoard:
+    """测试ArrayBoard类"""
+
+    def test_board_creation(self):
+        """测试游戏板创建"""
+        board = ArrayBoard(10, 12)
+        assert isinstance(board, Board)
+        assert board.rows == 10
+        assert board.cols == 12
+        assert board.total_mines == 0
+        assert len(board.cells) == 10
+        assert len(board.cells[0]) == 12
+        assert board.mines.dtype == bool
+        assert board.neighbor_mines.dtype.itemsize == 1
+
+    def test_compact_storage(self):
+        """测试每个格子只占用几个字节"""
+        board = ArrayBoard(1000, 1000)
+        assert board.nbytes() == 4 * 1000 * 1000
+
+    def test_get_cell_view(self):
+        """测试格子视图读写数组"""
+        board = ArrayBoard(5, 5)
+
+        cell = board.get_cell(1, 2)
+        assert isinstance(cell, CellView)
+        assert not cell.is_mine
+        assert not cell.is_revealed
+
+        cell.is_flagged = True
+        assert board.flagged[1 * 5 + 2]
+        assert board.cells[1][2].is_flagged
+
+        assert board.get_cell(-1, 0) is None
+        assert board.get_cell(5, 5) is None
+
+    def test_place_mines(self):
+        """测试地雷布置"""
+        board = ArrayBoard(5, 5)
+        board.place_mines(24, 2, 2)
+
+        assert board.total_mines == 24
+        assert not board.get_cell(2, 2).is_mine
+        assert int(board.mines.sum()) == 24
+        assert board.get_cell(2, 2).neighbor_mines == 8
+
+    def test_neighbor_mines_calculation(self):
+        """测试周围地雷数量计算"""
+        board = ArrayBoard(5, 5)
+        board.cells[0][0].is_mine = True
+        board.cells[0][1].is_mine = True
+        board.cells[1][0].is_mine = True
+
+        board._calculate_neighbor_mines()
+
+        assert board.get_cell(1, 1).neighbor_mines == 3
+        assert board.get_cell(0, 2).neighbor_mines == 1
+
+    def test_counts_and_reset(self):
+        """测试计数和重置"""
+        board = ArrayBoard(5, 5)
+        board.place_mines(3, 2, 2)
+        board.cells[0][0].is_flagged = True
+        board.cells[1][1].is_revealed = True
+        board.cells[2][2].is_revealed = True
+
+        assert board.get_revealed_count() == 2
+        assert board.get_flagged_count() == 1
+
+        mines = board.mines
+        board.reset()
+
+        assert board.mines is mines
+        assert board.total_mines == 0
+        assert not board.mines.any()
+        assert not board.revealed.any()
+        assert not board.flagged.any()
+        assert not board.neighbor_mines.any()
+
+    def test_incremental_indexes(self):
+        """测试视图写入维护计数器，直接写数组后可重建索引"""
+        board = ArrayBoard(6, 6)
+        board.place_mines(5, 0, 0)
+        assert len(board.mine_positions) == 5
+
+        board.cells[3][3].is_flagged = True
+        board.cells[3][3].is_flagged = True
+        assert board.flagged_positions == {(3, 3)}
+
+        board.revealed[:6] = True
+        board.rebuild_indexes()
+        assert board.get_revealed_count() == 6
+        assert board.get_flagged_count() == 1
+        assert len(board.mine_positions) == 5
+
+    def test_flood_reveal_matches_board(self):
+        """测试数组游戏板展开结果与普通游戏板一致"""
+        board = Board(30, 40)
+        array_board = ArrayBoard(30, 40)
+        board.place_mines(60, 15, 20, safe_radius=1, seed=7)
+        array_board.place_mines(60, 15, 20, safe_radius=1, seed=7)
+        board.cells[0][0].is_flagged = True
+        array_board.cells[0][0].is_flagged = True
+
+        opened = board.flood_reveal(15, 20)
+        array_opened = array_board.flood_reveal(15, 20)
+
+        assert sorted(opened) == sorted(array_opened)
+        assert array_board.get_3bv() == board.get_3bv()
+        assert array_board.get_opening_count() == board.get_opening_count()
+        assert array_board.get_revealed_count() == len(opened)
+        assert int(array_board.revealed.sum()) == len(opened)
+
+    def test_game_logic_with_array_board(self):
+        """测试GameLogic使用数组游戏板"""
+        game = GameLogic('easy', board_class=ArrayBoard)
+        assert isinstance(game.board, ArrayBoard)
+
+        game.reveal_cell(5, 5)
+        assert game.game_state in [GameState.PLAYING, GameState.WON]
+        assert game.board.total_mines == 10
+        assert not game.board.get_cell(5, 5).is_mine
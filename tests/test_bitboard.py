@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+位棋盘测试
+测试BitBoard类的功能
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.bitboard import BitBoard, popcount
+from game.board import Board
+from game.game_logic import GameLogic, GameState
+
+
+def make_pair(rows, cols, mines, row, col, seed):
+    """用相同种子布置普通游戏板和位棋盘"""
+    board = Board(rows, cols)
+    bitboard = BitBoard(rows, cols)
+    board.place_mines(mines, row, col, safe_radius=1, seed=seed)
+    bitboard.place_mines(mines, row, col, safe_radius=1, seed=seed)
+    return board, bitboard
+
+
+class TestBitBoard:
+    """测试BitBoard类"""
+
+    def test_board_creation(self):
+        """测试游戏板创建"""
+        board = BitBoard(3, 4)
+        assert board.stride == 5
+        assert popcount(board.full_mask) == 12
+        assert len(board.cells) == 3
+        assert len(board.cells[0]) == 4
+        assert board.get_cell(3, 0) is None
+
+    def test_neighbor_counts_match_board(self):
+        """测试位并行计数与普通游戏板一致"""
+        board, bitboard = make_pair(13, 17, 50, 6, 8, seed=5)
+
+        assert bitboard.mine_positions == board.mine_positions
+        for row in range(board.rows):
+            for col in range(board.cols):
+                assert bitboard.get_cell(row, col).is_mine == board.get_cell(row, col).is_mine
+                assert bitboard.get_cell(row, col).neighbor_mines == board.get_cell(row, col).neighbor_mines
+                assert bitboard._count_neighbor_mines(row, col) == board._count_neighbor_mines(row, col)
+
+    def test_flood_reveal_matches_board(self):
+        """测试位运算展开与普通游戏板一致"""
+        board, bitboard = make_pair(20, 25, 60, 10, 12, seed=9)
+        board.cells[0][0].is_flagged = True
+        bitboard.cells[0][0].is_flagged = True
+
+        opened = bitboard.flood_reveal(10, 12)
+
+        assert sorted(opened) == sorted(board.flood_reveal(10, 12))
+        assert bitboard.get_revealed_count() == len(opened)
+        assert bitboard.flood_reveal(10, 12) == []
+
+    def test_set_operations(self):
+        """测试整盘集合运算和胜利判断"""
+        board = BitBoard(4, 4)
+        board.place_mines(3, 0, 0, safe_radius=1, seed=1)
+        assert popcount(board.unrevealed_safe_bits()) == 13
+        assert not board.is_cleared()
+
+        board.revealed_bits = board.unrevealed_safe_bits()
+        board.rebuild_indexes()
+        assert board.is_cleared()
+        assert board.get_revealed_count() == 13
+
+    def test_state_key(self):
+        """测试状态可哈希且能区分不同状态"""
+        board = BitBoard(5, 5)
+        board.place_mines(4, 2, 2, seed=3)
+        key = board.state_key()
+        assert {key: 1}[board.state_key()] == 1
+
+        board.cells[0][0].is_flagged = True
+        assert board.state_key() != key
+        assert board.get_flagged_count() == 1
+
+    def test_game_logic_with_bitboard(self):
+        """测试GameLogic使用位棋盘"""
+        game = GameLogic('hard', board_class=BitBoard, seed=2)
+        opened = game.reveal_cell(8, 8)
+        assert len(opened) >= 9
+
+        for row, col in sorted(game.board.mine_positions):
+            game.toggle_flag(row, col)
+        assert game.get_mines_left() == 0
+
+        for row in range(game.board.rows):
+            for col in range(game.board.cols):
+                game.reveal_cell(row, col)
+        game._check_game_end()
+        assert game.game_state == GameState.WON
+        assert game.board.is_cleared()
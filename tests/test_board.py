@@ -7,11 +7,14 @@
 import pytest
 import sys
 import os
+import random
+
+import numpy as np
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from game.board import Board, Cell
+from game.board import Board, Cell, count_neighbor_mines, sample_mine_indices
 
 
 class TestCell:
@@ -109,6 +112,23 @@ class TestBoard:
         cell_0_2 = board.get_cell(0, 2)
         assert cell_0_2.neighbor_mines == 1  # 只有(0,1)是邻居地雷
 
+    def test_vectorized_neighbor_count_matches_loop(self):
+        """测试向量化计数与逐格计数结果一致"""
+        board = Board(7, 9)
+        board.place_mines(20, 3, 3)
+
+        counts = count_neighbor_mines(
+            np.array([[cell.is_mine for cell in row] for row in board.cells])
+        )
+        for row in range(board.rows):
+            for col in range(board.cols):
+                cell = board.get_cell(row, col)
+                if cell.is_mine:
+                    assert counts[row, col] == 0
+                else:
+                    assert cell.neighbor_mines == board._count_neighbor_mines(row, col)
+                    assert counts[row, col] == cell.neighbor_mines
+
     def test_get_neighbors(self):
         """测试获取邻居格子"""
         board = Board(5, 5)
@@ -199,4 +219,181 @@ class TestBoard:
             for col in range(board.cols):
                 if board.cells[row][col].is_mine:
                     mine_count += 1
-        assert mine_count == 24
\ No newline at end of file
+        assert mine_count == 24
+
+    def test_place_mines_safe_zone(self):
+        """测试首次点击3x3安全区"""
+        board = Board(5, 5)
+        board.place_mines(16, 0, 0, safe_radius=1)
+
+        for row, col in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            assert not board.get_cell(row, col).is_mine
+        assert board.get_cell(0, 0).neighbor_mines == 0
+
+        board = Board(5, 5)
+        board.place_mines(16, 2, 2, safe_radius=1)
+        for row, col in board.get_neighbors(2, 2):
+            assert not board.get_cell(row, col).is_mine
+
+    def test_place_mines_custom_exclusion(self):
+        """测试自定义排除位置"""
+        board = Board(4, 4)
+        excluded = [(0, 3), (3, 0), (3, 3)]
+        board.place_mines(12, 0, 0, excluded=excluded)
+
+        for row, col in excluded + [(0, 0)]:
+            assert not board.get_cell(row, col).is_mine
+        assert sum(cell.is_mine for row in board.cells for cell in row) == 12
+
+    def test_place_mines_too_many(self):
+        """测试地雷数超过可用格子时报错"""
+        board = Board(3, 3)
+        with pytest.raises(ValueError):
+            board.place_mines(1, 1, 1, safe_radius=1)
+
+    def test_place_mines_seed(self):
+        """测试相同种子布局相同"""
+        board_a = Board(16, 16)
+        board_b = Board(16, 16)
+        board_a.place_mines(40, 3, 3, seed=1234)
+        board_b.place_mines(40, 3, 3, seed=1234)
+
+        layout_a = [cell.is_mine for row in board_a.cells for cell in row]
+        layout_b = [cell.is_mine for row in board_b.cells for cell in row]
+        assert layout_a == layout_b
+        assert board_a.seed == 1234
+
+        board_c = Board(16, 16)
+        board_c.place_mines(40, 3, 3)
+        assert board_c.seed is not None
+
+    def test_load_mines(self):
+        """测试按一维索引直接布置地雷"""
+        board = Board(4, 5)
+        board.load_mines([0, 7, 19])
+        assert board.total_mines == 3
+        assert board.seed is None
+        assert sorted(board.mine_positions) == [(0, 0), (1, 2), (3, 4)]
+        assert board.get_cell(0, 1).neighbor_mines == 2
+        assert board.get_cell(2, 0).neighbor_mines == 0
+
+    def test_sample_mine_indices(self):
+        """测试抽样结果避开排除集合且不重复"""
+        rng = random.Random(0)
+        excluded = {0, 5, 6, 7, 99}
+        for total_mines in (0, 1, 50, 95):
+            indices = sample_mine_indices(100, total_mines, excluded, rng)
+            assert len(indices) == total_mines
+            assert len(set(indices)) == total_mines
+            assert not excluded & set(indices)
+            assert all(0 <= index < 100 for index in indices)
+
+    def test_incremental_indexes(self):
+        """测试格子变化时增量维护计数器和位置索引"""
+        board = Board(6, 6)
+        board.place_mines(5, 0, 0)
+        assert len(board.mine_positions) == 5
+        for row, col in board.mine_positions:
+            assert board.get_cell(row, col).is_mine
+
+        board.cells[1][1].is_revealed = True
+        board.cells[1][1].is_revealed = True  # 重复设置不重复计数
+        board.cells[2][3].is_flagged = True
+        assert board.get_revealed_count() == 1
+        assert board.flagged_positions == {(2, 3)}
+
+        board.cells[1][1].is_revealed = False
+        board.cells[2][3].is_flagged = False
+        assert board.get_revealed_count() == 0
+        assert board.get_flagged_count() == 0
+
+        board.reset()
+        assert not board.mine_positions
+
+    def test_rebuild_indexes(self):
+        """测试重建索引结果与增量维护一致"""
+        board = Board(5, 5)
+        board.place_mines(4, 2, 2)
+        board.cells[0][0].is_flagged = True
+        board.cells[2][2].is_revealed = True
+        expected = (board.revealed_count, set(board.mine_positions), set(board.flagged_positions))
+
+        board.rebuild_indexes()
+        assert (board.revealed_count, board.mine_positions, board.flagged_positions) == expected
+
+    def test_flood_reveal(self):
+        """测试非递归展开空白区域"""
+        board = Board(5, 5)
+        board.cells[4][4].is_mine = True
+        board._calculate_neighbor_mines()
+        board.cells[0][4].is_flagged = True
+
+        opened = board.flood_reveal(0, 0)
+
+        assert opened[0] == (0, 0)
+        assert len(opened) == len(set(opened)) == 23
+        assert board.get_revealed_count() == 23
+        assert not board.get_cell(4, 4).is_revealed
+        assert not board.get_cell(0, 4).is_revealed
+
+        # 再次展开不会重复揭开
+        assert board.flood_reveal(0, 0) == []
+
+    def test_flood_reveal_large_sparse_board(self):
+        """测试大面积空白区域不会超出递归深度"""
+        board = Board(300, 300)
+        board.cells[299][299].is_mine = True
+        board._calculate_neighbor_mines()
+
+        opened = board.flood_reveal(0, 0)
+        assert len(opened) == 300 * 300 - 1
+
+    def test_label_regions_and_3bv(self):
+        """测试空白区域标记和3BV计算"""
+        board = Board(1, 5)
+        board.cells[0][2].is_mine = True
+        board.total_mines = 1
+        board._calculate_neighbor_mines()
+        board._label_regions()
+
+        assert board.get_opening_count() == 2
+        assert sorted(board.regions[0]) == [0, 1]
+        assert sorted(board.regions[1]) == [3, 4]
+        assert board.get_3bv() == 2
+
+        board = Board(3, 3)
+        board.cells[1][1].is_mine = True
+        board.total_mines = 1
+        board._calculate_neighbor_mines()
+        board._label_regions()
+
+        assert board.get_opening_count() == 0
+        assert board.get_3bv() == 8
+
+    def test_precomputed_region_matches_flood(self):
+        """测试预计算区域与逐格展开结果一致"""
+        board = Board(30, 30)
+        board.place_mines(90, 10, 10, safe_radius=1, seed=11)
+        assert board.regions is not None
+
+        opened = board.flood_reveal(10, 10)
+        assert sorted(opened) == sorted(divmod(i, 30) for i in board.regions[board.region_of[310]])
+
+        # 清除预计算结果后按广度优先遍历展开，结果相同
+        reference = Board(30, 30)
+        reference.place_mines(90, 10, 10, safe_radius=1, seed=11)
+        reference.region_of = None
+        reference.regions = None
+        assert sorted(reference.flood_reveal(10, 10)) == sorted(opened)
+
+    def test_flagged_cell_blocks_precomputed_region(self):
+        """测试区域内插旗的空白格子会阻断展开"""
+        board = Board(1, 6)
+        board.cells[0][5].is_mine = True
+        board.total_mines = 1
+        board._calculate_neighbor_mines()
+        board._label_regions()
+        board.cells[0][2].is_flagged = True
+
+        assert board.flood_reveal(0, 0) == [(0, 0), (0, 1)]
+        assert not board.get_cell(0, 3).is_revealed
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+分块游戏板测试
+测试ChunkedBoard类的功能
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.board import Board
+from game.chunked_board import ChunkedBoard
+from game.game_logic import GameLogic, GameState
+
+
+class TestChunkedBoard:
+    """测试ChunkedBoard类"""
+
+    def test_lazy_creation(self):
+        """测试创建超大游戏板不分配区块"""
+        board = ChunkedBoard(1000000, 1000000, tile_size=16)
+        assert board.get_total_cells() == 10 ** 12
+        assert board.get_generated_tile_count() == 0
+        assert len(board.cells) == 1000000
+
+        board.place_mines(10 ** 11, 500000, 500000, safe_radius=1, seed=3)
+        assert board.get_generated_tile_count() == 0
+
+        cell = board.get_cell(123456, 654321)
+        cell.is_flagged = True
+        assert board.get_generated_tile_count() == 1
+        assert board.get_flagged_count() == 1
+
+    def test_tile_mine_counts_sum_to_total(self):
+        """测试各区块地雷数之和等于总地雷数"""
+        board = ChunkedBoard(37, 53, tile_size=8)
+        board.place_mines(400, 0, 0, seed=1)
+
+        tile_rows = (37 + 7) // 8
+        tile_cols = (53 + 7) // 8
+        counts = [board._tile_mine_count(tr, tc) for tr in range(tile_rows) for tc in range(tile_cols)]
+        assert sum(counts) == 400
+
+        # 生成全部区块后地雷数量精确
+        for row in range(board.rows):
+            for col in range(board.cols):
+                board.get_cell(row, col).is_mine
+        assert len(board.mine_positions) == 400
+
+    def test_deterministic_generation(self):
+        """测试区块生成与访问顺序无关"""
+        board_a = ChunkedBoard(64, 64, tile_size=16)
+        board_b = ChunkedBoard(64, 64, tile_size=16)
+        board_a.place_mines(500, 10, 10, safe_radius=1, seed=42)
+        board_b.place_mines(500, 10, 10, safe_radius=1, seed=42)
+
+        a = [board_a.get_cell(row, col).is_mine for row in range(64) for col in range(64)]
+        b = [board_b.get_cell(row, col).is_mine
+             for row in reversed(range(64)) for col in reversed(range(64))]
+        assert a == list(reversed(b))
+
+        for row, col in board_a.get_neighbors(10, 10) + [(10, 10)]:
+            assert not board_a.get_cell(row, col).is_mine
+
+    def test_neighbor_counts_across_tiles(self):
+        """测试跨区块的周围地雷计数"""
+        board = ChunkedBoard(40, 40, tile_size=8)
+        board.place_mines(200, 20, 20, seed=7)
+
+        reference = Board(40, 40)
+        for row in range(40):
+            for col in range(40):
+                reference.cells[row][col].is_mine = board.get_cell(row, col).is_mine
+        reference._calculate_neighbor_mines()
+
+        for row in range(40):
+            for col in range(40):
+                assert board.get_cell(row, col).neighbor_mines == reference.get_cell(row, col).neighbor_mines
+
+    def test_flood_reveal_touches_only_explored_tiles(self):
+        """测试展开只生成被访问到的区块"""
+        board = ChunkedBoard(10000, 10000, tile_size=32)
+        board.place_mines(15000000, 5000, 5000, safe_radius=1, seed=5)
+
+        opened = board.flood_reveal(5000, 5000)
+        assert len(opened) >= 9
+        assert board.get_revealed_count() == len(opened)
+        # 计算边缘格子的计数会生成相邻区块的地雷，但总量只与展开区域有关
+        assert board.get_generated_tile_count() <= 25
+
+    def test_game_logic_with_chunked_board(self):
+        """测试GameLogic使用分块游戏板"""
+        game = GameLogic('hard', board_class=ChunkedBoard, seed=4)
+        opened = game.reveal_cell(3, 3)
+        assert len(opened) >= 9
+
+        for row in range(game.board.rows):
+            for col in range(game.board.cols):
+                if not game.board.get_cell(row, col).is_mine:
+                    game.reveal_cell(row, col)
+        game._check_game_end()
+        assert game.game_state == GameState.WON
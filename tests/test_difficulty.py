@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+自定义难度测试
+测试难度配置的校验、配置文件和命令行读取，以及大型游戏板上点击路径的复杂度
+"""
+
+import argparse
+import json
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.difficulty import (CUSTOM_DIFFICULTY, DEFAULT_TIME, MAX_CELLS, add_difficulty_arguments,
+                             difficulties_from_args, difficulty_from_args, load_difficulties,
+                             make_difficulty, parse_difficulties)
+from game.game_logic import GameLogic, GameState
+
+
+class NoScanSet(set):
+    """遍历时报错的集合，用来确认某段代码没有逐个扫描地雷或旗子"""
+
+    def __iter__(self):
+        raise AssertionError("不应遍历整个集合")
+
+
+class TestDifficultyConfig:
+    """测试难度配置"""
+
+    def test_make_difficulty(self):
+        """测试校验并补全默认时限"""
+        assert make_difficulty(30, 16, 99, 999) == {'rows': 30, 'cols': 16, 'mines': 99, 'time': 999}
+        assert make_difficulty('5', 5, 1)['time'] == DEFAULT_TIME
+        for args in [(0, 5, 1), (5, 5, 0), (5, 5, 25), (5, 5, 3, 0), ('x', 5, 1),
+                     (MAX_CELLS + 1, 1, 1)]:
+            with pytest.raises(ValueError):
+                make_difficulty(*args)
+
+    def test_config_file(self, tmp_path):
+        """测试从JSON配置文件读取难度"""
+        path = tmp_path / 'difficulties.json'
+        path.write_text(json.dumps({'expert': {'rows': 16, 'cols': 30, 'mines': 99, 'time': 999},
+                                    'huge': {'rows': 2000, 'cols': 2000, 'mines': 600000}}),
+                        encoding='utf-8')
+        difficulties = load_difficulties(str(path))
+        assert difficulties['expert']['mines'] == 99
+        assert difficulties['huge']['time'] == DEFAULT_TIME
+
+        with pytest.raises(ValueError, match='expert'):
+            parse_difficulties({'expert': {'rows': 16, 'cols': 30, 'mines': 99, 'size': 1}})
+        with pytest.raises(ValueError):
+            parse_difficulties([1, 2])
+
+    def test_command_line(self, tmp_path):
+        """测试命令行参数"""
+        parser = argparse.ArgumentParser()
+        add_difficulty_arguments(parser)
+        args = parser.parse_args(['--custom', '100', '200', '3000', '--time', '60'])
+        assert difficulty_from_args(args) == CUSTOM_DIFFICULTY
+        assert difficulties_from_args(args) == {
+            CUSTOM_DIFFICULTY: {'rows': 100, 'cols': 200, 'mines': 3000, 'time': 60}}
+
+        path = tmp_path / 'difficulties.json'
+        path.write_text(json.dumps({'expert': {'rows': 16, 'cols': 30, 'mines': 99}}), encoding='utf-8')
+        args = parser.parse_args(['--config', str(path), '--difficulty', 'expert'])
+        assert difficulty_from_args(args) == 'expert'
+        assert set(difficulties_from_args(args)) == {'expert'}
+
+    def test_game_logic(self):
+        """测试GameLogic注册和切换自定义难度"""
+        game = GameLogic('expert', headless=True,
+                         difficulties={'expert': {'rows': 16, 'cols': 30, 'mines': 99, 'time': 999}})
+        assert (game.board.rows, game.board.cols) == (16, 30)
+        game.left_click(8, 15)
+        assert game.board.total_mines == 99
+
+        game.add_difficulty('tall', 50, 3, 20)
+        game.set_difficulty('tall')
+        assert (game.board.rows, game.board.cols) == (50, 3)
+        assert game.timer.duration == DEFAULT_TIME
+        with pytest.raises(ValueError):
+            game.add_difficulty('bad', 2, 2, 4)
+
+
+class TestLargeBoard:
+    """测试大型游戏板上点击路径的复杂度与游戏板大小无关"""
+
+    SIDE = 600
+
+    def make_game(self):
+        game = GameLogic('large', board_class=ArrayBoard, seed=0, headless=True,
+                         difficulties={'large': {'rows': self.SIDE, 'cols': self.SIDE,
+                                                 'mines': self.SIDE * self.SIDE * 15 // 100}})
+        game.left_click(self.SIDE // 2, self.SIDE // 2)
+        return game
+
+    def test_click_path_does_not_scan(self):
+        """测试首次点击之后的揭开、插旗、双键、撤销、胜负检查和界面计数都不逐个扫描地雷或旗子"""
+        game = self.make_game()
+        board = game.board
+        # 区域内旗子数的缓存首次使用时建立，之后增量维护
+        board._flagged_region_counts()
+        board.mine_positions = NoScanSet(board.mine_positions)
+        board.flagged_positions = NoScanSet(board.flagged_positions)
+
+        side = self.SIDE
+        numbers, blanks, hidden = [], [], []
+        for index in range(0, side * side, 97):
+            row, col = divmod(index, side)
+            cell = board.get_cell(row, col)
+            if cell.is_mine or cell.is_revealed:
+                continue
+            if cell.neighbor_mines:
+                numbers.append((row, col))
+            else:
+                blanks.append((row, col))
+        for row, col in numbers[:200] + blanks[:50]:
+            game.left_click(row, col)
+            game.get_mines_left()
+            game.get_timer().get_formatted_time()
+        assert game.get_game_state() == GameState.PLAYING
+
+        for row, col in numbers[:200]:
+            for r, c in board.get_neighbors(row, col):
+                if board.get_cell(r, c).is_mine and not board.get_cell(r, c).is_flagged:
+                    game.toggle_flag(r, c)
+            game.chord(row, col)
+        for _ in range(20):
+            assert game.undo()
+        for _ in range(20):
+            assert game.redo()
+        assert game.get_game_state() == GameState.PLAYING
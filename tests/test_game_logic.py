@@ -11,7 +11,8 @@ import os
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from game.game_logic import GameLogic, GameState
+from game.game_logic import (ACTION_CHORD, GameLogic, GameState, SOURCE_ACTION, SOURCE_REDO, SOURCE_RESET,
+                             SOURCE_TIMEOUT, SOURCE_UNDO)
 from game.board import Cell
 
 
@@ -48,6 +49,18 @@ class TestGameLogic:
         assert config['mines'] == 40
         assert config['time'] == 600
 
+    def test_set_difficulty_resizes_board(self):
+        """测试切换难度后游戏板尺寸随之改变"""
+        game = GameLogic('easy')
+        game.set_difficulty('hard')
+        assert (game.board.rows, game.board.cols) == (16, 16)
+        game.left_click(15, 15)
+        assert game.board.total_mines == 40
+
+        game.set_difficulty('easy')
+        assert (game.board.rows, game.board.cols) == (10, 10)
+        assert game.board.total_mines == 0
+
     def test_new_game(self):
         """测试新游戏"""
         game = GameLogic('easy')
@@ -98,6 +111,20 @@ class TestGameLogic:
         clicked_cell = game.board.get_cell(5, 5)
         assert not clicked_cell.is_mine
 
+        # 周围3x3区域也不会有地雷
+        for row, col in game.board.get_neighbors(5, 5):
+            assert not game.board.get_cell(row, col).is_mine
+        assert clicked_cell.neighbor_mines == 0
+
+    def test_seeded_game_is_reproducible(self):
+        """测试相同种子的对局布局相同"""
+        layouts = []
+        for _ in range(2):
+            game = GameLogic('hard', seed=42)
+            game.reveal_cell(8, 8)
+            layouts.append([cell.is_mine for row in game.board.cells for cell in row])
+        assert layouts[0] == layouts[1]
+
     def test_reveal_cell(self):
         """测试揭开格子"""
         game = GameLogic('easy')
@@ -209,6 +236,21 @@ class TestGameLogic:
             # 具体验证取决于地雷的随机分布
             pass
 
+    def test_reveal_cell_opens_region(self):
+        """测试首次点击展开安全区所在的整片区域"""
+        game = GameLogic('hard', seed=3)
+        opened = game.reveal_cell(8, 8)
+
+        # 3x3安全区保证首次点击是空格子，至少揭开周围9个格子
+        assert len(opened) >= 9
+        assert (8, 8) in opened
+        assert game.board.get_revealed_count() == len(opened)
+        for row, col in opened:
+            assert not game.board.get_cell(row, col).is_mine
+
+        # 已揭开格子再次点击无效
+        assert game.reveal_cell(8, 8) == []
+
     def test_reveal_all_mines_on_game_over(self):
         """测试游戏结束时显示所有地雷"""
         game = GameLogic('easy')
@@ -240,4 +282,150 @@ class TestGameLogic:
         # 游戏结束
         game.game_over(True)
 
-        assert not game.timer.is_running
\ No newline at end of file
+        assert not game.timer.is_running
+
+
+class TestChangeSet:
+    """测试动作发布的变化集合"""
+
+    def subscribe(self, game):
+        changes = []
+        game.subscribe(changes.append)
+        return changes
+
+    def test_reveal_and_flag(self):
+        """测试揭开和插旗发布改变的格子"""
+        game = GameLogic('hard', seed=1, headless=True)
+        changes = self.subscribe(game)
+        opened = game.left_click(8, 8)
+        assert len(changes) == 1
+        first = changes[0]
+        assert (first.source, first.kind, first.position) == (SOURCE_ACTION, 'reveal', (8, 8))
+        assert sorted(first.positions(first.revealed)) == sorted(opened)
+        assert first.layout_changed
+        assert (first.state_before, first.state_after) == (GameState.READY, GameState.PLAYING)
+
+        row, col = next((r, c) for r in range(16) for c in range(16)
+                        if not game.board.get_cell(r, c).is_revealed)
+        game.right_click(row, col)
+        game.right_click(row, col)
+        assert list(changes[1].flagged) == [row * 16 + col] and not changes[1].unflagged
+        assert list(changes[2].unflagged) == [row * 16 + col] and not changes[2].flagged
+        assert not changes[2].state_changed and not changes[2].layout_changed
+
+        # 没有改变任何东西的动作不发布
+        game.left_click(8, 8)
+        assert len(changes) == 3
+
+    def test_loss_includes_all_mines(self):
+        """测试踩雷发布失败和全部地雷"""
+        game = GameLogic('easy', seed=2, headless=True)
+        game.left_click(5, 5)
+        changes = self.subscribe(game)
+        mine = next(iter(game.board.mine_positions))
+        game.left_click(*mine)
+        assert len(changes) == 1 and changes[0].lost and not changes[0].won
+        assert sorted(changes[0].positions(changes[0].revealed)) == sorted(game.board.mine_positions)
+
+    def test_undo_redo(self):
+        """测试撤销、重做发布相反和相同的变化"""
+        game = GameLogic('easy', seed=3, headless=True)
+        changes = self.subscribe(game)
+        game.left_click(5, 5)
+        game.undo()
+        game.redo()
+        action, undo, redo = changes
+        assert undo.source == SOURCE_UNDO and redo.source == SOURCE_REDO
+        assert list(undo.hidden) == list(action.revealed) and not undo.revealed
+        assert list(redo.revealed) == list(action.revealed)
+        assert undo.layout_changed and redo.layout_changed
+        assert (undo.state_before, undo.state_after) == (GameState.PLAYING, GameState.READY)
+        assert undo.kind == redo.kind == 'reveal' and undo.index == 55
+
+    def test_timeout_and_reset(self):
+        """测试时间到和开始新游戏也发布变化"""
+        game = GameLogic('easy', seed=4, headless=True)
+        game.left_click(5, 5)
+        changes = self.subscribe(game)
+        game._on_time_up()
+        assert changes[-1].source == SOURCE_TIMEOUT and changes[-1].lost
+        assert changes[-1].kind is None and changes[-1].position is None
+        assert game.history.undo_stack[-1].kind is None
+        game.new_game()
+        assert changes[-1].source == SOURCE_RESET and changes[-1].layout_changed
+
+        game.unsubscribe(changes.append)
+        game.left_click(5, 5)
+        assert changes[-1].source == SOURCE_RESET
+
+
+class CountingSound:
+    """记录播放次数的音效后端"""
+
+    def __init__(self):
+        self.played = []
+
+    def play_sound(self, name):
+        self.played.append(name)
+
+
+# 地雷在 (0,0)，第4行和第4列的前5格是一圈地雷，把左上角4x4的区域与其余部分隔开
+WALLED_MINES = [0, 4, 14, 24, 34, 40, 41, 42, 43, 44]
+
+
+def chord_game():
+    """10x10游戏板，按 WALLED_MINES 布雷后从右下角揭开，再揭开左上角区域的 (1,1)"""
+    game = GameLogic('easy', headless=True, sound_manager=CountingSound(),
+                     layout_provider=lambda rows, cols, count, row, col: WALLED_MINES)
+    game.left_click(9, 9)
+    game.left_click(1, 1)
+    return game
+
+
+class TestChord:
+    """测试双键"""
+
+    def test_chord_opens_neighbors_as_one_action(self):
+        """测试旗子数等于数字时揭开全部邻居及连带的空白区域，只检查一次结束、只播放一次音效"""
+        game = chord_game()
+        board = game.board
+        assert board.get_cell(1, 1).neighbor_mines == 1
+        game.toggle_flag(0, 0)
+        sounds = game.sound_manager.played
+        sounds.clear()
+        changes = []
+        game.subscribe(changes.append)
+        undo_depth = len(game.history)
+
+        opened = game.chord(1, 1)
+        region = {(row, col) for row in range(4) for col in range(4)} - {(0, 0), (1, 1)}
+        assert sorted(opened) == sorted(region)
+        assert game.get_game_state() == GameState.WON
+        assert sounds == ['click', 'win']
+        assert len(changes) == 1 and changes[0].kind == ACTION_CHORD and changes[0].won
+        assert sorted(changes[0].positions(changes[0].revealed)) == sorted(opened)
+        assert len(game.history) == undo_depth + 1
+
+        assert game.undo()
+        assert game.get_game_state() == GameState.PLAYING
+        assert not any(board.get_cell(row, col).is_revealed for row, col in opened)
+
+    def test_chord_requires_matching_flags(self):
+        """测试旗子数不等于数字、未揭开或空白格子时不执行"""
+        game = chord_game()
+        assert game.chord(1, 1) == []
+        assert game.chord(0, 1) == []
+        assert game.chord(9, 9) == []
+        game.toggle_flag(0, 0)
+        game.toggle_flag(0, 1)
+        assert game.chord(1, 1) == []
+
+    def test_chord_with_wrong_flag_loses(self):
+        """测试旗子插错时双键踩雷，游戏结束"""
+        game = chord_game()
+        game.toggle_flag(0, 1)
+        game.sound_manager.played.clear()
+        opened = game.chord(1, 1)
+        assert (0, 0) in opened
+        assert game.get_game_state() == GameState.LOST
+        assert game.sound_manager.played == ['mine', 'game_over']
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+无猜测生成测试
+测试布局生成、可解性判断、磁盘布局池以及GameLogic的布局提供者接口
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.board import Board
+from game.game_logic import GameLogic, GameState
+from game.generator import (LayoutPool, PoolLayoutProvider, canonical_positions, fill_pool,
+                            generate_layout, is_no_guess, main)
+from game.solver import Solver
+
+
+class TestGenerator:
+    """测试无猜测布局生成"""
+
+    def test_generated_layout_is_solvable(self):
+        """测试生成的布局只靠确定性推理即可解开，且首次点击周围没有地雷"""
+        for seed in range(10):
+            layout = generate_layout(16, 16, 40, 5, 7, seed=seed)
+            assert len(set(layout)) == 40
+            assert is_no_guess(16, 16, layout, 5, 7)
+            for row in range(4, 7):
+                for col in range(6, 9):
+                    assert row * 16 + col not in layout
+
+    def test_solver_replay(self):
+        """测试独立用求解器逐步揭开生成的布局不会踩雷"""
+        layout = generate_layout(10, 10, 10, 0, 0, seed=3)
+        board = Board(10, 10)
+        board.load_mines(layout)
+        solver = Solver(board)
+        solver.notify_revealed(board.flood_reveal(0, 0))
+        while board.get_revealed_count() < 90:
+            safe, _ = solver.find_certain()
+            if not safe:
+                safe = [divmod(i, 10) for i in range(100)
+                        if i not in solver.numbers and i not in solver.mines]
+            for row, col in safe:
+                assert not board.get_cell(row, col).is_mine
+                solver.notify_revealed(board.flood_reveal(row, col))
+
+    def test_fifty_fifty_rejected(self):
+        """测试必须猜测的布局判定为不可解"""
+        # 最右一列两个格子只有一个是雷，它们的邻居数字完全相同，无法区分
+        assert not is_no_guess(2, 5, [4], 0, 0)
+        # 三行时中间行的数字可以区分
+        assert is_no_guess(3, 5, [4], 2, 0)
+
+    def test_exhausted_attempts(self):
+        """测试无法生成时抛出异常"""
+        # 两行的游戏板上下对称，只有一个雷时总是需要猜测
+        with pytest.raises(RuntimeError):
+            generate_layout(2, 5, 1, 0, 0, seed=1, max_attempts=20)
+
+
+class TestLayoutPool:
+    """测试磁盘布局池"""
+
+    def test_add_and_take(self, tmp_path):
+        """测试布局写入后按后进先出取出并截断文件"""
+        pool = LayoutPool(str(tmp_path))
+        pool.add(10, 10, 10, 4, 4, [[1, 2, 3], [97, 98, 99]])
+        assert pool.count(10, 10, 10, 4, 4) == 2
+        assert pool.take(10, 10, 10, 4, 4) == [97, 98, 99]
+        assert pool.take(10, 10, 10, 4, 4) == [1, 2, 3]
+        assert pool.take(10, 10, 10, 4, 4) is None
+        assert pool.count(10, 10, 10, 4, 4) == 0
+
+    def test_symmetric_position(self, tmp_path):
+        """测试对称位置的布局经过变换后可用"""
+        pool = LayoutPool(str(tmp_path))
+        layout = generate_layout(10, 10, 10, 1, 2, seed=0)
+        pool.add(10, 10, 10, 1, 2, [layout])
+        assert pool.available(10, 10, 10, 7, 8) == 1
+        mirrored = pool.take(10, 10, 10, 7, 8)
+        assert mirrored is not None and len(mirrored) == 10
+        assert is_no_guess(10, 10, mirrored, 7, 8)
+        assert pool.available(10, 10, 10, 1, 2) == 0
+
+    def test_canonical_positions(self):
+        """测试互不等价的首次点击位置数"""
+        assert len(canonical_positions(10, 10)) == 15
+        assert len(canonical_positions(4, 6)) == 6
+
+    def test_fill_pool(self, tmp_path):
+        """测试补足布局池"""
+        pool = LayoutPool(str(tmp_path))
+        added = fill_pool(pool, 10, 10, 10, positions=[(0, 0), (4, 4)], count=3, workers=1, seed=1)
+        assert added == 6
+        assert fill_pool(pool, 10, 10, 10, positions=[(0, 0)], count=3, workers=1) == 0
+        assert is_no_guess(10, 10, pool.take(10, 10, 10, 4, 4), 4, 4)
+
+    def test_fill_pool_processes(self, tmp_path):
+        """测试用进程池生成布局"""
+        pool = LayoutPool(str(tmp_path))
+        assert fill_pool(pool, 10, 10, 10, positions=[(2, 3)], count=4, workers=2,
+                         seed=2, batch_size=2) == 4
+        assert pool.count(10, 10, 10, 2, 3) == 4
+
+    def test_cli_custom_difficulty(self, tmp_path, capsys):
+        """测试命令行可以为自定义难度填充布局池"""
+        main(['--custom', '6', '7', '5', '--position', '0', '0', '--count', '2',
+              '--pool', str(tmp_path), '--workers', '1', '--seed', '3'])
+        assert LayoutPool(str(tmp_path)).count(6, 7, 5, 0, 0) == 2
+        with pytest.raises(SystemExit):
+            main(['--difficulty', 'expert', '--pool', str(tmp_path)])
+        assert '未知难度' in capsys.readouterr().err
+
+
+class TestLayoutProvider:
+    """测试GameLogic的布局提供者接口"""
+
+    def test_first_click_uses_provider(self, tmp_path):
+        """测试首次点击时使用池中的布局"""
+        pool = LayoutPool(str(tmp_path))
+        layout = generate_layout(10, 10, 10, 3, 3, seed=5)
+        pool.add(10, 10, 10, 3, 3, [layout])
+        game = GameLogic('easy', headless=True,
+                         layout_provider=PoolLayoutProvider(pool, generate_missing=False))
+        game.left_click(3, 3)
+        assert sorted(r * 10 + c for r, c in game.board.mine_positions) == sorted(layout)
+        assert game.get_game_state() in (GameState.PLAYING, GameState.WON)
+        assert pool.count(10, 10, 10, 3, 3) == 0
+
+    def test_empty_pool_falls_back(self, tmp_path):
+        """测试池为空且不当场生成时退回随机布雷"""
+        provider = PoolLayoutProvider(LayoutPool(str(tmp_path)), generate_missing=False)
+        game = GameLogic('easy', seed=1, headless=True, layout_provider=provider)
+        game.left_click(5, 5)
+        assert game.board.total_mines == 10
+        assert not game.board.get_cell(5, 5).is_mine
+
+    def test_generate_missing(self, tmp_path):
+        """测试池为空时当场生成无猜测布局"""
+        provider = PoolLayoutProvider(LayoutPool(str(tmp_path)), seed=4)
+        game = GameLogic('hard', headless=True, layout_provider=provider)
+        game.left_click(8, 8)
+        layout = [r * 16 + c for r, c in game.board.mine_positions]
+        assert is_no_guess(16, 16, layout, 8, 8)
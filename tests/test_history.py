@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+撤销/重做测试
+测试GameLogic的增量撤销记录在各游戏板后端上的正确性
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.bitboard import BitBoard
+from game.board import Board
+from game.chunked_board import ChunkedBoard
+from game.game_logic import GameLogic, GameState
+from game.history import ActionDelta, ActionHistory
+from game.mmap_board import MmapBoard
+
+BOARD_CLASSES = [Board, ArrayBoard, BitBoard, ChunkedBoard, MmapBoard]
+
+
+def full_state(game):
+    """对局的完整可见状态"""
+    board = game.board
+    cells = [(cell.is_mine, cell.is_revealed, cell.is_flagged)
+             for row in range(board.rows) for cell in (board.get_cell(row, col) for col in range(board.cols))]
+    return (cells, board.get_revealed_count(), sorted(board.flagged_positions), board.total_mines,
+            game.game_state, game.first_click, game.timer.is_running)
+
+
+def random_actions(game, rng, count):
+    """执行随机的揭开和插旗动作，返回每步之后的状态"""
+    states = [full_state(game)]
+    board = game.board
+    for _ in range(count):
+        if game.get_game_state() in (GameState.WON, GameState.LOST):
+            break
+        row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+        cell = board.get_cell(row, col)
+        if cell.is_revealed:
+            continue
+        if rng.random() < 0.2 and not game.is_first_click():
+            game.toggle_flag(row, col)
+        elif not cell.is_flagged:
+            game.left_click(row, col)
+        else:
+            continue
+        states.append(full_state(game))
+    return states
+
+
+class TestActionHistory:
+    """测试ActionHistory类"""
+
+    def test_stacks(self):
+        """测试撤销栈、重做栈和步数上限"""
+        history = ActionHistory(limit=2)
+        deltas = []
+        for i in range(3):
+            delta = ActionDelta(GameState.PLAYING, False, True)
+            delta.revealed.append(i)
+            history.record(delta)
+            deltas.append(delta)
+        assert len(history) == 2
+        assert history.pop_undo() is deltas[2]
+        assert history.pop_redo() is deltas[2]
+        history.pop_undo()
+        history.record(deltas[0])
+        assert not history.redo_stack
+        # 没有改变任何东西的动作不记录
+        history.record(ActionDelta(GameState.PLAYING, False, True))
+        assert len(history) == 2
+
+
+class TestUndoRedo:
+    """测试GameLogic的撤销与重做"""
+
+    @pytest.mark.parametrize('board_class', BOARD_CLASSES)
+    def test_undo_all_then_redo_all(self, board_class):
+        """测试逐步撤销回到每一步的状态，再逐步重做回到最终状态"""
+        for seed in range(3):
+            game = GameLogic('hard', seed=seed, board_class=board_class, headless=True)
+            game.toggle_flag(0, 0)
+            states = random_actions(game, random.Random(seed), 40)
+            steps = len(game.history)
+            assert steps == len(states)
+
+            for expected in reversed(states[:-1]):
+                assert game.undo()
+                assert full_state(game) == expected
+            assert game.undo()
+            assert not game.undo()
+            assert game.board.flagged_positions == set()
+
+            assert game.redo()
+            for expected in states[1:]:
+                assert game.redo()
+                assert full_state(game) == expected
+            assert not game.redo()
+
+    def test_undo_first_click(self):
+        """测试撤销首次点击后回到未布雷状态，可以从别处重新开始"""
+        game = GameLogic('easy', seed=1, headless=True)
+        game.toggle_flag(9, 9)
+        game.left_click(0, 0)
+        assert game.undo()
+        assert game.is_first_click()
+        assert game.game_state == GameState.READY
+        assert game.board.total_mines == 0
+        assert game.board.get_revealed_count() == 0
+        assert game.board.get_cell(9, 9).is_flagged
+        assert not game.timer.is_running
+
+        game.left_click(5, 5)
+        assert not game.can_redo()
+        assert game.board.total_mines == 10
+
+    def test_undo_loss(self):
+        """测试撤销踩雷后继续游戏，计时器恢复运行"""
+        game = GameLogic('easy', seed=2, headless=True)
+        game.left_click(5, 5)
+        revealed = game.board.get_revealed_count()
+        mine = next(iter(game.board.mine_positions))
+        game.left_click(*mine)
+        assert game.game_state == GameState.LOST
+        assert not game.timer.is_running
+
+        assert game.undo()
+        assert game.game_state == GameState.PLAYING
+        assert game.timer.is_running
+        assert game.board.get_revealed_count() == revealed
+        assert not any(game.board.get_cell(row, col).is_revealed for row, col in game.board.mine_positions)
+
+        assert game.redo()
+        assert game.game_state == GameState.LOST
+        assert not game.timer.is_running
+
+    def test_undo_timeout(self):
+        """测试撤销时间到后隐藏显示出的地雷，计数与游戏板一致，之后仍可撤销之前的动作"""
+        game = GameLogic('easy', seed=3, headless=True)
+        game.left_click(5, 5)
+        revealed = game.board.get_revealed_count()
+        game._on_time_up()
+        assert game.game_state == GameState.LOST
+
+        assert game.undo()
+        board = game.board
+        assert game.game_state == GameState.PLAYING
+        assert not any(board.get_cell(row, col).is_revealed for row, col in board.mine_positions)
+        actual = sum(board.get_cell(row, col).is_revealed
+                     for row in range(board.rows) for col in range(board.cols))
+        assert board.get_revealed_count() == actual == revealed
+
+        assert game.redo()
+        assert game.game_state == GameState.LOST
+        assert game.undo() and game.undo()
+        assert game.is_first_click() and board.get_revealed_count() == 0
+
+    def test_delta_size(self):
+        """测试增量只包含改变的格子"""
+        game = GameLogic('hard', seed=3, headless=True)
+        opened = game.left_click(8, 8)
+        delta = game.history.undo_stack[-1]
+        assert len(delta.revealed) == len(opened)
+        game.toggle_flag(0, 0) if not game.board.get_cell(0, 0).is_revealed else game.toggle_flag(15, 15)
+        assert game.history.undo_stack[-1].cell_count() == 1
+
+    def test_new_game_clears_history(self):
+        """测试新游戏清空撤销记录"""
+        game = GameLogic('easy', headless=True)
+        game.left_click(5, 5)
+        game.new_game()
+        assert not game.can_undo()
+        assert not game.undo()
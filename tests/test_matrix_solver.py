@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+矩阵推理测试
+测试批量高斯消元和MatrixSolver类
+"""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.board import Board
+from game.matrix_solver import MatrixSolver, forced_columns, reduce_batch
+from game.solver import Solver
+
+
+def make_board(layout, board_class=Board):
+    """按字符画创建游戏板，'*' 表示地雷"""
+    rows, cols = len(layout), len(layout[0])
+    board = board_class(rows, cols)
+    board._apply_mines(row * cols + col for row in range(rows) for col in range(cols)
+                       if layout[row][col] == '*')
+    board.total_mines = len(board.mine_positions)
+    board._calculate_neighbor_mines()
+    board._label_regions()
+    return board
+
+
+class TestReduceBatch:
+    """测试批量消元"""
+
+    def test_forced_cells(self):
+        """测试 1-2-1 约束消元后能确定全部变量"""
+        # x0 + x1 = 1, x0 + x1 + x2 = 2, x1 + x2 = 1
+        system = np.array([[[1, 1, 0, 1], [1, 1, 1, 2], [0, 1, 1, 1]]], dtype=float)
+        mines, safe = forced_columns(reduce_batch(system))
+        assert mines.tolist() == [[True, False, True]]
+        assert safe.tolist() == [[False, True, False]]
+
+    def test_batches_are_independent(self):
+        """测试同一批中的矩阵互不影响"""
+        system = np.array([
+            [[1, 1, 1], [0, 0, 0]],
+            [[1, 1, 2], [1, 0, 1]],
+        ], dtype=float)
+        mines, safe = forced_columns(reduce_batch(system))
+        assert mines.tolist() == [[False, False], [True, True]]
+        assert safe.tolist() == [[False, False], [False, False]]
+
+
+class TestMatrixSolver:
+    """测试MatrixSolver类"""
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard])
+    def test_pattern(self, board_class):
+        """测试靠边的 1-2-1 模式"""
+        board = make_board([
+            '*.*',
+            '...',
+        ], board_class)
+        for col in range(3):
+            board.flood_reveal(1, col)
+        safe, mines = MatrixSolver(board).find_certain()
+        assert mines == [(0, 0), (0, 2)]
+        assert safe == [(0, 1)]
+
+    def test_deductions_are_correct(self):
+        """测试推出的结果都正确，且覆盖规则求解器的绝大部分结论"""
+        found = 0
+        expected = 0
+        for seed in range(20):
+            board = ArrayBoard(16, 30)
+            board.place_mines(99, 8, 15, safe_radius=1, seed=seed)
+            solver = Solver(board)
+            solver.notify_revealed(board.flood_reveal(8, 15))
+            safe, mines = MatrixSolver(board).find_certain()
+            assert all(not board.get_cell(row, col).is_mine for row, col in safe)
+            assert all(board.get_cell(row, col).is_mine for row, col in mines)
+
+            rule_safe, rule_mines = solver.find_certain()
+            expected += len(rule_safe) + len(rule_mines)
+            found += len(set(rule_safe + rule_mines) & set(safe + mines))
+        assert found >= 0.95 * expected
+
+    def test_large_board(self):
+        """测试大游戏板上的批量推理"""
+        board = ArrayBoard(300, 300)
+        board.place_mines(14000, 150, 150, safe_radius=1, seed=3)
+        rng = np.random.default_rng(3)
+        for index in rng.choice(np.flatnonzero(~board.mines), 400, replace=False):
+            board.flood_reveal(*divmod(int(index), board.cols))
+
+        solver = MatrixSolver(board)
+        safe, mines = solver.find_certain()
+        grid = board.mines.reshape(board.rows, board.cols)
+        assert len(safe) > 100 and len(mines) > 100
+        assert not grid[tuple(np.array(safe).T)].any()
+        assert grid[tuple(np.array(mines).T)].all()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+内存映射游戏板测试
+测试MmapBoard类的功能
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.mmap_board import MmapBoard
+from game.array_board import ArrayBoard
+from game.game_logic import GameLogic
+
+
+class TestMmapBoard:
+    """测试MmapBoard类"""
+
+    def test_temporary_board(self):
+        """测试不指定路径时使用临时文件"""
+        board = MmapBoard(8, 9)
+        assert isinstance(board, ArrayBoard)
+        board.place_mines(10, 4, 4, safe_radius=1, seed=1)
+        assert len(board.mine_positions) == 10
+        assert board.flood_reveal(4, 4)
+        board.close()
+
+    def test_save_and_reopen(self, tmp_path):
+        """测试写入文件后重新打开状态不变"""
+        path = str(tmp_path / 'board.bin')
+        board = MmapBoard(50, 60, path=path)
+        board.place_mines(300, 25, 30, safe_radius=1, seed=77)
+        opened = board.flood_reveal(25, 30)
+        board.cells[0][0].is_flagged = True
+        board.close()
+
+        assert os.path.getsize(path) == 64 + 4 * 50 * 60
+
+        reopened = MmapBoard.open(path)
+        assert (reopened.rows, reopened.cols) == (50, 60)
+        assert reopened.total_mines == 300
+        assert reopened.seed == 77
+        assert reopened.get_revealed_count() == len(opened)
+        assert reopened.flagged_positions == {(0, 0)}
+        assert len(reopened.mine_positions) == 300
+        for row, col in opened:
+            assert reopened.get_cell(row, col).is_revealed
+
+        # 重新打开后继续修改会写回同一文件
+        reopened.cells[0][1].is_flagged = True
+        reopened.close()
+        assert MmapBoard.open(path).get_flagged_count() == 2
+
+    def test_reset_keeps_file(self, tmp_path):
+        """测试重置游戏板时复用映射文件"""
+        path = str(tmp_path / 'board.bin')
+        board = MmapBoard(10, 10, path=path)
+        board.place_mines(10, 5, 5, seed=3)
+        mines = board.mines
+        board.reset()
+
+        assert board.mines is mines
+        assert not board.mines.any()
+        board.close()
+        assert MmapBoard.open(path).total_mines == 0
+
+    def test_invalid_file(self, tmp_path):
+        """测试打开无效文件时报错"""
+        path = tmp_path / 'bad.bin'
+        path.write_bytes(b'\0' * 128)
+        with pytest.raises(ValueError):
+            MmapBoard.open(str(path))
+
+    def test_game_logic_with_mmap_board(self):
+        """测试GameLogic使用内存映射游戏板"""
+        game = GameLogic('hard', board_class=MmapBoard, seed=8)
+        assert len(game.reveal_cell(8, 8)) >= 9
+        assert game.get_mines_left() == 40
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+蒙特卡洛概率估计测试
+测试MonteCarloEstimator的估计精度、置信区间和预算控制
+"""
+
+import time
+import numpy as np
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.board import Board
+from game.monte_carlo import MonteCarloEstimator
+from game.probability import ProbabilityEngine
+from game.solver import Solver
+
+
+def opened_board(seed):
+    """布雷并点开中心的高级难度游戏板"""
+    board = Board(16, 30)
+    board.place_mines(99, 8, 15, safe_radius=1, seed=seed)
+    solver = Solver(board)
+    solver.notify_revealed(board.flood_reveal(8, 15))
+    return board, solver
+
+
+class TestMonteCarloEstimator:
+    """测试MonteCarloEstimator类"""
+
+    def test_close_to_exact(self):
+        """测试估计值接近精确概率，且置信区间包含估计值"""
+        board, solver = opened_board(7)
+        exact = ProbabilityEngine(board, solver).compute()
+        estimate = MonteCarloEstimator(board, solver, max_samples=3000, time_budget=None, seed=1).estimate()
+
+        assert estimate.samples >= 3000
+        for position, probability in exact.items():
+            assert estimate.probabilities[position] == pytest.approx(probability, abs=0.1)
+            lower, upper = estimate.bounds[position]
+            assert lower <= estimate.probabilities[position] <= upper
+
+    def test_interior_probability(self):
+        """测试边界外格子的概率与精确值一致"""
+        board, solver = opened_board(3)
+        engine = ProbabilityEngine(board, solver)
+        engine.compute()
+        estimate = MonteCarloEstimator(board, solver, max_samples=2000, time_budget=None, seed=2).estimate()
+        assert estimate.interior_probability == pytest.approx(engine.interior_probability, abs=0.02)
+
+    def test_no_frontier(self):
+        """测试没有边界时直接返回地雷密度"""
+        board = Board(4, 4)
+        board.place_mines(4, 0, 0, seed=1)
+        estimate = MonteCarloEstimator(board).estimate()
+        assert estimate.probabilities == {}
+        assert estimate.interior_probability == pytest.approx(0.25)
+
+    def test_time_budget(self):
+        """测试在时间预算内返回"""
+        board = ArrayBoard(200, 200)
+        board.place_mines(7000, 100, 100, safe_radius=1, seed=3)
+        rng = np.random.default_rng(3)
+        for index in rng.choice(np.flatnonzero(~board.mines), 150, replace=False):
+            board.flood_reveal(*divmod(int(index), board.cols))
+        solver = Solver(board)
+        solver.solve()
+
+        started = time.perf_counter()
+        estimate = MonteCarloEstimator(board, solver, max_samples=None, time_budget=0.3, seed=4).estimate()
+        assert time.perf_counter() - started < 3.0
+        assert len(estimate.probabilities) >= len(solver.frontier)
+        # 绝大多数格子在预算内得到了有效样本（没有样本的格子置信区间为 [0, 1]）
+        sampled = [upper - lower < 1.0 for lower, upper in estimate.bounds.values()]
+        assert sum(sampled) > 0.9 * len(sampled)
+
+    def test_multiple_processes(self):
+        """测试在多个进程中采样"""
+        board, solver = opened_board(5)
+        estimator = MonteCarloEstimator(board, solver, chains=16, max_samples=200, time_budget=5.0,
+                                        workers=2, seed=6)
+        estimate = estimator.estimate()
+        problem = estimator.build_problem()
+        assert estimate.samples >= 200
+        for index in problem.cells.tolist():
+            assert 0.0 <= estimate.probabilities[divmod(index, board.cols)] <= 1.0
+
+    def test_best_guess(self):
+        """测试最佳猜测是未揭开的格子"""
+        board, solver = opened_board(2)
+        row, col = MonteCarloEstimator(board, solver, time_budget=0.1, seed=0).best_guess()
+        assert not board.get_cell(row, col).is_revealed
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+邻居表测试
+测试NeighborTable类和邻居表缓存
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game import neighbors
+from game.neighbors import NeighborTable, get_neighbor_table
+from game.board import Board
+
+
+class TestNeighborTable:
+    """测试NeighborTable类"""
+
+    def test_neighbors_match_bounds_check(self):
+        """测试邻居表与逐个边界检查结果一致"""
+        rows, cols = 4, 7
+        table = NeighborTable(rows, cols)
+
+        for row in range(rows):
+            for col in range(cols):
+                expected = [
+                    (row + dr) * cols + col + dc
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                    if (dr or dc) and 0 <= row + dr < rows and 0 <= col + dc < cols
+                ]
+                assert list(table.neighbors(row * cols + col)) == expected
+
+    def test_single_row_board(self):
+        """测试单行游戏板"""
+        table = NeighborTable(1, 3)
+        assert list(table.neighbors(0)) == [1]
+        assert list(table.neighbors(1)) == [0, 2]
+
+    def test_table_is_shared_by_shape(self):
+        """测试同尺寸游戏板共享同一张邻居表"""
+        assert get_neighbor_table(9, 9) is get_neighbor_table(9, 9)
+        assert get_neighbor_table(9, 9) is not get_neighbor_table(9, 10)
+
+        board_a = Board(12, 13)
+        board_b = Board(12, 13)
+        assert board_a.neighbor_table is board_b.neighbor_table
+
+    def test_only_one_large_table_kept(self, monkeypatch):
+        """测试大尺寸的邻居表只保留最近用到的一张"""
+        monkeypatch.setattr(neighbors, 'LARGE_TABLE_CELLS', 50)
+        monkeypatch.setattr(neighbors, '_large_table', None)
+        large = get_neighbor_table(10, 10)
+        assert get_neighbor_table(10, 10) is large
+        other = get_neighbor_table(10, 11)
+        assert neighbors._large_table is other
+        assert get_neighbor_table(10, 10) is not large
+        assert get_neighbor_table(5, 5) is get_neighbor_table(5, 5)
+
+    def test_table_size(self):
+        """测试邻居表大小"""
+        table = NeighborTable(10, 10)
+        # 4个角各3个邻居，32个边各5个邻居，64个内部格子各8个邻居
+        assert len(table.indices) == 4 * 3 + 32 * 5 + 64 * 8
+        assert len(table.indptr) == 101
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+布局预取测试
+测试预先算好的布局载入以及后台预取线程
+"""
+
+import pytest
+import random
+import time
+import sys
+import os
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.bitboard import BitBoard
+from game.board import Board, prepare_layout, relocate_mines, sample_mine_indices
+from game.chunked_board import ChunkedBoard
+from game.game_logic import GameLogic, GameState
+from game.mmap_board import MmapBoard
+from game.prefetch import LayoutPrefetcher
+
+
+def board_state(board):
+    """游戏板的地雷和周围地雷数"""
+    return [(cell.is_mine, cell.neighbor_mines)
+            for row in range(board.rows) for cell in (board.get_cell(row, col) for col in range(board.cols))]
+
+
+class TestPreparedLayout:
+    """测试预先算好的布局"""
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard, BitBoard, MmapBoard])
+    def test_load_layout_matches_load_mines(self, board_class):
+        """测试载入算好的布局与直接布雷结果一致"""
+        indices = sample_mine_indices(12 * 15, 30, (), random.Random(3))
+        expected = board_class(12, 15)
+        expected.load_mines(indices)
+        board = board_class(12, 15)
+        board.load_layout(prepare_layout(12, 15, indices))
+
+        assert board_state(board) == board_state(expected)
+        assert board.total_mines == 30
+        assert board.get_3bv() == expected.get_3bv()
+        for row in range(12):
+            for col in range(15):
+                if not expected.get_cell(row, col).is_mine:
+                    assert board.flood_reveal(row, col) == expected.flood_reveal(row, col)
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_relocate_matches_prepare(self, seed):
+        """测试移走安全区内的地雷后，局部修补的结果与按新布局重新计算的一致"""
+        rng = random.Random(seed)
+        rows, cols, mines = 12, 15, rng.choice([20, 40, 90])
+        layout = prepare_layout(rows, cols, sample_mine_indices(rows * cols, mines, (), rng))
+        row, col = rng.randrange(rows), rng.randrange(cols)
+        excluded = [r * cols + c for r in range(row - 1, row + 2) for c in range(col - 1, col + 2)
+                    if 0 <= r < rows and 0 <= c < cols]
+        moved = relocate_mines(rows, cols, layout, excluded, rng)
+        assert len(moved.mines) == mines and not set(moved.mines) & set(excluded)
+
+        expected = Board(rows, cols)
+        expected.load_mines(moved.mines)
+        board = Board(rows, cols)
+        board.load_layout(moved)
+        assert board_state(board) == board_state(expected)
+        assert board.get_3bv() == expected.get_3bv()
+        assert board.get_opening_count() == expected.get_opening_count()
+        for index in range(rows * cols):
+            if index not in moved.mines:
+                assert sorted(board.flood_reveal(*divmod(index, cols))) == \
+                    sorted(expected.flood_reveal(*divmod(index, cols)))
+
+
+class TestLayoutPrefetcher:
+    """测试LayoutPrefetcher类"""
+
+    def test_take_compatible(self):
+        """测试取出的布局在安全区内没有地雷，安全区外放不下时不取"""
+        prefetcher = LayoutPrefetcher(capacity=4)
+        prefetcher.start(10, 10, 10, seed=1)
+        try:
+            assert prefetcher.wait_ready(4, timeout=10)
+            excluded = [0, 1, 10, 11]
+            layout = prefetcher.take(10, 10, 10, excluded)
+            assert layout is not None
+            assert len(layout.mines) == 10
+            assert not set(layout.mines) & set(excluded)
+            # 安全区外的格子不够放下全部地雷时不可能相容
+            assert prefetcher.take(10, 10, 10, range(95)) is None
+            assert prefetcher.ready_count() == 3
+            assert prefetcher.take(16, 16, 40, [0]) is None
+        finally:
+            prefetcher.stop()
+
+    def test_every_candidate_is_used(self):
+        """测试安全区内有地雷的候选也能用上，移走地雷后与重新计算的结果一致"""
+        prefetcher = LayoutPrefetcher(capacity=1)
+        prefetcher.start(10, 10, 60, seed=4)
+        try:
+            for center in (0, 11, 45, 99):
+                assert prefetcher.wait_ready(1, timeout=10)
+                row, col = divmod(center, 10)
+                excluded = [r * 10 + c for r in range(row - 1, row + 2) for c in range(col - 1, col + 2)
+                            if 0 <= r < 10 and 0 <= c < 10]
+                layout = prefetcher.take(10, 10, 60, excluded)
+                assert layout is not None
+                assert not set(layout.mines) & set(excluded)
+                expected = prepare_layout(10, 10, layout.mines)
+                assert layout.mines == expected.mines
+                assert np.array_equal(layout.counts, expected.counts)
+                assert layout.openings[2] == expected.openings[2]
+                assert len(layout.openings[1]) == len(expected.openings[1])
+        finally:
+            prefetcher.stop()
+
+    def test_restart_discards_old_spec(self):
+        """测试更换规格后只提供新规格的布局"""
+        prefetcher = LayoutPrefetcher(capacity=2)
+        prefetcher.start(10, 10, 10, seed=1)
+        try:
+            assert prefetcher.wait_ready(2, timeout=10)
+            prefetcher.start(16, 16, 40, seed=2)
+            assert prefetcher.take(10, 10, 10, [0]) is None
+            assert prefetcher.wait_ready(2, timeout=10)
+            layout = prefetcher.take(16, 16, 40, [])
+            assert layout is not None and len(layout.mines) == 40
+            assert layout.counts.shape == (256,)
+        finally:
+            prefetcher.stop()
+
+    def test_large_boards_keep_fewer_candidates(self):
+        """测试候选布局的格子总数受 max_cells 限制，但至少保留一份"""
+        prefetcher = LayoutPrefetcher(capacity=8, max_cells=300)
+        prefetcher.start(16, 16, 40, seed=3)
+        try:
+            assert prefetcher.wait_ready(8, timeout=10)
+            time.sleep(0.05)
+            assert prefetcher.ready_count() == 1
+        finally:
+            prefetcher.stop()
+
+
+class TestGamePrefetch:
+    """测试GameLogic的后台预取"""
+
+    def test_first_click_uses_prefetched_layout(self):
+        """测试首次点击时使用预取的布局并保持安全区"""
+        game = GameLogic('hard', seed=5, headless=True, prefetch=True)
+        try:
+            for _ in range(5):
+                assert game.prefetcher.wait_ready(8, timeout=10)
+                opened = game.left_click(8, 8)
+                assert opened
+                assert game.board.total_mines == 40
+                for row in range(7, 10):
+                    for col in range(7, 10):
+                        assert not game.board.get_cell(row, col).is_mine
+                assert game.get_game_state() in (GameState.PLAYING, GameState.WON)
+                game.new_game()
+        finally:
+            game.close()
+
+    def test_set_difficulty_restarts_prefetch(self):
+        """测试切换难度后预取新尺寸的布局"""
+        game = GameLogic('easy', headless=True, prefetch=True)
+        try:
+            game.set_difficulty('hard')
+            assert game.prefetcher.wait_ready(1, timeout=10)
+            game.left_click(0, 0)
+            mines = np.array([[game.board.get_cell(r, c).is_mine for c in range(16)] for r in range(16)])
+            assert mines.sum() == 40
+        finally:
+            game.close()
+
+    def test_chunked_board_places_mines_directly(self):
+        """测试不支持载入布局的分块游戏板不使用预取和布局提供者"""
+        game = GameLogic('hard', board_class=ChunkedBoard, seed=6, headless=True, prefetch=True,
+                         layout_provider=lambda *args: [0, 1, 2])
+        try:
+            assert game.left_click(8, 8)
+            assert game.get_game_state() in (GameState.PLAYING, GameState.WON)
+            assert game.board.total_mines == 40
+        finally:
+            game.close()
+
+    def test_failed_placement_leaves_game_ready(self):
+        """测试布雷失败时对局仍处于未开始状态"""
+        def broken_provider(*args):
+            raise RuntimeError("布局池损坏")
+
+        game = GameLogic('easy', headless=True, layout_provider=broken_provider)
+        with pytest.raises(RuntimeError):
+            game.left_click(5, 5)
+        assert game.is_first_click()
+        assert game.get_game_state() == GameState.READY
+        assert not game.timer.is_running
+        game.set_layout_provider(None)
+        assert game.left_click(5, 5)
+        assert game.board.total_mines == 10
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+地雷概率测试
+测试ProbabilityEngine的精确概率、分量缓存和规模上限
+"""
+
+import itertools
+import random
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.board import Board
+from game.probability import ComponentTooLargeError, ProbabilityEngine, enumerate_component
+from game.solver import Solver
+
+
+def brute_force(board):
+    """枚举所有符合当前棋面的布雷方案，计算每个未揭开格子是雷的概率"""
+    revealed = [(row, col) for row in range(board.rows) for col in range(board.cols)
+                if board.get_cell(row, col).is_revealed]
+    hidden = [(row, col) for row in range(board.rows) for col in range(board.cols)
+              if not board.get_cell(row, col).is_revealed]
+    counts = dict.fromkeys(hidden, 0)
+    total = 0
+    for combo in itertools.combinations(hidden, board.total_mines):
+        mines = set(combo)
+        if all(sum(n in mines for n in board.get_neighbors(row, col)) == board.get_cell(row, col).neighbor_mines
+               for row, col in revealed):
+            total += 1
+            for position in combo:
+                counts[position] += 1
+    return {position: count / total for position, count in counts.items()}
+
+
+class TestProbabilityEngine:
+    """测试ProbabilityEngine类"""
+
+    def test_matches_brute_force(self):
+        """测试与暴力枚举的结果一致"""
+        for seed in range(20):
+            board = Board(4, 5)
+            board.place_mines(6, 2, 2, seed=seed)
+            rng = random.Random(seed)
+            safe = [(row, col) for row in range(4) for col in range(5) if not board.get_cell(row, col).is_mine]
+            for row, col in rng.sample(safe, 3):
+                board.flood_reveal(row, col)
+
+            engine = ProbabilityEngine(board)
+            engine.compute()
+            for (row, col), expected in brute_force(board).items():
+                assert engine.get_probability(row, col) == pytest.approx(expected)
+
+    def test_interior_probability_without_frontier(self):
+        """测试没有边界时所有格子的概率都是地雷密度"""
+        board = Board(4, 4)
+        board.place_mines(5, 0, 0, seed=1)
+        engine = ProbabilityEngine(board)
+        assert engine.compute() == {}
+        assert engine.interior_probability == pytest.approx(5 / 16)
+
+    def test_component_cache(self):
+        """测试分量不变时复用缓存的枚举结果"""
+        board = Board(16, 30)
+        board.place_mines(99, 8, 15, safe_radius=1, seed=4)
+        solver = Solver(board)
+        solver.notify_revealed(board.flood_reveal(8, 15))
+        engine = ProbabilityEngine(board, solver)
+
+        first = engine.compute()
+        misses = enumerate_component.cache_info().misses
+        second = engine.compute()
+        assert enumerate_component.cache_info().misses == misses
+        assert first == second
+
+    def test_probabilities_sum_to_mines(self):
+        """测试所有未揭开格子的概率之和等于地雷总数"""
+        board = Board(16, 16)
+        board.place_mines(40, 8, 8, safe_radius=1, seed=9)
+        solver = Solver(board)
+        solver.notify_revealed(board.flood_reveal(8, 8))
+        engine = ProbabilityEngine(board, solver)
+        probabilities = engine.compute()
+        hidden = board.get_total_cells() - board.get_revealed_count()
+        expected = sum(probabilities.values()) + engine.interior_probability * engine.interior_cells
+        assert len(probabilities) + engine.interior_cells == hidden
+        assert expected == pytest.approx(40)
+
+    def test_best_guess(self):
+        """测试最佳猜测不会选中必然是雷的格子"""
+        board = Board(16, 16)
+        board.place_mines(40, 8, 8, safe_radius=1, seed=2)
+        solver = Solver(board)
+        solver.notify_revealed(board.flood_reveal(8, 8))
+        engine = ProbabilityEngine(board, solver)
+        row, col = engine.best_guess()
+        assert not board.get_cell(row, col).is_revealed
+        assert engine.get_probability(row, col) < 1.0
+
+    def test_component_too_large(self):
+        """测试分量超过上限时报错"""
+        board = Board(16, 30)
+        board.place_mines(99, 8, 15, safe_radius=1, seed=4)
+        board.flood_reveal(8, 15)
+        engine = ProbabilityEngine(board, max_component_cells=1)
+        with pytest.raises(ComponentTooLargeError):
+            engine.compute()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+渲染器测试
+测试视口：只绘制窗口内的格子，滚动和坐标转换
+"""
+
+import pytest
+import sys
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pygame = pytest.importorskip('pygame')
+
+from game.array_board import ArrayBoard
+from game.game_logic import GameLogic
+from ui.colors import Colors
+from ui.renderer import Renderer
+
+
+def make_renderer():
+    return Renderer(pygame.Surface((800, 700)))
+
+
+class TestViewport:
+    """测试渲染视口"""
+
+    def test_small_board_fits(self):
+        """测试内置难度整盘显示在窗口内"""
+        renderer = make_renderer()
+        game = GameLogic('hard', headless=True)
+        assert renderer.get_visible_range(game.board) == (0, 16, 0, 16)
+        assert renderer.screen_to_board(*renderer.board_to_screen(15, 15)) == (15, 15)
+
+    def test_large_board_draws_only_viewport(self):
+        """测试百万格游戏板每帧只绘制视口内的格子"""
+        renderer = make_renderer()
+        game = GameLogic('huge', board_class=ArrayBoard, headless=True,
+                         difficulties={'huge': {'rows': 1000, 'cols': 1000, 'mines': 100000}})
+        drawn = []
+        renderer._draw_cell = lambda cell, row, col, fonts, colors: drawn.append((row, col))
+        renderer.scroll(game.board, 500, 700)
+        renderer._draw_board(game, None, Colors())
+
+        view_rows, view_cols = renderer.get_viewport_size()
+        assert len(drawn) == view_rows * view_cols
+        assert drawn[0] == (500, 700)
+        assert renderer._get_board_width(game) < renderer.screen_width
+
+    def test_scroll_clamp_and_click(self):
+        """测试滚动限制在游戏板范围内，点击坐标加上视口偏移"""
+        renderer = make_renderer()
+        game = GameLogic('wide', headless=True,
+                         difficulties={'wide': {'rows': 10, 'cols': 100, 'mines': 50}})
+        board = game.board
+        renderer.scroll(board, 5, 1000)
+        view_cols = renderer.get_viewport_size()[1]
+        assert (renderer.scroll_row, renderer.scroll_col) == (0, 100 - view_cols)
+
+        x, y = renderer.board_to_screen(3, 99)
+        assert renderer.screen_to_board(x + 1, y + 1) == (99, 3)
+        assert renderer.screen_to_board(renderer.screen_width - 5, y) == (None, None)
+        renderer.scroll(board, 0, -1000)
+        assert renderer.scroll_col == 0
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+对局录像测试
+测试varint编码、录像文件格式、录制以及回放与跳转
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.board import Board
+from game.chunked_board import ChunkedBoard
+from game.game_logic import GameLogic, GameState
+from game.replay import Replay, ReplayPlayer, ReplayRecorder, decode_varints, encode_varints
+from game.simulation import ProbabilityStrategy, SolverStrategy, play_game
+
+
+def board_state(board):
+    """游戏板上每个格子的 (是否地雷, 是否揭开, 是否插旗)"""
+    return [(cell.is_mine, cell.is_revealed, cell.is_flagged)
+            for row in range(board.rows) for cell in (board.get_cell(row, col) for col in range(board.cols))]
+
+
+class FakeClock:
+    """每次读取前进0.25秒的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.25
+        return self.now
+
+
+def record_game(difficulty='hard', seed=0, strategy_class=SolverStrategy, flags=True):
+    """用求解器策略下一局并录像，顺带插几面旗，返回 (录像, 结束时的游戏)"""
+    game = GameLogic(difficulty, seed=seed, headless=True)
+    recorder = ReplayRecorder(game, clock=FakeClock())
+    if flags:
+        game.toggle_flag(0, 0)
+        game.toggle_flag(0, 0)
+    play_game(game, strategy_class(), random.Random(seed))
+    if flags and game.get_game_state() == GameState.PLAYING:
+        game.toggle_flag(1, 1)
+    return recorder.finish(), game
+
+
+class TestVarint:
+    """测试变长整数编码"""
+
+    def test_round_trip(self):
+        """测试编码后解码得到原序列"""
+        values = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 31, 2 ** 63 - 1]
+        data = encode_varints(values)
+        assert decode_varints(data).tolist() == values
+        assert encode_varints([0, 127, 128]) == bytes([0, 127, 0x80, 1])
+
+    def test_truncated(self):
+        """测试不完整的数据报错"""
+        with pytest.raises(ValueError):
+            decode_varints(bytes([0x80]))
+        assert decode_varints(b'').size == 0
+
+
+class TestReplayFormat:
+    """测试录像文件格式"""
+
+    def test_bytes_round_trip(self, tmp_path):
+        """测试录像保存后读取内容一致"""
+        replay, _ = record_game()
+        path = str(tmp_path / 'game.rep')
+        replay.save(path)
+        loaded = Replay.load(path)
+        assert (loaded.rows, loaded.cols, loaded.time_limit) == (16, 16, 600)
+        assert loaded.mines == replay.mines
+        assert list(loaded.events()) == list(replay.events())
+        assert loaded.duration_ms() == replay.duration_ms()
+
+    def test_compact(self):
+        """测试录像紧凑：16x16游戏板的每个动作平均不超过4字节"""
+        replay, _ = record_game()
+        data = replay.to_bytes()
+        assert len(data) <= 5 + 8 + 2 * 40 + 4 * len(replay)
+
+    def test_invalid_data(self):
+        """测试错误的文件头报错"""
+        with pytest.raises(ValueError):
+            Replay.from_bytes(b'XXXX\x01\x00')
+        data = bytearray(Replay(2, 2, 10, [1]).to_bytes())
+        data[4] = 99
+        with pytest.raises(ValueError):
+            Replay.from_bytes(bytes(data))
+
+    def test_recorder(self):
+        """测试录像器记录布局、动作和时间"""
+        replay, game = record_game(flags=True)
+        assert sorted(r * 16 + c for r, c in game.board.mine_positions) == replay.mines
+        events = list(replay.events())
+        assert [(e.kind, e.row, e.col) for e in events[:3]] == [('flag', 0, 0), ('flag', 0, 0),
+                                                              ('reveal', 8, 8)]
+        assert [e.time_ms for e in events[:3]] == [250, 500, 750]
+
+    def test_recorder_follows_undo(self):
+        """测试撤销的动作不留在录像中，撤销首次点击后按新的布局录制"""
+        game = GameLogic('hard', seed=5, headless=True)
+        recorder = ReplayRecorder(game, clock=FakeClock())
+        game.left_click(0, 0)
+        game.undo()
+        game.left_click(8, 8)
+        game.toggle_flag(*next((r, c) for r in range(16) for c in range(16)
+                               if not game.board.get_cell(r, c).is_revealed))
+        game.undo()
+        game.redo()
+        # 时间到及其撤销、重做不影响录像中的动作
+        game._on_time_up()
+        game.undo()
+        replay = recorder.finish()
+        assert sorted(r * 16 + c for r, c in game.board.mine_positions) == replay.mines
+        assert [e.kind for e in replay.events()] == ['reveal', 'flag']
+        player = ReplayPlayer(replay)
+        assert player.run() == game.get_game_state()
+        assert board_state(player.game.board) == board_state(game.board)
+
+    def test_recorder_chord(self):
+        """测试双键记录为一个动作，回放结果一致"""
+        mines = [0, 4, 14, 24, 34, 40, 41, 42, 43, 44]
+        game = GameLogic('easy', headless=True, layout_provider=lambda *args: mines)
+        recorder = ReplayRecorder(game, clock=FakeClock())
+        game.left_click(9, 9)
+        game.left_click(1, 1)
+        game.toggle_flag(0, 0)
+        game.chord(1, 1)
+        replay = Replay.from_bytes(recorder.finish().to_bytes())
+        assert [e.kind for e in replay.events()] == ['reveal', 'reveal', 'flag', 'chord']
+        player = ReplayPlayer(replay)
+        assert player.run() == GameState.WON
+        assert board_state(player.game.board) == board_state(game.board)
+        player.seek(3)
+        assert not player.game.board.get_cell(0, 1).is_revealed
+
+
+class TestReplayPlayer:
+    """测试录像回放"""
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard])
+    def test_run_reproduces_game(self, board_class):
+        """测试快速回放得到与原对局相同的结果"""
+        for seed in range(4):
+            replay, game = record_game(seed=seed, strategy_class=ProbabilityStrategy)
+            player = ReplayPlayer(Replay.from_bytes(replay.to_bytes()), board_class=board_class)
+            assert player.run() == game.get_game_state()
+            assert board_state(player.game.board) == board_state(game.board)
+
+    def test_rejects_board_without_layout_loading(self):
+        """测试不支持整盘载入布局的游戏板不能用于回放"""
+        replay, _ = record_game(seed=0)
+        with pytest.raises(ValueError):
+            ReplayPlayer(replay, board_class=ChunkedBoard)
+
+    def test_seek(self):
+        """测试跳转到任意位置与从头回放的状态一致"""
+        replay, _ = record_game(seed=1)
+        expected = []
+        reference = ReplayPlayer(replay)
+        expected.append((board_state(reference.game.board), reference.game.get_game_state()))
+        while reference.step() is not None:
+            expected.append((board_state(reference.game.board), reference.game.get_game_state()))
+
+        player = ReplayPlayer(replay, snapshot_interval=8)
+        player.run()
+        rng = random.Random(0)
+        for position in [0, len(replay), len(replay) // 2, 3] + [rng.randrange(len(replay) + 1)
+                                                                 for _ in range(20)]:
+            player.seek(position)
+            assert player.position == position
+            assert (board_state(player.game.board), player.game.get_game_state()) == expected[position]
+
+    def test_seek_time(self):
+        """测试按时间跳转"""
+        replay, _ = record_game(seed=2)
+        player = ReplayPlayer(replay)
+        player.seek_time(replay.event(5).time_ms)
+        assert player.position == 6
+        player.seek_time(0)
+        assert player.position == 0
+        assert player.game.is_first_click()
+        assert player.game.board.get_revealed_count() == 0
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+批量模拟测试
+测试策略、单局模拟和进程池批量模拟
+"""
+
+import json
+import pytest
+import random
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.game_logic import GameLogic, GameState
+from game.array_board import ArrayBoard
+from game.simulation import (
+    ACTION_FLAG, ACTION_REVEAL, RandomStrategy, ScriptedStrategy, SimulationStats,
+    main, make_strategy, play_game, simulate,
+)
+
+
+class TestSimulation:
+    """测试批量模拟"""
+
+    def test_random_strategy_finishes_game(self):
+        """测试随机策略每局都会结束"""
+        game = GameLogic('easy', headless=True, seed=1)
+        rng = random.Random(1)
+        for _ in range(20):
+            result = play_game(game, RandomStrategy(), rng)
+            assert result.state in (GameState.WON, GameState.LOST)
+            assert result.clicks == len(result.reveal_sizes) >= 1
+
+    def test_board_is_reused(self):
+        """测试多局对局复用同一个游戏板"""
+        game = GameLogic('easy', board_class=ArrayBoard, headless=True, seed=2)
+        board = game.board
+        mines = board.mines
+        play_game(game, RandomStrategy(), random.Random(2))
+        play_game(game, RandomStrategy(), random.Random(3))
+        assert game.board is board
+        assert game.board.mines is mines
+
+    def test_scripted_strategy(self):
+        """测试脚本策略"""
+        script = [(ACTION_REVEAL, 5, 5), (ACTION_FLAG, 0, 0)]
+        game = GameLogic('easy', headless=True, seed=3)
+        result = play_game(game, make_strategy('scripted', script), random.Random(0))
+
+        assert result.clicks == 1
+        assert game.board.get_cell(5, 5).is_revealed
+        assert game.board.get_cell(0, 0).is_flagged or game.board.get_cell(0, 0).is_revealed
+
+    def test_solver_strategy_beats_random(self):
+        """测试求解器策略的胜率高于随机策略"""
+        solver = simulate(50, difficulty='easy', strategy='solver', workers=1, seed=3)
+        randomly = simulate(50, difficulty='easy', strategy='random', workers=1, seed=3)
+        assert solver.wins > randomly.wins
+        assert solver.win_rate > 0.5
+
+    def test_unknown_strategy(self):
+        """测试未知策略报错"""
+        with pytest.raises(ValueError):
+            make_strategy('psychic')
+
+    def test_stats_merge(self):
+        """测试统计合并"""
+        a = simulate(30, difficulty='easy', workers=1, batch_size=10, seed=5)
+        b = simulate(30, difficulty='easy', workers=1, batch_size=10, seed=5)
+        assert a.games == 30
+        assert a.wins + a.losses == 30
+        assert (a.wins, a.clicks, a.revealed_cells) == (b.wins, b.clicks, b.revealed_cells)
+
+        merged = SimulationStats()
+        merged.merge(a)
+        merged.merge(b)
+        assert merged.games == 60
+        assert merged.win_rate == a.win_rate
+
+    def test_process_pool_matches_single_process(self):
+        """测试进程池结果与单进程一致"""
+        single = simulate(40, difficulty='hard', workers=1, batch_size=10, seed=9)
+        pooled = simulate(40, difficulty='hard', workers=2, batch_size=10, seed=9)
+        assert (pooled.wins, pooled.clicks, pooled.revealed_cells) == \
+            (single.wins, single.clicks, single.revealed_cells)
+
+    def test_cli(self, capsys):
+        """测试命令行输出JSON统计"""
+        main(['--games', '5', '--workers', '1', '--seed', '1', '--json'])
+        stats = json.loads(capsys.readouterr().out)
+        assert stats['games'] == 5
+        assert 0.0 <= stats['win_rate'] <= 1.0
+
+    def test_cli_bad_difficulty(self, tmp_path, capsys):
+        """测试配置文件不存在或难度名称未知时给出命令行错误而不是异常"""
+        with pytest.raises(SystemExit):
+            main(['--games', '1', '--workers', '1', '--config', str(tmp_path / 'missing.json')])
+        with pytest.raises(SystemExit):
+            main(['--games', '1', '--workers', '1', '--difficulty', 'expert'])
+        assert '未知难度' in capsys.readouterr().err
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+游戏存档测试
+测试快照的保存、恢复、版本检查以及各游戏板后端的整盘状态读写
+"""
+
+import pytest
+import random
+import sys
+import os
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game import snapshot
+from game.array_board import ArrayBoard
+from game.bitboard import BitBoard
+from game.board import Board
+from game.game_logic import GameLogic, GameState
+from game.mmap_board import MmapBoard
+from game.simulation import SolverStrategy
+
+
+def board_state(board):
+    """游戏板上每个格子的 (是否地雷, 是否揭开, 是否插旗, 周围地雷数)"""
+    return [(cell.is_mine, cell.is_revealed, cell.is_flagged, cell.neighbor_mines)
+            for row in range(board.rows) for cell in (board.get_cell(row, col) for col in range(board.cols))]
+
+
+def play_some(game, moves, seed=0):
+    """用求解器策略走若干步，并插一面旗"""
+    strategy = SolverStrategy()
+    strategy.start(game, random.Random(seed))
+    for _ in range(moves):
+        if game.get_game_state() not in (GameState.READY, GameState.PLAYING):
+            break
+        action = strategy.next_action(game)
+        opened = game.left_click(action[1], action[2])
+        strategy.observe(game, action, opened)
+    for row in range(game.board.rows):
+        for col in range(game.board.cols):
+            if not game.board.get_cell(row, col).is_revealed:
+                game.toggle_flag(row, col)
+                return
+
+
+class TestStateBits:
+    """测试整盘状态读写"""
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard, BitBoard, MmapBoard])
+    def test_round_trip(self, board_class):
+        """测试导出的状态写入新游戏板后完全一致"""
+        board = board_class(7, 9)
+        board.place_mines(15, 3, 3, seed=4)
+        board.flood_reveal(3, 3)
+        board.get_cell(0, 0).is_flagged = True
+        mines, revealed, flagged = (bits.copy() for bits in board.get_state_bits())
+        assert mines.sum() == 15 and revealed.sum() == board.get_revealed_count()
+
+        restored = board_class(7, 9)
+        restored.set_state_bits(mines, revealed, flagged)
+        assert board_state(restored) == board_state(board)
+        assert restored.total_mines == 15
+        assert restored.get_revealed_count() == board.get_revealed_count()
+        assert restored.flagged_positions == board.flagged_positions
+        assert restored.mine_positions == board.mine_positions
+        # 恢复后展开仍然正确
+        for row in range(7):
+            for col in range(9):
+                if not board.get_cell(row, col).is_mine:
+                    assert sorted(restored.flood_reveal(row, col)) == sorted(board.flood_reveal(row, col))
+
+
+class TestSnapshot:
+    """测试对局快照"""
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard, BitBoard])
+    def test_save_and_load(self, board_class, tmp_path):
+        """测试保存后恢复到另一个GameLogic得到相同的对局"""
+        game = GameLogic('hard', seed=3, board_class=board_class, headless=True)
+        play_some(game, 5)
+        path = str(tmp_path / 'game.sav')
+        snapshot.save(game, path)
+
+        restored = GameLogic('easy', board_class=board_class, headless=True)
+        snapshot.load(restored, path)
+        assert restored.current_difficulty == 'hard'
+        assert (restored.board.rows, restored.board.cols) == (16, 16)
+        assert board_state(restored.board) == board_state(game.board)
+        assert restored.game_state == game.game_state
+        assert restored.first_click == game.first_click
+        assert restored.board.seed == game.board.seed
+        assert restored.timer.is_running == game.timer.is_running
+        assert abs(restored.timer.get_elapsed() - game.timer.get_elapsed()) < 1
+        assert restored.get_mines_left() == game.get_mines_left()
+
+        # 恢复后可以继续游戏
+        safe = [(row, col) for row in range(16) for col in range(16)
+                if not restored.board.get_cell(row, col).is_revealed
+                and not restored.board.get_cell(row, col).is_mine]
+        if restored.game_state == GameState.PLAYING:
+            for row, col in safe:
+                if restored.board.get_cell(row, col).is_flagged:
+                    restored.toggle_flag(row, col)
+                restored.left_click(row, col)
+            assert restored.get_game_state() == GameState.WON
+
+    def test_first_click_and_finished_states(self):
+        """测试尚未开始和已结束的对局"""
+        game = GameLogic('easy', headless=True)
+        restored = GameLogic('hard', headless=True)
+        snapshot.loads(restored, snapshot.dumps(game))
+        assert restored.is_first_click()
+        assert restored.game_state == GameState.READY
+        assert restored.board.total_mines == 0
+        restored.left_click(5, 5)
+        assert restored.board.total_mines == 10
+
+        game.left_click(0, 0)
+        mine = next(iter(game.board.mine_positions))
+        game.left_click(*mine)
+        assert game.game_state == GameState.LOST
+        snapshot.loads(restored, snapshot.dumps(game))
+        assert restored.game_state == GameState.LOST
+        assert not restored.timer.is_running
+        assert board_state(restored.board) == board_state(game.board)
+
+    def test_timer_elapsed(self):
+        """测试计时器的已用时间随存档恢复"""
+        game = GameLogic('easy', headless=True)
+        game.left_click(5, 5)
+        game.timer.restore(125.5, True)
+        restored = GameLogic('easy', headless=True)
+        snapshot.loads(restored, snapshot.dumps(game))
+        assert restored.timer.is_running
+        assert 125 <= restored.timer.get_elapsed() < 127
+        restored.update()
+        assert restored.timer.get_time_left() == 900 - 125
+
+    def test_custom_difficulty(self):
+        """测试自定义难度随存档恢复"""
+        game = GameLogic(headless=True)
+        game.difficulties['wide'] = {'rows': 5, 'cols': 40, 'mines': 30, 'time': 300}
+        game.set_difficulty('wide')
+        game.left_click(2, 20)
+        restored = GameLogic(headless=True)
+        snapshot.loads(restored, snapshot.dumps(game))
+        assert restored.get_difficulty_config() == {'rows': 5, 'cols': 40, 'mines': 30, 'time': 300}
+        assert board_state(restored.board) == board_state(game.board)
+
+    def test_invalid_data(self):
+        """测试错误或不完整的数据报错"""
+        data = snapshot.dumps(GameLogic(headless=True))
+        game = GameLogic(headless=True)
+        with pytest.raises(ValueError):
+            snapshot.loads(game, b'XXXX' + data[4:])
+        with pytest.raises(ValueError):
+            snapshot.loads(game, data[:-1])
+        bad_version = bytearray(data)
+        bad_version[4] = 99
+        with pytest.raises(ValueError):
+            snapshot.loads(game, bytes(bad_version))
+
+    def test_compact(self):
+        """测试快照大小约为每个格子3位"""
+        game = GameLogic('hard', headless=True)
+        game.left_click(8, 8)
+        assert len(snapshot.dumps(game)) <= snapshot.HEADER.size + len('hard') + 3 * 32
+
+    def test_large_board_fast(self):
+        """测试大尺寸数组游戏板的恢复不逐格进行"""
+        game = GameLogic(board_class=ArrayBoard, headless=True)
+        game.difficulties['huge'] = {'rows': 1000, 'cols': 1000, 'mines': 1000, 'time': 900}
+        game.set_difficulty('huge')
+        game.left_click(500, 500)
+        data = snapshot.dumps(game)
+        restored = GameLogic(board_class=ArrayBoard, headless=True)
+        restored.difficulties['huge'] = dict(game.difficulties['huge'])
+        restored.set_difficulty('huge')
+
+        def no_cell_access(row, col):
+            raise AssertionError("恢复时不应逐个访问格子")
+        restored.board.get_cell = no_cell_access
+        snapshot.loads(restored, data)
+        del restored.board.get_cell
+        assert np.array_equal(restored.board.revealed, game.board.revealed)
+        assert restored.board.get_revealed_count() == game.board.get_revealed_count()
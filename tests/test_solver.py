@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+求解器测试
+测试Solver类的增量边界维护和推理规则
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.array_board import ArrayBoard
+from game.board import Board
+from game.chunked_board import ChunkedBoard
+from game.game_logic import GameLogic, GameState
+from game.solver import Solver
+
+
+def make_board(layout, board_class=Board):
+    """按字符画创建游戏板，'*' 表示地雷"""
+    rows, cols = len(layout), len(layout[0])
+    board = board_class(rows, cols)
+    board._apply_mines(row * cols + col for row in range(rows) for col in range(cols)
+                       if layout[row][col] == '*')
+    board.total_mines = len(board.mine_positions)
+    board._calculate_neighbor_mines()
+    board._label_regions()
+    return board
+
+
+def reveal(board, solver, cells):
+    """揭开指定格子并通知求解器"""
+    for row, col in cells:
+        solver.notify_revealed(board.flood_reveal(row, col))
+
+
+class TestSolver:
+    """测试Solver类"""
+
+    def test_single_cell_rule(self):
+        """测试单格规则：数字等于未确定格子数时全部是雷"""
+        board = make_board([
+            '*..',
+            '...',
+            '...',
+        ])
+        solver = Solver(board)
+        reveal(board, solver, [(2, 2)])
+        safe, mines = solver.find_certain()
+        assert mines == [(0, 0)]
+        assert safe == []
+
+    def test_subset_rule(self):
+        """测试子集规则：1-2-1 模式"""
+        board = make_board([
+            '*.*',
+            '...',
+        ])
+        solver = Solver(board)
+        for col in range(3):
+            solver.notify_revealed(board.flood_reveal(1, col))
+        safe, mines = solver.find_certain()
+        assert mines == [(0, 0), (0, 2)]
+        assert safe == [(0, 1)]
+
+    def test_frontier_is_incremental(self):
+        """测试边界随揭开的格子增量更新"""
+        board = make_board([
+            '....*',
+            '.....',
+            '.....',
+        ])
+        solver = Solver(board)
+        assert solver.frontier == set()
+        reveal(board, solver, [(2, 0)])
+        frontier = {divmod(index, board.cols) for index in solver.frontier}
+        assert frontier == {(0, 4)}
+
+        safe, mines = solver.find_certain()
+        assert mines == [(0, 4)]
+        assert solver.get_unknown_frontier() == []
+
+    def test_ignores_player_flags(self):
+        """测试默认不信任玩家的旗子"""
+        board = make_board([
+            '*..',
+            '...',
+            '...',
+        ])
+        solver = Solver(board)
+        board.get_cell(0, 1).is_flagged = True
+        solver.notify_flag(0, 1)
+        reveal(board, solver, [(2, 2)])
+        _, mines = solver.find_certain()
+        assert mines == [(0, 0)]
+
+    def test_trust_flags(self):
+        """测试信任旗子时把旗子当作地雷"""
+        board = make_board([
+            '*.',
+            '..',
+        ])
+        board.get_cell(1, 1).is_revealed = True
+        board.get_cell(0, 0).is_flagged = True
+        solver = Solver(board, trust_flags=True)
+        safe, _ = solver.find_certain()
+        assert safe == [(0, 1), (1, 0)]
+
+    def test_attach_mid_game(self):
+        """测试中途接入时按当前棋面重建"""
+        board = make_board([
+            '*..',
+            '...',
+            '...',
+        ])
+        board.flood_reveal(2, 2)
+        solver = Solver(board)
+        _, mines = solver.find_certain()
+        assert mines == [(0, 0)]
+
+    @pytest.mark.parametrize('board_class', [Board, ArrayBoard])
+    def test_deductions_are_correct(self, board_class):
+        """测试在随机局面上推出的结果都正确"""
+        for seed in range(30):
+            board = board_class(16, 30)
+            board.place_mines(99, 8, 15, safe_radius=1, seed=seed)
+            solver = Solver(board)
+            reveal(board, solver, [(8, 15)])
+            while True:
+                safe, mines = solver.find_certain()
+                assert all(not board.get_cell(row, col).is_mine for row, col in safe)
+                assert all(board.get_cell(row, col).is_mine for row, col in mines)
+                if not safe:
+                    break
+                reveal(board, solver, safe)
+
+    def test_chunked_board(self):
+        """测试分块游戏板不需要整盘邻居表"""
+        board = ChunkedBoard(2000, 2000, tile_size=16)
+        board.place_mines(400000, 1000, 1000, safe_radius=1, seed=5)
+        solver = Solver(board)
+        reveal(board, solver, [(1000, 1000)])
+        safe, mines = solver.find_certain()
+        assert all(not board.get_cell(row, col).is_mine for row, col in safe)
+        assert all(board.get_cell(row, col).is_mine for row, col in mines)
+
+    def test_apply_changes(self):
+        """测试订阅GameLogic的变化后与整体重建的结果一致，包括撤销之后"""
+        game = GameLogic('hard', seed=6, headless=True)
+        solver = Solver(game.board)
+        game.subscribe(solver.apply_changes)
+        game.left_click(8, 8)
+        for _ in range(5):
+            safe, _ = solver.find_certain()
+            if not safe or game.get_game_state() != GameState.PLAYING:
+                break
+            game.left_click(*safe[0])
+        game.undo()
+        fresh = Solver(game.board)
+        assert solver.numbers == fresh.numbers
+        assert solver.find_certain() == fresh.find_certain()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+音效管理器测试
+测试空音效后端和音效后端的自动选择
+"""
+
+import pytest
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.sound_manager import NullSoundManager, create_sound_manager, is_headless_environment
+from game.game_logic import GameLogic, GameState
+
+
+class RecordingSoundManager(NullSoundManager):
+    """记录播放请求的音效后端"""
+
+    def __init__(self):
+        super().__init__()
+        self.played = []
+
+    def play_sound(self, sound_name: str):
+        self.played.append(sound_name)
+
+
+class TestSoundManager:
+    """测试音效后端选择"""
+
+    def test_null_sound_manager(self):
+        """测试空音效后端接口"""
+        sound = NullSoundManager()
+        sound.play_sound('click')
+        sound.set_volume(2.0)
+        assert sound.get_volume() == 1.0
+        sound.toggle_sound()
+        assert sound.is_enabled()
+
+    def test_headless_detection(self, monkeypatch):
+        """测试根据环境变量检测无头环境"""
+        monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+        assert is_headless_environment()
+        assert isinstance(create_sound_manager(), NullSoundManager)
+
+    def test_explicit_headless(self):
+        """测试显式指定无头模式"""
+        assert isinstance(create_sound_manager(headless=True), NullSoundManager)
+        game = GameLogic('easy', headless=True)
+        assert isinstance(game.sound_manager, NullSoundManager)
+
+    def test_injected_sound_manager(self):
+        """测试注入自定义音效后端"""
+        sound = RecordingSoundManager()
+        game = GameLogic('easy', sound_manager=sound, seed=1)
+        assert game.sound_manager is sound
+
+        game.game_state = GameState.PLAYING
+        game.game_over(True)
+        assert sound.played == ['win']
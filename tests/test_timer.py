@@ -165,4 +165,28 @@ class TestTimer:
         # 应该立即到期
         assert timer.is_expired()
         assert timer.get_percentage_left() == 0.0
-        assert timer.get_formatted_time() == "0:00"
\ No newline at end of file
+        assert timer.get_formatted_time() == "0:00"
+
+    def test_elapsed_and_restore(self):
+        """测试已用时间的读取与恢复"""
+        timer = Timer(100)
+        assert timer.get_elapsed() == 0.0
+
+        timer.restore(30.5, True)
+        assert timer.is_running
+        assert 30 <= timer.get_elapsed() < 31.5
+        timer.update()
+        assert timer.get_time_left() == 70
+
+        timer.stop()
+        elapsed = timer.get_elapsed()
+        assert 30 <= elapsed < 31.5
+        assert timer.get_elapsed() == elapsed
+
+        timer.restore(40, False)
+        assert not timer.is_running
+        assert timer.get_elapsed() == 40
+        assert timer.get_time_left() == 60
+
+        timer.reset()
+        assert timer.get_elapsed() == 0.0
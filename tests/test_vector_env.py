@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+向量化环境测试
+测试VectorEnv与GameLogic规则一致
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.game_logic import GameLogic, GameState
+from game.vector_env import (
+    ACTION_FLAG, ACTION_REVEAL, OBS_FLAG, OBS_HIDDEN, OBS_MINE, VectorEnv, dilate,
+)
+
+
+def make_game(mines: np.ndarray) -> GameLogic:
+    """按指定布局创建已完成首次点击的GameLogic"""
+    rows, cols = mines.shape
+    game = GameLogic('easy', headless=True)
+    game.difficulties['custom'] = {'rows': rows, 'cols': cols, 'mines': int(mines.sum()), 'time': 900}
+    game.current_difficulty = 'custom'
+    game._init_game()
+    for row, col in zip(*np.nonzero(mines)):
+        game.board.cells[row][col].is_mine = True
+    game.board.total_mines = int(mines.sum())
+    game.board._calculate_neighbor_mines()
+    game.board._label_regions()
+    game.first_click = False
+    game.game_state = GameState.PLAYING
+    return game
+
+
+class TestVectorEnv:
+    """测试VectorEnv类"""
+
+    def test_dilate(self):
+        """测试掩码扩张"""
+        mask = np.zeros((1, 5, 5), dtype=bool)
+        mask[0, 0, 0] = True
+        mask[0, 3, 3] = True
+        grown = dilate(mask)
+        assert grown[0, :2, :2].all()
+        assert grown[0, 2:5, 2:5].all()
+        assert grown.sum() == 4 + 9
+
+    def test_first_click_protection(self):
+        """测试首次揭开时布雷并保护3x3区域"""
+        env = VectorEnv.from_difficulty('hard', 16, seed=1)
+        actions = np.array([[ACTION_REVEAL, i % 16, (i * 7) % 16] for i in range(16)])
+        obs, rewards, dones = env.step(actions)
+
+        assert env.started.all()
+        assert (env.mines.reshape(16, -1).sum(axis=1) == 40).all()
+        for i, (_, row, col) in enumerate(actions):
+            assert not env.mines[i, max(0, row - 1):row + 2, max(0, col - 1):col + 2].any()
+            assert obs[i, row, col] == 0
+        assert (rewards > 0).all()
+        assert not dones.any()
+
+    def test_matches_game_logic(self):
+        """测试随机动作序列下与GameLogic结果一致"""
+        rng = np.random.default_rng(3)
+        num_boards, rows, cols = 12, 9, 11
+        env = VectorEnv(num_boards, rows, cols, 15, seed=3)
+        games = []
+        for board in range(num_boards):
+            layout = np.zeros(rows * cols, dtype=bool)
+            layout[rng.choice(rows * cols, 15, replace=False)] = True
+            layout = layout.reshape(rows, cols)
+            env.set_layout(board, layout)
+            games.append(make_game(layout))
+
+        for _ in range(60):
+            actions = np.stack([
+                rng.choice([ACTION_REVEAL, ACTION_REVEAL, ACTION_FLAG], num_boards),
+                rng.integers(0, rows, num_boards),
+                rng.integers(0, cols, num_boards),
+            ], axis=1)
+            obs, _, dones = env.step(actions)
+
+            for board, game in enumerate(games):
+                kind, row, col = actions[board]
+                if kind == ACTION_REVEAL:
+                    game.left_click(row, col)
+                else:
+                    game.right_click(row, col)
+
+                for r in range(rows):
+                    for c in range(cols):
+                        cell = game.board.get_cell(r, c)
+                        assert env.revealed[board, r, c] == cell.is_revealed
+                        assert env.flagged[board, r, c] == cell.is_flagged
+                assert dones[board] == (game.game_state in (GameState.WON, GameState.LOST))
+                assert env.won[board] == (game.game_state == GameState.WON)
+
+    def test_loss_and_observation(self):
+        """测试踩雷结束并显示所有地雷"""
+        env = VectorEnv(1, 3, 3, 2)
+        layout = np.zeros((3, 3), dtype=bool)
+        layout[0, 0] = layout[2, 2] = True
+        env.set_layout(0, layout)
+
+        obs, rewards, dones = env.step([[ACTION_FLAG, 1, 1]])
+        assert obs[0, 1, 1] == OBS_FLAG
+        assert obs[0, 0, 1] == OBS_HIDDEN
+
+        obs, rewards, dones = env.step([[ACTION_REVEAL, 0, 0]])
+        assert dones[0] and not env.won[0]
+        assert rewards[0] == -1.0
+        assert obs[0, 0, 0] == OBS_MINE and obs[0, 2, 2] == OBS_MINE
+
+        # 已结束的游戏板忽略动作，重置后可以重新开始
+        obs, rewards, dones = env.step([[ACTION_REVEAL, 0, 1]])
+        assert rewards[0] == 0.0
+        obs = env.reset()
+        assert (obs == OBS_HIDDEN).all()
+        assert not env.done.any() and not env.started.any()
@@ -14,6 +14,9 @@ from game.board import Cell
 class Renderer:
     """游戏渲染器类"""
 
+    # 内置难度的显示名称，自定义难度直接显示名称
+    DIFFICULTY_LABELS = {'easy': "简单", 'hard': "困难"}
+
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         self.screen_width = screen.get_width()
@@ -24,14 +27,46 @@ class Renderer:
         self.board_offset_x = 50
         self.board_offset_y = 150
         self.board_padding = 10
+        self.board_margin_bottom = 10
+
+        # 视口左上角的格子，游戏板大于窗口时只绘制视口内的格子
+        self.scroll_row = 0
+        self.scroll_col = 0
 
         # UI设置
         self.ui_height = 100
         self.button_width = 120
         self.button_height = 40
 
+    def get_viewport_size(self) -> Tuple[int, int]:
+        """窗口内最多能显示的格子行数和列数"""
+        pitch = self.cell_size + 2
+        width = self.screen_width - 2 * self.board_offset_x - 2 * self.board_padding
+        height = (self.screen_height - self.board_offset_y - self.board_margin_bottom
+                  - 2 * self.board_padding)
+        return max(1, height // pitch), max(1, width // pitch)
+
+    def get_visible_range(self, board) -> Tuple[int, int, int, int]:
+        """视口内的格子范围 (起始行, 结束行, 起始列, 结束列)，不含结束行列"""
+        view_rows, view_cols = self.get_viewport_size()
+        self._clamp_scroll(board)
+        return (self.scroll_row, min(board.rows, self.scroll_row + view_rows),
+                self.scroll_col, min(board.cols, self.scroll_col + view_cols))
+
+    def _clamp_scroll(self, board):
+        """把视口限制在游戏板范围内"""
+        view_rows, view_cols = self.get_viewport_size()
+        self.scroll_row = max(0, min(self.scroll_row, board.rows - view_rows))
+        self.scroll_col = max(0, min(self.scroll_col, board.cols - view_cols))
+
+    def scroll(self, board, rows: int, cols: int):
+        """滚动视口"""
+        self.scroll_row += rows
+        self.scroll_col += cols
+        self._clamp_scroll(board)
+
     def screen_to_board(self, x: int, y: int) -> Tuple[Optional[int], Optional[int]]:
-        """将屏幕坐标转换为游戏板坐标"""
+        """将屏幕坐标转换为游戏板坐标，视口之外返回 (None, None)"""
         board_x = x - self.board_offset_x - self.board_padding
         board_y = y - self.board_offset_y - self.board_padding
 
@@ -40,13 +75,16 @@ class Renderer:
 
         col = board_x // (self.cell_size + 2)
         row = board_y // (self.cell_size + 2)
+        view_rows, view_cols = self.get_viewport_size()
+        if row >= view_rows or col >= view_cols:
+            return None, None
 
-        return col, row
+        return col + self.scroll_col, row + self.scroll_row
 
     def board_to_screen(self, row: int, col: int) -> Tuple[int, int]:
         """将游戏板坐标转换为屏幕坐标"""
-        x = self.board_offset_x + self.board_padding + col * (self.cell_size + 2)
-        y = self.board_offset_y + self.board_padding + row * (self.cell_size + 2)
+        x = self.board_offset_x + self.board_padding + (col - self.scroll_col) * (self.cell_size + 2)
+        y = self.board_offset_y + self.board_padding + (row - self.scroll_row) * (self.cell_size + 2)
         return x, y
 
     def draw_game(self, game_logic: GameLogic, fonts, colors):
@@ -123,7 +161,7 @@ class Renderer:
 
         # 绘制难度指示
         difficulty = game_logic.current_difficulty
-        diff_text = "难度: " + ("简单" if difficulty == 'easy' else "困难")
+        diff_text = "难度: " + self.DIFFICULTY_LABELS.get(difficulty, difficulty)
         diff_surface = fonts.render_text_smart(
             diff_text, 'orbitron_normal', colors.text_white
         )
@@ -151,10 +189,11 @@ class Renderer:
         board_surface.fill((0, 0, 0))
         self.screen.blit(board_surface, board_rect)
 
-        # 绘制所有格子
-        for row in range(board.rows):
-            for col in range(board.cols):
-                self._draw_cell(board.cells[row][col], row, col, fonts, colors)
+        # 只绘制视口内的格子，开销与游戏板大小无关
+        row_start, row_end, col_start, col_end = self.get_visible_range(board)
+        for row in range(row_start, row_end):
+            for col in range(col_start, col_end):
+                self._draw_cell(board.get_cell(row, col), row, col, fonts, colors)
 
     def _draw_cell(self, cell: Cell, row: int, col: int, fonts, colors):
         """绘制单个格子"""
@@ -236,14 +275,16 @@ class Renderer:
         self.screen.blit(hint_surface, hint_rect)
 
     def _get_board_width(self, game_logic: GameLogic) -> int:
-        """获取游戏板宽度"""
+        """获取游戏板（视口）宽度"""
         board = game_logic.get_board()
-        return (self.cell_size + 2) * board.cols + self.board_padding * 2
+        cols = min(board.cols, self.get_viewport_size()[1])
+        return (self.cell_size + 2) * cols + self.board_padding * 2
 
     def _get_board_height(self, game_logic: GameLogic) -> int:
-        """获取游戏板高度"""
+        """获取游戏板（视口）高度"""
         board = game_logic.get_board()
-        return (self.cell_size + 2) * board.rows + self.board_padding * 2
+        rows = min(board.rows, self.get_viewport_size()[0])
+        return (self.cell_size + 2) * rows + self.board_padding * 2
 
     def get_board_rect(self, game_logic: GameLogic) -> pygame.Rect:
         """获取游戏板矩形区域"""